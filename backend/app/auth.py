@@ -1,12 +1,20 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.exc import SQLAlchemyError
-from . import schemas, crud, database, config
+from collections import OrderedDict
+from . import schemas, crud, database, config, models, metrics
+from .session_store import session_store, token_digest
 import logging
 import functools
+import inspect
+import random
+import secrets
+import threading
 import time
 
 # 로거 설정
@@ -17,56 +25,190 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ==================== 데코레이터 정의 ====================
 
-# 실행 시간 측정 데코레이터
-def measure_execution_time(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        logger.info(f"⏱️ {func.__name__} 실행 시간: {end_time - start_time:.4f}초")
-        return result
-    return wrapper
+def _should_sample() -> bool:
+    """핫패스 로그 샘플링 여부 결정 (AUTH_LOG_SAMPLE_RATE 비율만 기록)"""
+    return random.random() < config.settings.AUTH_LOG_SAMPLE_RATE
 
-# 인증 활동 로그 데코레이터
-def log_auth_activity(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
+# 인증 활동 로그 데코레이터 (sampled=True 이면 성공 로그는 샘플링, 실패는 항상 기록)
+def log_auth_activity(func=None, *, sampled: bool = False):
+    if func is None:
+        return functools.partial(log_auth_activity, sampled=sampled)
+
+    def _begin():
+        if sampled and not _should_sample():
+            return None
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         logger.info(f"🔐 [{timestamp}] {func.__name__} 호출")
-        try:
-            result = func(*args, **kwargs)
+        return timestamp
+
+    def _success(timestamp):
+        if timestamp is not None:
             logger.info(f"✅ [{timestamp}] {func.__name__} 성공")
+
+    def _failure(timestamp, e):
+        prefix = f"[{timestamp}] " if timestamp is not None else ""
+        logger.warning(f"❌ {prefix}{func.__name__} 실패: {e}")
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            timestamp = _begin()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                _failure(timestamp, e)
+                raise
+            _success(timestamp)
             return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timestamp = _begin()
+        try:
+            result = func(*args, **kwargs)
         except Exception as e:
-            logger.warning(f"❌ [{timestamp}] {func.__name__} 실패: {e}")
+            _failure(timestamp, e)
             raise
+        _success(timestamp)
+        return result
     return wrapper
 
-# 에러 핸들링 데코레이터
+def _translate_auth_error(e: Exception) -> HTTPException:
+    """JWT/DB 예외를 HTTP 예외로 변환"""
+    if isinstance(e, JWTError):
+        logger.warning(f"🚨 JWT 오류: {e}")
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="토큰 인증 실패",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    logger.error(f"🚨 DB 오류: {e}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="데이터베이스 연결에 문제가 발생했습니다"
+    )
+
+# 에러 핸들링 데코레이터 (코루틴 함수 지원)
 def handle_auth_errors(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except (JWTError, SQLAlchemyError) as e:
+                raise _translate_auth_error(e)
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except JWTError as e:
-            logger.warning(f"🚨 JWT 오류: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="토큰 인증 실패",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        except SQLAlchemyError as e:
-            logger.error(f"🚨 DB 오류: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="데이터베이스 연결에 문제가 발생했습니다"
-            )
+        except (JWTError, SQLAlchemyError) as e:
+            raise _translate_auth_error(e)
     return wrapper
 
+# ==================== 검증된 사용자(principal) 캐시 ====================
+
+class PrincipalCache:
+    """
+    토큰 다이게스트 -> 사용자 컬럼 스냅샷 캐시 (프로세스 내, 스레드 안전)
+    - 적중 시 JWT 디코딩과 세션/사용자 조회 생략
+    - 세션 유효성은 마지막 확인 시각과 함께 보관, PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS가 지나면 다시 확인
+      (같은 워커의 로그아웃/기기 제한은 항목 제거로 즉시 반영, 다른 워커의 변경은 최대 그 시간 뒤 반영)
+    - 항목 만료 시각은 토큰 exp와 TTL 중 빠른 쪽
+    - 최대 크기 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # 다이게스트 -> (만료 시각, 스냅샷, 세션 확인 시각)
+        self._entries: "OrderedDict[str, tuple[float, dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> tuple[dict, float] | None:
+        """(스냅샷, 세션 확인 시각) 또는 None"""
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot, checked_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot, checked_at
+
+    def set(self, token: str, snapshot: dict, token_exp: float | None = None):
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, snapshot, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def mark_session_checked(self, token: str):
+        """세션 저장소에서 세션을 다시 확인한 시각 기록"""
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], time.time())
+
+    def invalidate(self, token: str):
+        self.invalidate_digests([token_digest(token)])
+
+    def invalidate_digests(self, digests):
+        """토큰 다이게스트 목록으로 제거 (세션 저장소에서 삭제된 세션)"""
+        with self._lock:
+            for key in digests:
+                self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id: int):
+        """특정 사용자의 모든 토큰 항목 제거 (로그인/세션 변경 시)"""
+        with self._lock:
+            stale = [k for k, (_, snap, _) in self._entries.items() if snap.get("id") == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# 앱 전체에서 공유하는 캐시 인스턴스 (워커 프로세스 단위)
+principal_cache = PrincipalCache(
+    max_size=config.settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=config.settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+def _timestamp(value: datetime) -> float:
+    """세션 만료 시각(UTC, 시간대가 없으면 UTC로 간주)을 UNIX 초로 변환"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def _snapshot_user(user: models.User) -> dict:
+    """세션과 분리해 보관할 수 있도록 컬럼 값만 복사"""
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(models.User).column_attrs}
+
+async def _restore_user(db: AsyncSession, snapshot: dict) -> models.User:
+    """스냅샷을 현재 세션에 SELECT 없이 연결된 User 인스턴스로 복원"""
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
 # ==================== 기존 함수에 데코레이터 적용 ====================
 
-@measure_execution_time
+@metrics.timed
 @log_auth_activity
 @handle_auth_errors
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -76,8 +218,9 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     if not config.settings.ALGORITHM:
         raise ValueError("ALGORITHM이 설정되지 않았습니다")
         
-    # 토큰에 담을 데이터 복사
+    # 토큰에 담을 데이터 복사 (같은 초에 여러 기기에서 로그인해도 토큰이 겹치지 않도록 jti 추가)
     to_encode = data.copy()
+    to_encode.setdefault("jti", secrets.token_urlsafe(12))
     # 만료 시간 설정
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=config.settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
@@ -89,12 +232,12 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     )
     return encoded_jwt
 
-@measure_execution_time
-@log_auth_activity
+@metrics.timed
+@log_auth_activity(sampled=True)
 @handle_auth_errors
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_db)
 ):
     # 인증 실패 시 반환할 예외 객체 미리 정의
     credentials_exception = HTTPException(
@@ -102,6 +245,20 @@ def get_current_user(
         detail="토큰 인증 실패",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    # 캐시 적중 시 JWT 디코딩과 DB 조회 생략, 세션은 재확인 간격이 지났을 때만 확인 (로그아웃/기기 제한으로 삭제된 세션 거부)
+    cache_enabled = config.settings.PRINCIPAL_CACHE_ENABLED
+    if cache_enabled:
+        cached = principal_cache.get(token)
+        if cached is not None:
+            snapshot, checked_at = cached
+            if time.time() - checked_at >= config.settings.PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS:
+                session = await session_store.get(db, token)
+                if session is None or session.user_id != snapshot.get("id"):
+                    principal_cache.invalidate(token)
+                    raise credentials_exception
+                principal_cache.mark_session_checked(token)
+            return await _restore_user(db, snapshot)
     
     # JWT 디코딩 및 유효성 검사
     payload = jwt.decode(
@@ -114,9 +271,43 @@ def get_current_user(
         raise credentials_exception
     token_data = schemas.TokenData(email=email)
     
-    # DB에서 사용자 정보 조회
-    user = crud.get_user_by_email(db, email=token_data.email)
-    if user is None:
+    # 토큰 다이게스트로 활성 세션과 사용자를 한 번에 조회 (로그아웃/만료된 토큰 거부)
+    found = await session_store.get_with_user(db, token)
+    if found is None:
+        raise credentials_exception
+    session, user = found
+    if user.email != token_data.email:
         logger.warning(f"사용자를 찾을 수 없음: {token_data.email}")
         raise credentials_exception
+
+    if cache_enabled:
+        # 캐시 항목은 토큰 exp와 세션 만료 중 빠른 시각까지만 유지
+        expires = _timestamp(session.expires_at)
+        if payload.get("exp"):
+            expires = min(expires, payload["exp"])
+        principal_cache.set(token, _snapshot_user(user), token_exp=expires)
     return user
+
+async def get_current_admin(current_user: models.User = Depends(get_current_user)):
+    """관리자(role=admin)만 허용 (그 외 사용자는 403)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
+    return current_user
+
+async def require_internal_access(request: Request, db: AsyncSession = Depends(database.get_db)):
+    """
+    내부 통계/지표 엔드포인트 접근 검사
+    - INTERNAL_API_TOKEN이 설정되어 있으면 그 값을 Bearer 토큰으로 보낸 요청 허용 (지표 수집기/운영 도구용)
+    - 그 외에는 관리자(role=admin) 로그인 토큰 필요
+    """
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증이 필요합니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    internal_token = config.settings.INTERNAL_API_TOKEN
+    if internal_token and secrets.compare_digest(credentials.encode("utf-8"), internal_token.encode("utf-8")):
+        return
+    await get_current_admin(await get_current_user(credentials, db))
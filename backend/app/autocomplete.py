@@ -0,0 +1,261 @@
+import asyncio
+import bisect
+import heapq
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, List, Optional
+from . import crud, review_search, search_buffer
+from .config import settings
+
+# 인기 점수 기준 시각 (2024-01-01 UTC) - 점수는 이 시각 이후 경과 시간만큼 커지는 log2 값
+_EPOCH = 1704067200.0
+# 접두어 범위가 이보다 작으면 캐시 없이 바로 상위 k개 계산
+_SCAN_LIMIT = 256
+# 접두어별 상위 목록 캐시 크기 (내 기록과 겹치는 항목을 건너뛰어도 limit을 채울 수 있도록 여유 있게)
+_CACHE_K = 32
+_PREFIX_END = "\U0010ffff"
+
+def _timestamp(value) -> float:
+    """datetime/None을 UNIX 초로 변환 (시간대가 없으면 UTC로 간주)"""
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def _log_weight(count: float, at: float) -> float:
+    """
+    시간 감쇠 인기 점수 (forward decay): log2(count) + 경과 시간 / 반감기
+    - 반감기만큼 오래된 검색은 최근 검색의 절반 가치, 점수끼리 바로 비교 가능 (다시 계산할 필요 없음)
+    """
+    half_life = settings.AUTOCOMPLETE_HALF_LIFE_DAYS * 86400
+    return math.log2(max(count, 1)) + (at - _EPOCH) / half_life
+
+def _log_add(a: float, b: float) -> float:
+    """log2(2^a + 2^b)"""
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log2(1 + 2 ** (low - high))
+
+@dataclass(eq=False)
+class Suggestion:
+    text: str
+    kind: str  # place / query / history
+    weight: float
+    place_id: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        return {"text": self.text, "kind": self.kind, "place_id": self.place_id}
+
+# ==================== 전체 인기 검색어/장소 접두어 색인 ====================
+
+class PrefixIndex:
+    """
+    정규화한 문자열의 정렬 배열 + bisect 접두어 범위 조회
+    - 범위가 작으면 바로 상위 k개 계산, 크면(짧은 접두어) 접두어별 상위 목록을 캐시
+    - 점수 누적 시 그 항목의 접두어 캐시만 제자리에서 갱신 (다시 계산하지 않음)
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._entries: Dict[str, Suggestion] = {}
+        self._top: Dict[str, List[Suggestion]] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def contains(self, key: str) -> bool:
+        return key in self._entries
+
+    def add(self, text: str, kind: str, log_weight: float, place_id: Optional[int] = None):
+        """항목 추가 또는 점수 누적 (장소 항목은 같은 이름의 검색어 항목을 대체)"""
+        key = review_search.normalize(text).strip()
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._keys) >= settings.AUTOCOMPLETE_MAX_ENTRIES:
+                return
+            bisect.insort(self._keys, key)
+            entry = self._entries[key] = Suggestion(text, kind, log_weight, place_id)
+        else:
+            entry.weight = _log_add(entry.weight, log_weight)
+            if kind == "place":
+                entry.text, entry.kind, entry.place_id = text, kind, place_id
+        for end in range(1, len(key) + 1):
+            cached = self._top.get(key[:end])
+            if cached is not None:
+                self._promote(cached, entry)
+
+    @staticmethod
+    def _promote(cached: List[Suggestion], entry: Suggestion):
+        """
+        점수가 오른 항목을 캐시된 상위 목록에 반영
+        - 점수는 늘어나기만 하므로 목록 밖 항목이 목록 안 항목을 밀어낼 일은 이 항목 말고는 없음
+        """
+        if entry in cached:
+            cached.sort(key=lambda item: item.weight, reverse=True)
+        elif entry.weight > cached[-1].weight:
+            cached.pop()
+            cached.append(entry)
+            cached.sort(key=lambda item: item.weight, reverse=True)
+
+    def top(self, prefix: str, k: int) -> List[Suggestion]:
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + _PREFIX_END, lo)
+        if hi - lo <= _SCAN_LIMIT:
+            return self._best(lo, hi, k)
+        cached = self._top.get(prefix)
+        if cached is None or len(cached) < k:
+            cached = self._top[prefix] = self._best(lo, hi, max(k, _CACHE_K))
+        return cached[:k]
+
+    def _best(self, lo: int, hi: int, k: int) -> List[Suggestion]:
+        entries = self._entries
+        return heapq.nlargest(k, (entries[key] for key in self._keys[lo:hi]), key=lambda entry: entry.weight)
+
+# ==================== 자동완성 서비스 ====================
+
+class AutocompleteService:
+    """
+    검색창 자동완성 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - 전체: AUTOCOMPLETE_MIN_USERS명 이상이 검색한 검색어와 리뷰가 있는 장소, 첫 요청 시 DB에서 적재
+      (점수는 검색한 사용자 수 기준 - 같은 사용자의 반복 검색은 점수를 올리지 않음)
+    - 사용자별: 내 최근 검색 기록 (LRU로 AUTOCOMPLETE_MAX_USERS명까지 보관)
+    - 검색 기록 저장/삭제, 리뷰 작성 시 바로 반영 (다른 워커의 변경은 재시작 전까지 반영되지 않음)
+    """
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+        self._users: "OrderedDict[int, Dict[str, Suggestion]]" = OrderedDict()
+        # 검색어별 (적재 이후) 검색한 사용자 - 전체 색인 승격 판단과 사용자 수 기준 점수용
+        self._term_users: "OrderedDict[str, set]" = OrderedDict()
+        self.lookups = 0
+
+    async def _ensure_loaded(self, db):
+        if self.loaded:
+            return
+        async with self._load_lock:
+            if self.loaded:
+                return
+            limit = settings.AUTOCOMPLETE_MAX_ENTRIES
+            for text, users, last_at in await crud.get_popular_searches_async(db, limit, settings.AUTOCOMPLETE_MIN_USERS):
+                self.index.add(text, "query", _log_weight(users, _timestamp(last_at)))
+            for place_id, name, review_count, last_review_at in await crud.get_autocomplete_places_async(db, limit):
+                self.index.add(name, "place", _log_weight(review_count, _timestamp(last_review_at)), place_id)
+            self.loaded = True
+
+    async def _user_entries(self, db, user_id: int) -> Dict[str, Suggestion]:
+        entries = self._users.get(user_id)
+        if entries is not None:
+            self._users.move_to_end(user_id)
+            return entries
+        entries = {}
+        records = await crud.get_recent_search_history_async(db, user_id, settings.SEARCH_HISTORY_MAX_PER_USER)
+        pending = search_buffer.search_history_buffer.pending_for(user_id)
+        # 오래된 것부터 넣어 같은 키는 최신 기록이 남도록 함
+        for record in list(reversed(records)) + list(reversed(pending)):
+            self._put_history(entries, record.name or record.query, _timestamp(record.created_at))
+        self._users[user_id] = entries
+        while len(self._users) > settings.AUTOCOMPLETE_MAX_USERS:
+            self._users.popitem(last=False)
+        return entries
+
+    @staticmethod
+    def _put_history(entries: Dict[str, Suggestion], text: str, at: float):
+        key = review_search.normalize(text).strip()
+        if key:
+            entries[key] = Suggestion(text, "history", at)
+
+    async def suggest(self, db, user_id: int, prefix: str, limit: int) -> List[dict]:
+        """
+        접두어로 시작하는 추천 목록
+        - 내 최근 검색 기록(최신순)을 최대 절반까지 먼저, 나머지는 인기 점수 순 (같은 문자열은 한 번만)
+        """
+        await self._ensure_loaded(db)
+        entries = await self._user_entries(db, user_id)
+        self.lookups += 1
+        prefix = review_search.normalize(prefix).strip()
+        if not prefix:
+            return []
+        history = heapq.nlargest(
+            (limit + 1) // 2,
+            (entry for key, entry in entries.items() if key.startswith(prefix)),
+            key=lambda entry: entry.weight,
+        )
+        seen = {review_search.normalize(entry.text).strip() for entry in history}
+        results = [entry.as_dict() for entry in history]
+        for entry in self.index.top(prefix, limit + len(history)):
+            if len(results) >= limit:
+                break
+            if review_search.normalize(entry.text).strip() not in seen:
+                results.append(entry.as_dict())
+        return results
+
+    # ---------- 변경 반영 ----------
+
+    def record_search(self, user_id: int, query: str, is_place: bool, name: Optional[str]):
+        """검색 기록 저장 시 호출 (사용자 기록에 반영, 검색 사용자 수가 기준을 넘은 검색어만 전체 색인에 반영)"""
+        text = name if is_place and name else query
+        now = time.time()
+        if self.loaded:
+            self._count_user(text, user_id, now)
+        entries = self._users.get(user_id)
+        if entries is not None:
+            self._put_history(entries, text, now)
+
+    def _count_user(self, text: str, user_id: int, now: float):
+        """
+        검색어의 검색 사용자 추적
+        - 처음 검색한 사용자일 때만 점수 누적 (적재 시 점수와 같은 사용자 수 기준)
+        - 색인에 없는 검색어는 적재 이후 검색한 사용자가 AUTOCOMPLETE_MIN_USERS명이 되면 그 수로 승격
+          (적재 전 검색한 사용자는 세지 않으므로 승격이 늦어질 수는 있어도 기준보다 빨라지지 않음)
+        """
+        key = review_search.normalize(text).strip()
+        if not key:
+            return
+        users = self._term_users.get(key)
+        if users is None:
+            users = self._term_users[key] = set()
+            while len(self._term_users) > settings.AUTOCOMPLETE_MAX_TRACKED_TERMS:
+                self._term_users.popitem(last=False)
+        else:
+            self._term_users.move_to_end(key)
+        if user_id in users:
+            return
+        users.add(user_id)
+        if self.index.contains(key):
+            self.index.add(text, "query", _log_weight(1, now))
+        elif len(users) >= settings.AUTOCOMPLETE_MIN_USERS:
+            self.index.add(text, "query", _log_weight(len(users), now))
+
+    def record_place(self, place_id: int, name: str):
+        """장소가 연결된 리뷰 작성 시 호출"""
+        if self.loaded:
+            self.index.add(name, "place", _log_weight(1, time.time()), place_id)
+
+    def forget_search(self, user_id: int, text: Optional[str] = None):
+        """검색 기록 삭제 시 호출 (text가 없으면 사용자 기록 전체)"""
+        if text is None:
+            self._users.pop(user_id, None)
+            return
+        entries = self._users.get(user_id)
+        if entries is not None:
+            entries.pop(review_search.normalize(text).strip(), None)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "entries": len(self.index),
+            "cached_prefixes": len(self.index._top),
+            "cached_users": len(self._users),
+            "tracked_terms": len(self._term_users),
+            "lookups": self.lookups,
+        }
+
+# 앱 전체에서 공유하는 자동완성 서비스 (워커 프로세스 단위)
+autocomplete_service = AutocompleteService()
@@ -0,0 +1,210 @@
+import codecs
+import csv
+import json
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from . import crud, database, schemas, autocomplete, responses
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class RecordTooLargeError(ValueError):
+    pass
+
+# ==================== 요청 본문 → 레코드 ====================
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 청크 스트림을 줄 단위 문자열로 변환 (UTF-8, BOM 제거, 줄바꿈 포함)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        start = 0
+        while True:
+            end = pending.find("\n", start)
+            if end < 0:
+                break
+            yield pending[start:end + 1]
+            start = end + 1
+        pending = pending[start:]
+        if len(pending) > settings.BULK_IMPORT_MAX_RECORD_CHARS:
+            raise RecordTooLargeError(f"한 행이 {settings.BULK_IMPORT_MAX_RECORD_CHARS}자를 넘습니다.")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+async def _ndjson_records(chunks) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """NDJSON 한 줄을 한 행으로 - (줄 번호, 값, 오류) (빈 줄은 건너뜀)"""
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"JSON 형식 오류: {e}"
+            continue
+        if not isinstance(value, dict):
+            yield line_no, None, "각 줄은 JSON 객체여야 합니다."
+            continue
+        yield line_no, value, None
+
+async def _csv_records(chunks) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    첫 레코드를 헤더로 하는 CSV - (레코드 시작 줄 번호, 값, 오류)
+    - 따옴표 안의 줄바꿈은 따옴표 수가 짝수가 될 때까지 이어 붙여 한 레코드로 처리
+    - 빈 값은 생략해 선택 필드는 기본값, 필수 필드는 누락 오류가 되도록 함
+    """
+    header = None
+    record, start_line, line_no = "", 0, 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not record:
+            start_line = line_no
+        record += line
+        if record.count('"') % 2:
+            if len(record) > settings.BULK_IMPORT_MAX_RECORD_CHARS:
+                raise RecordTooLargeError(f"한 행이 {settings.BULK_IMPORT_MAX_RECORD_CHARS}자를 넘습니다.")
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield start_line, None, f"열 수가 헤더와 다릅니다 ({len(fields)}/{len(header)})."
+            continue
+        yield start_line, {name: value for name, value in zip(header, fields) if value != ""}, None
+    if record:
+        yield start_line, None, "따옴표가 닫히지 않았습니다."
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+# ==================== 가져오기 ====================
+
+class ImportReport:
+    """가져오기 결과 집계 (오류 행은 BULK_IMPORT_MAX_ERRORS개까지만 보관)"""
+
+    def __init__(self):
+        self.received = 0
+        self.imported = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors: List[dict] = []
+
+    def fail(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "failed": self.failed,
+            "batches": self.batches,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+async def _flush(db, batch: List[Tuple[int, schemas.ReviewImportRow]], report: ImportReport):
+    """검증된 행 묶음을 한 트랜잭션으로 저장 (실패하면 묶음 전체를 오류로 보고하고 다음 묶음 진행)"""
+    report.batches += 1
+    try:
+        inserted, rejected = await crud.import_reviews_batch_async(db, [row for _, row in batch])
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.warning(f"리뷰 가져오기 묶음 저장 실패 (줄 {batch[0][0]}~{batch[-1][0]}): {e}")
+        for line, _ in batch:
+            report.fail(line, f"저장 실패: {e.__class__.__name__}")
+        return
+    for position, message in rejected.items():
+        report.fail(batch[position][0], message)
+    report.imported += len(inserted)
+    for _, row in inserted:
+        if row.place_id is not None:
+            autocomplete.autocomplete_service.record_place(row.place_id, row.place_name)
+
+async def import_reviews(db, chunks: AsyncIterator[bytes], fmt: str) -> dict:
+    """
+    NDJSON/CSV 요청 본문을 읽으면서 행마다 검증하고 BULK_IMPORT_BATCH_SIZE개씩 저장
+    - 본문 전체를 메모리에 올리지 않음 (한 묶음 분량만 보관)
+    - 잘못된 행은 건너뛰고 줄 번호와 함께 보고, 이미 저장된 묶음은 되돌리지 않음
+    """
+    records = _csv_records(chunks) if fmt == "csv" else _ndjson_records(chunks)
+    report = ImportReport()
+    batch: List[Tuple[int, schemas.ReviewImportRow]] = []
+    try:
+        async for line, value, error in records:
+            report.received += 1
+            if error is None:
+                try:
+                    batch.append((line, schemas.ReviewImportRow.model_validate(value)))
+                except ValidationError as e:
+                    error = _validation_message(e)
+            if error is not None:
+                report.fail(line, error)
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                await _flush(db, batch, report)
+                batch = []
+    except (RecordTooLargeError, UnicodeDecodeError) as e:
+        # 이후 행 경계를 알 수 없으므로 읽기를 멈추고 그때까지 검증된 행만 저장
+        report.fail(report.received + 1, str(e))
+    if batch:
+        await _flush(db, batch, report)
+    return report.as_dict()
+
+# ==================== 내보내기 ====================
+
+def _export_record(item) -> dict:
+    """내보내기 한 행 (가져오기 형식과 같은 필드 + id/created_at/이미지, 날짜는 직렬화 시 ISO 문자열)"""
+    row, images = item
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "place_id": row.place_id,
+        "place_name": row.place_name,
+        "place_address": row.place_address,
+        "review_date": row.review_date,
+        "rating": row.rating,
+        "companion": row.companion,
+        "review_text": row.review_text,
+        "created_at": row.created_at,
+        "images": [
+            {
+                "position": image.position,
+                "path": image.path,
+                "digest": image.digest,
+                "bytes": image.bytes,
+                "width": image.width,
+                "height": image.height,
+                "variants": image.variants or [],
+            }
+            for image in images
+        ],
+    }
+
+async def _with_images(db, partitions):
+    """리뷰 행 묶음마다 이미지를 IN 조회 한 번으로 붙임 - [(행, 이미지 목록)]"""
+    async for rows in partitions:
+        images = await crud.get_review_images_by_review_ids_async(db, [row.id for row in rows])
+        yield [(row, images.get(row.id, ())) for row in rows]
+
+async def export_reviews(user_id: Optional[int] = None, place_id: Optional[int] = None,
+                         after_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    리뷰를 id 순 NDJSON으로 내보내는 스트림 (서버 측 커서 묶음마다 한 번씩 전송)
+    - 응답이 끝날 때까지 쓰는 세션을 직접 열어 요청 의존성 정리 시점과 무관하게 유지
+    """
+    async with database.session_scope() as db:
+        partitions = crud.stream_reviews_async(db, user_id, place_id, after_id)
+        async for chunk in responses.iter_ndjson(_with_images(db, partitions), _export_record):
+            yield chunk
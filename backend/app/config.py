@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 # 환경설정 클래스 정의 (Pydantic 기반)
@@ -9,6 +10,172 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     # 액세스 토큰 만료 시간 (분 단위, 7일)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7일
+    # 내부 통계(/internal/*)와 지표(/metrics) 엔드포인트용 Bearer 토큰 (비어 있으면 관리자 로그인 토큰만 허용)
+    INTERNAL_API_TOKEN: str = ""
+
+    # DB 백엔드 선택 (True: asyncpg 비동기 엔진, False: psycopg2 동기 엔진 + 스레드풀)
+    USE_ASYNC_DB: bool = True
+
+    # 커넥션 풀 설정 (워커 프로세스 단위)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # 풀에서 연결을 기다리는 최대 시간 (초)
+    DB_POOL_TIMEOUT: float = 30
+    # 연결 재생성 주기 (초, -1 이면 비활성화)
+    DB_POOL_RECYCLE: int = 1800
+    # 체크아웃 시 연결 유효성 검사
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg 준비된 문장(prepared statement) 캐시 크기 (0 이면 비활성화, PgBouncer 사용 시 0 권장)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # 문장 실행 제한 시간 (밀리초, 0 이면 제한 없음)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # 서버 측 커서로 스트리밍 조회 시 한 번에 가져올 행 수
+    DB_STREAM_YIELD_PER: int = 1000
+
+    # 이미지 업로드 설정
+    UPLOAD_DIR: str = "uploads"
+    # 파일 하나당 최대 크기 (바이트)
+    UPLOAD_MAX_FILE_BYTES: int = 10 * 1024 * 1024
+    # 요청 하나당 전체 업로드 최대 크기 (바이트)
+    UPLOAD_MAX_REQUEST_BYTES: int = 50 * 1024 * 1024
+    # multipart 요청 본문 한도에 더하는 폼 필드/경계 문자열 여유분 (바이트, 본문 한도 = 위 값 + 이 값)
+    UPLOAD_FORM_OVERHEAD_BYTES: int = 1024 * 1024
+    # 디스크 복사 단위 (바이트)
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    # 요청 하나에서 동시에 저장할 최대 파일 수
+    UPLOAD_MAX_CONCURRENCY: int = 4
+    # 고아 blob 정리(python -m app.blob_sweeper) 시 이보다 최근에 만든 파일은 건너뜀 (초, 진행 중인 업로드 보호)
+    BLOB_SWEEP_GRACE_SECONDS: int = 60 * 60
+    # 콘텐츠 주소 기반(digest 이름) 미디어 캐시 유지 시간 (초)
+    MEDIA_IMMUTABLE_MAX_AGE: int = 60 * 60 * 24 * 365
+    # 그 외 미디어 파일의 Cache-Control (ETag로 재검증)
+    MEDIA_DEFAULT_CACHE_CONTROL: str = "public, no-cache"
+
+    # 이미지 후처리 설정 (썸네일/WebP 변환/EXIF 제거)
+    IMAGE_PROCESSING_ENABLED: bool = True
+    # 후처리 프로세스 풀 크기
+    IMAGE_PROCESS_WORKERS: int = 2
+    # 생성할 썸네일 긴 변 길이 (픽셀)
+    IMAGE_THUMBNAIL_SIZES: list[int] = [160, 480, 1080]
+    IMAGE_WEBP_QUALITY: int = 80
+    # AVIF 변환 (Pillow가 지원할 때만, 인코딩 비용이 큼)
+    IMAGE_AVIF_ENABLED: bool = False
+
+    # 사용자별 검색 기록 최대 보관 수 (초과분은 오래된 순으로 삭제, 0 이면 제한 없음)
+    SEARCH_HISTORY_MAX_PER_USER: int = 100
+    # 검색 기록 쓰기 지연(write-behind) 버퍼 사용 여부 (버퍼에 있는 동안 응답의 id는 null)
+    SEARCH_HISTORY_WRITE_BEHIND: bool = False
+    # 버퍼가 이 개수에 도달하면 즉시 일괄 저장
+    SEARCH_HISTORY_FLUSH_SIZE: int = 200
+    # 일괄 저장 주기 (초)
+    SEARCH_HISTORY_FLUSH_INTERVAL: float = 1.0
+    # 버퍼 최대 기록 수 (DB 장애로 쌓이면 오래된 기록부터 버림)
+    SEARCH_HISTORY_BUFFER_MAX_SIZE: int = 10000
+    # 기록별 일괄 저장 재시도 횟수 (다 쓰면 한 건씩 기록하고 실패한 기록은 버림)
+    SEARCH_HISTORY_FLUSH_MAX_RETRIES: int = 3
+
+    # Google Places 프록시 설정 (키는 서버에만 보관)
+    GOOGLE_MAPS_API_KEY: str = ""
+    # upstream 주소 (테스트 시 로컬 stub 서버로 변경 가능)
+    PLACES_API_BASE_URL: str = "https://maps.googleapis.com/maps/api/place"
+    # upstream 호출 제한 시간 (초)
+    PLACES_UPSTREAM_TIMEOUT: float = 5.0
+    # 응답 캐시 유지 시간 (초)
+    PLACES_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    # 유지 시간이 지난 뒤에도 응답하면서 백그라운드에서 갱신하는 기간 (초)
+    PLACES_CACHE_STALE_SECONDS: int = 60 * 60
+    # 프로세스 내 캐시 최대 항목 수 (초과 시 LRU 방식으로 제거)
+    PLACES_CACHE_MAX_SIZE: int = 5000
+    # 공유 캐시 redis 주소 (비어 있으면 프로세스 내 캐시만 사용)
+    PLACES_CACHE_REDIS_URL: str = ""
+    # 캐시 키 위치 반올림 자릿수 (3 이면 약 100m 단위)
+    PLACES_LOCATION_PRECISION: int = 3
+
+    # 위치 기반 장소 조회 방식 (auto: PostGIS 확장이 있으면 postgis, 없으면 grid)
+    GEO_BACKEND: str = "auto"
+    # 반경 조회 최대 반경 (미터)
+    NEARBY_MAX_RADIUS_M: int = 50000
+    # 순위 계산 전에 가져오는 최대 후보 수
+    NEARBY_MAX_CANDIDATES: int = 5000
+
+    # 리뷰 검색 방식 (auto: PostgreSQL이면 tsvector/trigram 인덱스, 아니면 프로세스 내 역색인)
+    SEARCH_BACKEND: str = "auto"
+    # 검색어 최대 단어 수 (초과분은 무시)
+    SEARCH_MAX_TERMS: int = 8
+    # 검색 결과 본문 요약 길이 (글자 수)
+    SEARCH_SNIPPET_CHARS: int = 120
+
+    # 검색창 자동완성 최대 항목 수 (인기 검색어 + 장소, 워커 프로세스별 메모리)
+    AUTOCOMPLETE_MAX_ENTRIES: int = 200000
+    # 인기 점수 반감기 (일, 이 기간이 지난 검색은 절반 가치)
+    AUTOCOMPLETE_HALF_LIFE_DAYS: float = 14.0
+    # 최근 검색 기록을 보관하는 최대 사용자 수 (초과 시 LRU 방식으로 제거)
+    AUTOCOMPLETE_MAX_USERS: int = 10000
+    # 전체 자동완성에 노출할 검색어의 최소 검색 사용자 수 (한 사용자만 검색한 검색어는 다른 사용자에게 보이지 않음)
+    AUTOCOMPLETE_MIN_USERS: int = 3
+    # 검색어별 검색 사용자를 추적할 최대 검색어 수 (실시간 반영용, 초과 시 LRU 방식으로 제거)
+    AUTOCOMPLETE_MAX_TRACKED_TERMS: int = 50000
+
+    # 리뷰 대량 가져오기: 한 트랜잭션(다중 행 INSERT)에 넣을 행 수
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    # 가져오기 응답에 담을 최대 오류 행 수 (나머지는 개수만 집계)
+    BULK_IMPORT_MAX_ERRORS: int = 100
+    # 한 행(NDJSON 한 줄, CSV 한 레코드)의 최대 길이 (글자 수)
+    BULK_IMPORT_MAX_RECORD_CHARS: int = 1024 * 1024
+
+    # bcrypt 비용 (바꾸면 기존 해시는 다음 로그인 성공 시 새 비용으로 다시 해싱)
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # 비밀번호 해싱 실행 방식 (process: 전용 프로세스 풀, thread: 전용 스레드풀)
+    PASSWORD_HASH_BACKEND: str = "process"
+    # 동시에 실행할 해싱 수 (워커 프로세스별 풀 크기)
+    PASSWORD_HASH_CONCURRENCY: int = 2
+    # 해싱을 기다리거나 실행 중인 요청 최대 수 (초과 시 503으로 바로 응답)
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # 로그인 세션 저장소 (sql: user_sessions 테이블, memory: 프로세스 내 - 테스트/단일 워커용)
+    SESSION_STORE_BACKEND: str = "sql"
+    # 사용자당 최대 세션(기기) 수 (초과 시 오래된 세션부터 삭제, 0 이면 제한 없음)
+    SESSION_MAX_PER_USER: int = 10
+    # users.last_login_at 갱신 간격 (초, 기록된 값이 이보다 오래되었을 때만 UPDATE)
+    SESSION_LAST_LOGIN_UPDATE_SECONDS: int = 60 * 60
+    # 만료 세션 정리 작업 (워커마다 실행, 여러 워커가 동시에 정리하지 않도록 advisory lock)
+    SESSION_SWEEP_ENABLED: bool = True
+    # 정리 주기 (초)
+    SESSION_SWEEP_INTERVAL_SECONDS: float = 300.0
+    # 한 트랜잭션에서 삭제할 세션 수
+    SESSION_SWEEP_BATCH_SIZE: int = 500
+    # 배치 사이 대기 시간 (초)
+    SESSION_SWEEP_BATCH_PAUSE_SECONDS: float = 0.05
+
+    # 지표 수집 (/metrics, 라우트별 응답 시간, SQL 실행 시간)
+    METRICS_ENABLED: bool = True
+    # 이 시간(ms) 이상 걸린 SQL 문은 경고 로그로 기록 (바인딩 값 제외)
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # 느린 쿼리 로그에 남길 SQL 최대 길이
+    SLOW_QUERY_LOG_MAX_CHARS: int = 2000
+
+    # 요청 단위 SQL 문 수 예산 (get_db 세션 기준, N+1 쿼리 감지)
+    QUERY_BUDGET_ENABLED: bool = True
+    # log: 요청 끝에 경고 로그와 지표, raise: 넘는 순간 QueryBudgetExceeded (테스트/CI용)
+    QUERY_BUDGET_MODE: str = "log"
+    # 요청당 허용 SQL 문 수 (0 이면 제한 없음)
+    QUERY_BUDGET_DEFAULT: int = 20
+    # 라우트별 예산 ("메서드 라우트 템플릿": 문 수, 0 이면 그 라우트는 검사하지 않음)
+    QUERY_BUDGET_ROUTES: Dict[str, int] = {"POST /admin/reviews:import": 0}
+    # 같은 모양의 SQL 문 허용 횟수 (넘으면 N+1 의심, 0 이면 검사 안 함)
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # 검증된 사용자(principal) 캐시 설정
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    # 캐시 항목 최대 유지 시간 (초, 토큰 exp를 넘지 않음) - 사용자 정보(역할 등) 변경이 다른 워커에 늦게 반영되는 최대 시간
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    # 캐시 적중 시 세션 저장소 재확인 간격 (초) - 다른 워커의 로그아웃/기기 제한이 늦게 반영되는 최대 시간
+    # (같은 워커의 로그아웃은 즉시 반영, 0 이면 적중마다 확인)
+    PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS: int = 30
+    # 캐시 최대 항목 수 (초과 시 LRU 방식으로 제거)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    # 인증 핫패스 로그 샘플링 비율 (0.0 ~ 1.0)
+    AUTH_LOG_SAMPLE_RATE: float = 0.01
 
 # 설정 객체 생성 (앱 전체에서 사용)
 settings = Settings()
\ No newline at end of file
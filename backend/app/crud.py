@@ -1,14 +1,17 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from . import models, schemas
-from passlib.context import CryptContext
-from datetime import datetime
+from sqlalchemy import select, insert, update, delete, func, and_, or_, tuple_, literal_column, text, null
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import Counter
+from . import models, schemas, storage, pagination, geo, review_search, database
+from .password_hashing import password_hasher, pwd_context
+from .config import settings
+from datetime import datetime, timedelta
 import asyncio
-from typing import List, Optional
+import logging
+from typing import List, Optional, Tuple
 
-# 비밀번호 해싱을 위한 패스워드 컨텍스트 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
 
 # ==================== 기존 동기 함수들 (호환성 유지) ====================
 
@@ -47,11 +50,13 @@ def create_review(db: Session, review_data: dict):
         rating=review_data["rating"],
         companion=review_data["companion"],
         review_text=review_data["review_text"],
-        image_paths=review_data["image_paths"]
+        images=_review_images(review_data.get("images"))
     )
     db.add(db_review)
+    _apply_review_stats(db, _NO_REVIEW, _review_stats_key(db_review))
     db.commit()
     db.refresh(db_review)
+    _index_review(db_review)
     return db_review
 
 # 리뷰 생성 - 스키마 객체 입력
@@ -63,12 +68,13 @@ def create_review_from_schema(db: Session, review: schemas.ReviewCreate, user_id
         review_date=review.review_date,
         rating=review.rating,
         companion=review.companion,
-        review_text=review.review_text,
-        image_paths=review.image_paths
+        review_text=review.review_text
     )
     db.add(db_review)
+    _apply_review_stats(db, _NO_REVIEW, _review_stats_key(db_review))
     db.commit()
     db.refresh(db_review)
+    _index_review(db_review)
     return db_review
 
 # 특정 사용자의 리뷰 목록 조회 (페이징)
@@ -93,14 +99,17 @@ def update_review(db: Session, review_id: int, review_update: schemas.ReviewUpda
     review = db.query(models.Review).filter(models.Review.id == review_id).first()
     if not review:
         return None
+    before = _review_stats_key(review)
     update_data = review_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(review, key, value)
+    _apply_review_stats(db, before, _review_stats_key(review))
     db.commit()
     db.refresh(review)
+    _index_review(review)
     return review
 
-# 리뷰 삭제 (user_id 전달 시 본인 리뷰만 삭제)
+# 리뷰 삭제 (user_id 전달 시 본인 리뷰만 삭제, 참조가 없어진 이미지 blob 정리)
 def delete_review(db: Session, review_id: int, user_id: int = None):
     query = db.query(models.Review).filter(models.Review.id == review_id)
     if user_id:
@@ -108,8 +117,18 @@ def delete_review(db: Session, review_id: int, user_id: int = None):
     review = query.first()
     if not review:
         return False
+    orphans = []
+    decrements, gc_stmt = _media_blob_release_statements([image.digest for image in review.images])
+    for stmt in decrements:
+        db.execute(stmt)
+    if gc_stmt is not None:
+        orphans = db.execute(gc_stmt).all()
+    before = _review_stats_key(review)
     db.delete(review)
+    _apply_review_stats(db, before, _NO_REVIEW)
     db.commit()
+    review_search.review_index.discard(review_id)
+    remove_unreferenced_blobs(db, orphans)
     return True
 
 # 특정 장소의 리뷰 목록 조회 (페이징)
@@ -118,9 +137,860 @@ def get_reviews_by_place(db: Session, place_name: str, skip: int = 0, limit: int
         models.Review.place_name == place_name
     ).offset(skip).limit(limit).all()
 
-# 사용자의 총 리뷰 개수 반환
+# 사용자의 총 리뷰 개수 반환 (COUNT 대신 사용자 집계 행 조회)
 def get_user_review_count(db: Session, user_id: int):
-    return db.query(models.Review).filter(models.Review.user_id == user_id).count()
+    stats = db.get(models.UserStats, user_id)
+    return stats.review_count if stats else 0
+
+# 리뷰 변경을 flush 한 뒤 사용자/장소 집계 갱신 (커밋은 호출자가 수행)
+def _apply_review_stats(db: Session, before: tuple, after: tuple):
+    statements = _review_stats_changes(db, before, after)
+    if statements:
+        db.flush()
+    for stmt in statements:
+        db.execute(stmt)
+
+# ==================== 이미지 blob 참조 수 관리 ====================
+
+def _review_images(uploads: Optional[List[storage.StoredUpload]]) -> List[models.ReviewImage]:
+    """업로드 목록을 순서대로 리뷰 이미지 행으로 변환"""
+    return [
+        models.ReviewImage(position=position, digest=upload.digest, path=upload.path, bytes=upload.bytes)
+        for position, upload in enumerate(uploads or [])
+    ]
+
+def _dialect_insert(db, model):
+    """DB 종류에 맞는 INSERT 구문 (ON CONFLICT 지원: PostgreSQL/SQLite)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    # 앱 시작 시 database.check_supported_dialect()로 걸러지므로 여기까지 오면 설정 오류
+    raise database.UnsupportedDatabaseError(f"지원하지 않는 DB입니다: {dialect}")
+
+# media_blobs digest별 advisory lock 네임스페이스 (2-인자 형태, 세션 정리 등의 1-인자 키와 겹치지 않음)
+MEDIA_BLOB_LOCK_NAMESPACE = 0x6D62
+
+def _media_blob_lock_statements(db, digests) -> list:
+    """
+    digest별 트랜잭션 단위 advisory lock 구문 (PostgreSQL, 교착을 피하려고 정렬된 순서)
+    - 업로드 공개(파일 존재 확인 + 참조 수 증가)와 참조 없는 파일 삭제가 같은 digest에서 겹치지 않게 함
+    - 다른 DB는 잠금 없음 (SQLite는 개발용, 쓰기 트랜잭션이 하나)
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    return [
+        select(func.pg_advisory_xact_lock(MEDIA_BLOB_LOCK_NAMESPACE, int(digest[:7], 16)))
+        for digest in sorted(set(digests))
+    ]
+
+def _media_blob_upsert(db, uploads: List[storage.StoredUpload]):
+    """업로드 목록의 blob 참조 수를 한 번에 증가 (없으면 생성), digest별 기록된 경로 반환"""
+    counts = Counter(upload.digest for upload in uploads)
+    rows = {}
+    for upload in uploads:
+        rows[upload.digest] = {
+            "digest": upload.digest,
+            "path": upload.path,
+            "bytes": upload.bytes,
+            "ref_count": counts[upload.digest],
+        }
+    stmt = _dialect_insert(db, models.MediaBlob).values(list(rows.values()))
+    return stmt.on_conflict_do_update(
+        index_elements=[models.MediaBlob.digest],
+        set_={"ref_count": models.MediaBlob.ref_count + stmt.excluded.ref_count},
+    ).returning(models.MediaBlob.digest, models.MediaBlob.path)
+
+def _media_blob_release_statements(digests: List[str]):
+    """리뷰 이미지들의 digest 목록으로 참조 수 감소 구문과 고아 blob 삭제 구문 생성"""
+    if not digests:
+        return [], None
+    counts = Counter(digests)
+    decrements = [
+        update(models.MediaBlob)
+        .where(models.MediaBlob.digest == digest)
+        .values(ref_count=models.MediaBlob.ref_count - n)
+        for digest, n in counts.items()
+    ]
+    gc_stmt = (
+        delete(models.MediaBlob)
+        .where(models.MediaBlob.digest.in_(list(counts)), models.MediaBlob.ref_count <= 0)
+        .returning(models.MediaBlob.digest, models.MediaBlob.path)
+    )
+    return decrements, gc_stmt
+
+def _existing_blob_digests_statement(digests):
+    return select(models.MediaBlob.digest).where(models.MediaBlob.digest.in_(list(digests)))
+
+async def lock_media_blobs_async(db: AsyncSession, digests):
+    """digest별 blob 잠금 (트랜잭션 끝까지 유지, PostgreSQL 외에는 아무것도 하지 않음)"""
+    for stmt in _media_blob_lock_statements(db, digests):
+        await db.execute(stmt)
+
+async def acquire_media_blobs_async(db: AsyncSession, uploads: List[storage.StoredUpload]):
+    """
+    리뷰 저장 트랜잭션 안에서 blob 참조 수 증가 후 업로드 임시 파일 공개 (커밋은 호출자가 수행)
+    - digest 잠금을 커밋까지 잡은 채로 파일 존재를 확인하므로, 동시에 삭제되는 blob 파일을 재사용하지 않음
+    - 같은 digest가 이미 있으면 기록된 경로(처음 저장된 확장자)를 그대로 사용
+    """
+    if not uploads:
+        return
+    await lock_media_blobs_async(db, [upload.digest for upload in uploads])
+    result = await db.execute(_media_blob_upsert(db, uploads))
+    paths = dict(result.all())
+    await asyncio.to_thread(storage.publish_uploads, uploads, paths)
+
+async def release_media_blobs_async(db: AsyncSession, digests: List[str]) -> list:
+    """blob 참조 수 감소 후 참조가 없어진 blob 행 삭제, 삭제된 (digest, 경로) 반환 (커밋은 호출자가 수행)"""
+    decrements, gc_stmt = _media_blob_release_statements(digests)
+    for stmt in decrements:
+        await db.execute(stmt)
+    if gc_stmt is None:
+        return []
+    result = await db.execute(gc_stmt)
+    return result.all()
+
+def remove_unreferenced_blobs(db: Session, blobs: list) -> int:
+    """
+    커밋 후 참조가 없어진 blob 파일 삭제 (새 트랜잭션에서 digest 잠금을 잡고 행이 다시 생기지 않았는지 확인)
+    - 삭제한 blob 수 반환
+    """
+    if not blobs:
+        return 0
+    for stmt in _media_blob_lock_statements(db, [digest for digest, _ in blobs]):
+        db.execute(stmt)
+    revived = set(db.execute(_existing_blob_digests_statement(digest for digest, _ in blobs)).scalars().all())
+    removed = [path for digest, path in blobs if digest not in revived]
+    for path in removed:
+        storage.remove_blob_files(path)
+    db.commit()
+    return len(removed)
+
+async def remove_unreferenced_blobs_async(db: AsyncSession, blobs: list) -> int:
+    """remove_unreferenced_blobs의 비동기 버전 (파일 삭제는 스레드풀에서)"""
+    if not blobs:
+        return 0
+    await lock_media_blobs_async(db, [digest for digest, _ in blobs])
+    result = await db.execute(_existing_blob_digests_statement(digest for digest, _ in blobs))
+    revived = set(result.scalars().all())
+    removed = [path for digest, path in blobs if digest not in revived]
+    for path in removed:
+        await asyncio.to_thread(storage.remove_blob_files, path)
+    await db.commit()
+    return len(removed)
+
+# ==================== 콘텐츠 주소 이전 리뷰 이미지 (app.image_backfill) ====================
+# 008_review_images.sql이 옮긴 기존 image_paths 항목(uploads/<uuid>.<확장자>)은 digest 자리에 파일명이 들어 있고
+# media_blobs 행이 없음 (레거시 행) - 백필로 blob 경로/참조 수를 갖춘 일반 행으로 전환
+
+async def get_legacy_review_image_paths_async(db: AsyncSession, after: Optional[str], limit: int) -> List[str]:
+    """media_blobs 행이 없는 리뷰 이미지의 경로를 경로 순 키셋으로 limit개 조회 (같은 경로는 한 번)"""
+    stmt = (
+        select(models.ReviewImage.path)
+        .outerjoin(models.MediaBlob, models.MediaBlob.digest == models.ReviewImage.digest)
+        .where(models.MediaBlob.digest.is_(None))
+    )
+    if after is not None:
+        stmt = stmt.where(models.ReviewImage.path > after)
+    stmt = stmt.group_by(models.ReviewImage.path).order_by(models.ReviewImage.path).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
+
+async def adopt_legacy_review_images_async(db: AsyncSession, legacy_path: str, upload: storage.StoredUpload) -> int:
+    """
+    같은 레거시 경로를 가리키는 리뷰 이미지 행을 blob으로 전환, 전환한 행 수 반환 (커밋은 호출자가 수행)
+    - 행 수만큼 blob 참조 수를 늘리고 upload의 임시 파일을 공개 (같은 내용의 blob이 있으면 재사용)
+    - 변형/크기 정보는 새 경로에서 다시 만들 때까지 비움
+    """
+    count = await db.scalar(
+        select(func.count()).select_from(models.ReviewImage).where(models.ReviewImage.path == legacy_path)
+    )
+    if not count:
+        return 0
+    # 행마다 참조 하나 (같은 업로드 객체이므로 파일 공개는 한 번)
+    await acquire_media_blobs_async(db, [upload] * count)
+    await db.execute(
+        update(models.ReviewImage)
+        .where(models.ReviewImage.path == legacy_path)
+        .values(digest=upload.digest, path=upload.path, bytes=upload.bytes, width=None, height=None, variants=null())
+        .execution_options(synchronize_session=False)
+    )
+    return count
+
+async def update_review_image_variants_by_path_async(db: AsyncSession, processed: list):
+    """후처리 결과를 같은 경로의 리뷰 이미지 행에 기록 (커밋은 호출자가 수행)"""
+    for info in processed:
+        await db.execute(
+            update(models.ReviewImage)
+            .where(models.ReviewImage.path == info["path"])
+            .values(width=info.get("width"), height=info.get("height"), variants=info.get("variants") or [])
+            .execution_options(synchronize_session=False)
+        )
+
+# ==================== 장소 및 장소별 리뷰 집계 ====================
+
+def rating_histogram(stats) -> dict:
+    """집계 컬럼(장소/사용자)의 평점 분포 {"1": 리뷰 수, ..., "5": 리뷰 수}"""
+    return {str(n): getattr(stats, f"rating_{n}") for n in range(1, 6)}
+
+def average_rating(stats) -> Optional[float]:
+    """집계 컬럼으로 계산한 평균 평점 (리뷰가 없으면 None)"""
+    histogram = rating_histogram(stats)
+    rated = sum(histogram.values())
+    if not rated:
+        return None
+    return round(sum(int(n) * count for n, count in histogram.items()) / rated, 2)
+
+def _place_stats_statement(place_id: int, rating: int, delta: int):
+    """
+    리뷰 1건 추가(delta=1)/삭제(delta=-1)에 따른 장소 집계 갱신 구문
+    - 리뷰 수/평점별 수는 증감, 마지막 리뷰 시각은 (place_id, created_at) 인덱스로 최신 1건만 조회
+    - 리뷰 INSERT/DELETE를 flush 한 뒤 실행해야 함
+    """
+    column = f"rating_{rating}"
+    return update(models.Place).where(models.Place.id == place_id).values(**{
+        "review_count": models.Place.review_count + delta,
+        column: getattr(models.Place, column) + delta,
+        "last_review_at": (
+            select(func.max(models.Review.created_at))
+            .where(models.Review.place_id == place_id)
+            .scalar_subquery()
+        ),
+    })
+
+def _user_stats_statement(db, user_id: int, rating: int, delta: int):
+    """
+    리뷰 1건 추가/삭제에 따른 사용자 집계 갱신 구문 (집계 행이 없으면 생성하는 upsert)
+    - 마지막 리뷰 시각은 (user_id, created_at) 인덱스로 최신 1건만 조회
+    """
+    column = f"rating_{rating}"
+    last_review_at = (
+        select(func.max(models.Review.created_at))
+        .where(models.Review.user_id == user_id)
+        .scalar_subquery()
+    )
+    stmt = _dialect_insert(db, models.UserStats).values(**{
+        "user_id": user_id,
+        "review_count": delta,
+        "rating_sum": rating * delta,
+        **{f"rating_{n}": delta if n == rating else 0 for n in range(1, 6)},
+        "last_review_at": last_review_at,
+    })
+    return stmt.on_conflict_do_update(
+        index_elements=[models.UserStats.user_id],
+        set_={
+            "review_count": models.UserStats.review_count + stmt.excluded.review_count,
+            "rating_sum": models.UserStats.rating_sum + stmt.excluded.rating_sum,
+            column: getattr(models.UserStats, column) + delta,
+            "last_review_at": last_review_at,
+        },
+    )
+
+def _review_stats_changes(db, before: tuple, after: tuple) -> list:
+    """
+    리뷰의 (user_id, place_id, rating) 변경 전/후로 필요한 집계 갱신 구문 목록
+    - 추가는 before, 삭제는 after를 (None, None, None)으로 전달
+    """
+    if before == after:
+        return []
+    statements = []
+    before_user, before_place, before_rating = before
+    after_user, after_place, after_rating = after
+    if (before_user, before_rating) != (after_user, after_rating):
+        if before_user is not None:
+            statements.append(_user_stats_statement(db, before_user, before_rating, -1))
+        if after_user is not None:
+            statements.append(_user_stats_statement(db, after_user, after_rating, 1))
+    if (before_place, before_rating) != (after_place, after_rating):
+        if before_place is not None:
+            statements.append(_place_stats_statement(before_place, before_rating, -1))
+        if after_place is not None:
+            statements.append(_place_stats_statement(after_place, after_rating, 1))
+    return statements
+
+def _review_stats_key(review) -> tuple:
+    return (review.user_id, review.place_id, review.rating)
+
+_NO_REVIEW = (None, None, None)
+
+async def apply_review_stats_async(db: AsyncSession, before: tuple, after: tuple):
+    """리뷰 변경을 flush 한 뒤 사용자/장소 집계 갱신 (커밋은 호출자가 수행)"""
+    statements = _review_stats_changes(db, before, after)
+    if statements:
+        await db.flush()
+    for stmt in statements:
+        await db.execute(stmt)
+
+async def get_user_stats_async(db: AsyncSession, user_id: int) -> dict:
+    """사용자 리뷰 집계 (집계 행 한 건 조회, 리뷰가 없으면 0)"""
+    stats = await db.get(models.UserStats, user_id)
+    review_count = stats.review_count if stats else 0
+    return {
+        "review_count": review_count,
+        "rating_histogram": rating_histogram(stats) if stats else {str(n): 0 for n in range(1, 6)},
+        "average_rating": round(stats.rating_sum / review_count, 2) if review_count else None,
+        "last_review_at": stats.last_review_at if stats else None,
+    }
+
+async def upsert_place_async(db: AsyncSession, provider_place_id: str, name: str, address: Optional[str] = None,
+                             lat: Optional[float] = None, lng: Optional[float] = None, provider: str = "google") -> int:
+    """
+    제공자 place_id 기준 장소 저장 - INSERT ... ON CONFLICT DO UPDATE ... RETURNING id 한 문장으로 처리
+    - 이름은 최신 값으로, 주소/좌표는 새 값이 있을 때만 갱신 (커밋은 호출자가 수행)
+    """
+    stmt = _dialect_insert(db, models.Place).values(
+        provider=provider,
+        provider_place_id=provider_place_id,
+        name=name,
+        address=address,
+        lat=lat,
+        lng=lng,
+        geo_cell=geo.encode_cell(lat, lng),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(models.PLACE_PROVIDER_KEY),
+        set_={
+            "name": stmt.excluded.name,
+            "address": func.coalesce(stmt.excluded.address, models.Place.address),
+            "lat": func.coalesce(stmt.excluded.lat, models.Place.lat),
+            "lng": func.coalesce(stmt.excluded.lng, models.Place.lng),
+            "geo_cell": func.coalesce(stmt.excluded.geo_cell, models.Place.geo_cell),
+        },
+    ).returning(models.Place.id)
+    return (await db.execute(stmt)).scalar_one()
+
+async def get_place_async(db: AsyncSession, place_id: int):
+    """비동기 장소 단건 조회 (집계 포함)"""
+    return await db.get(models.Place, place_id)
+
+async def rebuild_place_stats_async(db: AsyncSession, place_ids: List[int]):
+    """
+    장소 집계를 리뷰 테이블에서 다시 계산 (백필/정합성 복구용, 커밋은 호출자가 수행)
+    - (place_id, rating)별 GROUP BY 한 번으로 계산
+    """
+    if not place_ids:
+        return
+    # 집계 대상 장소 행을 먼저 잠가 동시에 진행 중인 리뷰 추가/삭제의 증감이 덮어써지지 않도록 함
+    await db.execute(select(models.Place.id).where(models.Place.id.in_(place_ids)).with_for_update())
+    rows = await db.execute(
+        select(
+            models.Review.place_id,
+            models.Review.rating,
+            func.count(),
+            func.max(models.Review.created_at),
+        )
+        .where(models.Review.place_id.in_(place_ids))
+        .group_by(models.Review.place_id, models.Review.rating)
+    )
+    stats = {
+        place_id: {"review_count": 0, "last_review_at": None, **{f"rating_{n}": 0 for n in range(1, 6)}}
+        for place_id in place_ids
+    }
+    for place_id, rating, count, last_review_at in rows:
+        entry = stats[place_id]
+        entry["review_count"] += count
+        entry[f"rating_{rating}"] += count
+        if entry["last_review_at"] is None or (last_review_at is not None and last_review_at > entry["last_review_at"]):
+            entry["last_review_at"] = last_review_at
+    for place_id, values in stats.items():
+        await db.execute(update(models.Place).where(models.Place.id == place_id).values(**values))
+
+# ==================== 위치 기반 장소 조회 (리뷰가 있는 장소) ====================
+
+_postgis_available: Optional[bool] = None
+
+async def use_postgis_async(db: AsyncSession) -> bool:
+    """GEO_BACKEND 설정과 PostGIS 확장 설치 여부로 조회 방식 결정 (auto는 처음 한 번만 확인)"""
+    global _postgis_available
+    backend = settings.GEO_BACKEND
+    if backend != "auto":
+        return backend == "postgis"
+    if _postgis_available is None:
+        if db.get_bind().dialect.name != "postgresql":
+            _postgis_available = False
+        else:
+            result = await db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'"))
+            _postgis_available = result.scalar_one_or_none() is not None
+        logger.info(f"장소 위치 조회 방식: {'postgis' if _postgis_available else 'grid'}")
+    return _postgis_available
+
+# 위치 조회에 필요한 장소 컬럼 (ORM 객체 생성 없이 후보 수천 건 처리)
+_PLACE_GEO_COLUMNS = [c for c in models.Place.__table__.c if c.key not in ("created_at", "updated_at")]
+
+def _srid():
+    # 바인드 파라미터가 아닌 상수로 렌더링해야 GiST 식 인덱스(idx_places_geography)와 같은 식이 됨
+    return literal_column("4326")
+
+def _reviewed_place_filter():
+    return and_(models.Place.review_count > 0, models.Place.lat.isnot(None), models.Place.lng.isnot(None))
+
+def _rating_score_expr():
+    """평균 평점 SQL 식 (평점을 해석할 수 있는 리뷰가 없으면 0) - rating 순위용"""
+    p = models.Place
+    rated = p.rating_1 + p.rating_2 + p.rating_3 + p.rating_4 + p.rating_5
+    weighted = p.rating_1 + 2 * p.rating_2 + 3 * p.rating_3 + 4 * p.rating_4 + 5 * p.rating_5
+    return func.coalesce(weighted * 1.0 / func.nullif(rated, 0), 0)
+
+def _rating_score(place) -> float:
+    """_rating_score_expr와 같은 값 (반올림하지 않은 평균, 없으면 0)"""
+    histogram = rating_histogram(place)
+    rated = sum(histogram.values())
+    return sum(int(n) * count for n, count in histogram.items()) / rated if rated else 0
+
+async def _postgis_place_candidates(db: AsyncSession, lat: float, lng: float, radius_m: Optional[float],
+                                    box: Optional[geo.BoundingBox], ranking: str, limit: int):
+    """PostGIS GiST 인덱스로 반경/경계 상자 안의 장소를 순위대로 limit개 조회 - [(행, 거리)]"""
+    place_geography = func.geography(func.ST_SetSRID(func.ST_MakePoint(models.Place.lng, models.Place.lat), _srid()))
+    center = func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), _srid()))
+    distance = func.ST_Distance(place_geography, center).label("distance_m")
+    stmt = select(*_PLACE_GEO_COLUMNS, distance).where(_reviewed_place_filter())
+    if radius_m is not None:
+        stmt = stmt.where(func.ST_DWithin(place_geography, center, radius_m))
+    if box is not None:
+        min_lat, min_lng, max_lat, max_lng = box
+        envelope = func.geography(func.ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, _srid()))
+        stmt = stmt.where(place_geography.op("&&")(envelope))
+    if ranking == "rating":
+        stmt = stmt.order_by(_rating_score_expr().desc(), models.Place.review_count.desc(), distance)
+    else:
+        # <-> 는 GiST 인덱스로 가까운 순 탐색 (KNN)
+        stmt = stmt.order_by(place_geography.op("<->")(center))
+    return [(row, row.distance_m) for row in await db.execute(stmt.limit(limit))]
+
+async def _grid_rows(db: AsyncSession, box: geo.BoundingBox, order_by, limit: int):
+    """격자 셀(geo_cell) B-tree 범위 + 좌표 조건으로 경계 상자 안의 장소를 순서대로 limit개 조회"""
+    min_lat, min_lng, max_lat, max_lng = box
+    stmt = select(*_PLACE_GEO_COLUMNS).where(
+        geo.cell_filter(models.Place.geo_cell, box),
+        models.Place.lat.between(min_lat, max_lat),
+        models.Place.lng.between(min_lng, max_lng),
+        _reviewed_place_filter(),
+    )
+    return (await db.execute(stmt.order_by(*order_by).limit(limit))).all()
+
+# 가까운 순 조회 시 limit의 몇 배까지 후보로 가져올지 (근사 거리와 실제 거리의 순서 차이 보정)
+_NEAREST_CANDIDATE_FACTOR = 2
+
+async def _grid_place_candidates(db: AsyncSession, lat: float, lng: float, radius_m: Optional[float],
+                                 box: geo.BoundingBox, ranking: str, limit: int):
+    """
+    격자 인덱스로 후보를 쿼리 한 번에 조회 - [(행, 거리)]
+    - distance: 경계 상자 안에서 SQL로 근사 거리 순 정렬 후 limit의 몇 배만 가져와 실제 거리로 다시 정렬
+    - rating: 경계 상자 안에서 SQL로 평점 순 정렬 후 후보 수 제한
+    - 어느 쪽이든 정렬 후 LIMIT이므로 후보 수 제한에 걸려도 잘려 나가는 것은 순위가 낮은 장소
+    - 반경 밖(상자의 모서리)은 실제 거리로 제거
+    """
+    if ranking == "rating":
+        order_by = (_rating_score_expr().desc(), models.Place.review_count.desc())
+        candidate_limit = settings.NEARBY_MAX_CANDIDATES
+    else:
+        order_by = (geo.approx_distance_order(models.Place.lat, models.Place.lng, lat, lng),)
+        candidate_limit = min(settings.NEARBY_MAX_CANDIDATES, limit * _NEAREST_CANDIDATE_FACTOR)
+    candidates = []
+    for row in await _grid_rows(db, box, order_by, candidate_limit):
+        distance = geo.haversine_m(lat, lng, row.lat, row.lng)
+        if radius_m is None or distance <= radius_m:
+            candidates.append((row, distance))
+    return candidates
+
+def _rank_places(candidates, ranking: str, limit: int) -> List[dict]:
+    """
+    후보 장소 순위 - [{"place": 행, "distance_m": 거리, "average_rating": 평균}]
+    - distance: 가까운 순, 같은 거리면 평점 높은 순
+    - rating: 평점 높은 순, 리뷰 많은 순, 가까운 순
+    """
+    if ranking == "rating":
+        candidates = sorted(candidates, key=lambda c: (-_rating_score(c[0]), -c[0].review_count, c[1]))
+    else:
+        candidates = sorted(candidates, key=lambda c: (c[1], -_rating_score(c[0])))
+    return [
+        {"place": row, "distance_m": distance, "average_rating": average_rating(row)}
+        for row, distance in candidates[:limit]
+    ]
+
+async def get_places_nearby_async(db: AsyncSession, lat: float, lng: float, radius_m: float,
+                                  ranking: str = "distance", limit: int = 20) -> List[dict]:
+    """비동기 반경 내 리뷰가 있는 장소 조회 (PostGIS 또는 격자 인덱스)"""
+    if await use_postgis_async(db):
+        candidates = await _postgis_place_candidates(db, lat, lng, radius_m, None, ranking, limit)
+    else:
+        box = geo.bbox_around(lat, lng, radius_m)
+        candidates = await _grid_place_candidates(db, lat, lng, radius_m, box, ranking, limit)
+    return _rank_places(candidates, ranking, limit)
+
+async def get_places_in_box_async(db: AsyncSession, box: geo.BoundingBox,
+                                  ranking: str = "distance", limit: int = 20) -> List[dict]:
+    """비동기 경계 상자 안의 리뷰가 있는 장소 조회 (거리는 상자 중심 기준)"""
+    min_lat, min_lng, max_lat, max_lng = box
+    lat, lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    if await use_postgis_async(db):
+        candidates = await _postgis_place_candidates(db, lat, lng, None, box, ranking, limit)
+    else:
+        candidates = await _grid_place_candidates(db, lat, lng, None, box, ranking, limit)
+    return _rank_places(candidates, ranking, limit)
+
+async def fill_place_geo_cells_async(db: AsyncSession, batch_size: int = 1000) -> int:
+    """좌표는 있지만 geo_cell이 비어 있는 장소의 격자 셀 채우기 (커밋은 호출자가 수행), 채운 수 반환"""
+    rows = (await db.execute(
+        select(models.Place.id, models.Place.lat, models.Place.lng)
+        .where(models.Place.geo_cell.is_(None), models.Place.lat.isnot(None), models.Place.lng.isnot(None))
+        .limit(batch_size)
+    )).all()
+    for place_id, lat, lng in rows:
+        await db.execute(
+            update(models.Place).where(models.Place.id == place_id).values(geo_cell=geo.encode_cell(lat, lng))
+        )
+    return len(rows)
+
+# ==================== 리뷰 전문 검색 ====================
+
+_fts_available: Optional[bool] = None
+
+async def use_fts_async(db: AsyncSession) -> bool:
+    """SEARCH_BACKEND 설정과 검색 컬럼/pg_trgm 설치 여부로 검색 방식 결정 (auto는 처음 한 번만 확인)"""
+    global _fts_available
+    backend = settings.SEARCH_BACKEND
+    if backend != "auto":
+        return backend == "postgres"
+    if _fts_available is None:
+        if db.get_bind().dialect.name != "postgresql":
+            _fts_available = False
+        else:
+            result = await db.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') "
+                "AND EXISTS (SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'reviews' AND column_name = 'search_vector')"
+            ))
+            _fts_available = bool(result.scalar())
+        logger.info(f"리뷰 검색 방식: {'postgres' if _fts_available else 'memory'}")
+    return _fts_available
+
+# ORM에 매핑하지 않은 검색 벡터 컬럼 (트리거로만 갱신)
+_search_vector = literal_column("reviews.search_vector")
+
+def _review_search_document():
+    """trigram 인덱스와 같은 식 (상수도 바인드 파라미터가 아닌 리터럴로 렌더링해야 인덱스 사용)"""
+    space = literal_column("' '")
+    return (
+        models.Review.place_name.op("||")(space)
+        .op("||")(func.coalesce(models.Review.place_address, literal_column("''")))
+        .op("||")(space)
+        .op("||")(models.Review.review_text)
+    )
+
+def _tsquery(terms: List[str], operator: str):
+    """단어 앞부분 일치 tsquery ('맛집':* & '강남':*)"""
+    prefixes = [f"'{term.replace(chr(39), chr(39) * 2)}':*" for term in terms]
+    return func.to_tsquery(literal_column("'simple'::regconfig"), f" {operator} ".join(prefixes))
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+async def _search_reviews_postgres(db: AsyncSession, terms: List[str], limit: int, after):
+    """
+    검색어마다 (단어 앞부분 일치 OR TRIGRAM_SUBSTRING_MIN_CHARS 이상이면 부분 문자열 일치) 조건을 모두 만족하는 리뷰
+    - 두 조건 모두 인덱스(tsvector GIN, trigram GIN)로 처리되는 경우만 OR로 묶음 (2글자 검색어는 앞부분 일치만)
+    - 점수: ts_rank_cd(가중치 A/B/C) + word_similarity, (점수, id) 역순 키셋
+    """
+    document = _review_search_document()
+    conditions = []
+    for term in terms:
+        match = _search_vector.op("@@")(_tsquery([term], "&"))
+        if len(term) >= review_search.TRIGRAM_SUBSTRING_MIN_CHARS:
+            match = or_(match, document.ilike(f"%{_escape_like(term)}%", escape="\\"))
+        conditions.append(match)
+    score = (
+        func.ts_rank_cd(_search_vector, _tsquery(terms, "|"))
+        + func.word_similarity(" ".join(terms), document)
+    ).label("score")
+    stmt = select(models.Review, score).where(and_(*conditions))
+    if after is not None:
+        stmt = stmt.where(tuple_(score, models.Review.id) < tuple_(*after))
+    stmt = stmt.order_by(score.desc(), models.Review.id.desc()).limit(limit + 1)
+    return [(review, float(value)) for review, value in (await db.execute(stmt)).all()]
+
+_REVIEW_INDEX_BATCH = 5000
+_review_index_lock = asyncio.Lock()
+
+async def _ensure_review_index_async(db: AsyncSession):
+    """프로세스 내 역색인을 처음 검색할 때 id 순 배치로 적재 (적재 중 들어온 변경은 적재 후 반영)"""
+    index = review_search.review_index
+    if index.loaded:
+        return
+    async with _review_index_lock:
+        if index.loaded:
+            return
+        index.begin_load()
+        try:
+            after = 0
+            while True:
+                rows = (await db.execute(
+                    select(models.Review.id, models.Review.place_name, models.Review.place_address, models.Review.review_text)
+                    .where(models.Review.id > after)
+                    .order_by(models.Review.id)
+                    .limit(_REVIEW_INDEX_BATCH)
+                )).all()
+                if not rows:
+                    break
+                index.load_rows(rows)
+                after = rows[-1][0]
+        except BaseException:
+            index.abort_load()
+            raise
+        index.finish_load()
+        logger.info(f"리뷰 검색 역색인 적재 완료: {index.stats()}")
+
+async def _search_reviews_memory(db: AsyncSession, terms: List[str], limit: int, after):
+    await _ensure_review_index_async(db)
+    hits = review_search.review_index.search(terms, limit + 1, after)
+    if not hits:
+        return []
+    result = await db.execute(select(models.Review).where(models.Review.id.in_([review_id for _, review_id in hits])))
+    reviews = {review.id: review for review in result.scalars().all()}
+    return [(reviews[review_id], score) for score, review_id in hits if review_id in reviews]
+
+async def search_reviews_async(db: AsyncSession, query: str, limit: int, cursor: Optional[str] = None):
+    """
+    리뷰 전문 검색 - ([(리뷰, 점수), ...], 검색어 목록, 다음 커서) 반환
+    - 장소명/주소/본문 대상, 점수 역순 (동점은 최신 id 우선)
+    """
+    terms = review_search.search_terms(query)
+    if not terms:
+        return [], terms, None
+    after = pagination.decode_score_cursor(cursor) if cursor else None
+    if await use_fts_async(db):
+        rows = await _search_reviews_postgres(db, terms, limit, after)
+    else:
+        rows = await _search_reviews_memory(db, terms, limit, after)
+    if len(rows) <= limit:
+        return rows, terms, None
+    page = rows[:limit]
+    last_review, last_score = page[-1]
+    return page, terms, pagination.encode_score_cursor(last_score, last_review.id)
+
+def _index_review(review: models.Review):
+    """프로세스 내 검색 역색인에 리뷰 반영 (적재 전이면 무시)"""
+    review_search.review_index.upsert(review.id, review.place_name, review.place_address, review.review_text)
+
+# ==================== 리뷰 대량 가져오기/내보내기 ====================
+
+# 내보내기에 포함하는 리뷰 컬럼 (ORM 객체 생성 없이 행 단위로 스트리밍)
+REVIEW_EXPORT_COLUMNS = [c for c in models.Review.__table__.c]
+REVIEW_IMAGE_EXPORT_COLUMNS = [c for c in models.ReviewImage.__table__.c if c.key not in ("id", "created_at")]
+
+async def import_reviews_batch_async(db: AsyncSession, rows: List[schemas.ReviewImportRow]):
+    """
+    검증된 가져오기 행 묶음을 한 트랜잭션으로 저장 - ([(리뷰 id, 행)], {행 위치: 오류}) 반환
+    - 없는 user_id/place_id를 참조하는 행은 제외하고 오류로 보고 (묶음 전체가 FK 오류로 실패하지 않도록)
+    - 다중 행 INSERT ... RETURNING 한 번, 사용자/장소 집계는 (id, 평점)별 증감을 모아 갱신
+    """
+    user_ids = {row.user_id for row in rows}
+    place_ids = {row.place_id for row in rows if row.place_id is not None}
+    known_users = set((await db.execute(select(models.User.id).where(models.User.id.in_(user_ids)))).scalars())
+    known_places = set()
+    if place_ids:
+        known_places = set((await db.execute(select(models.Place.id).where(models.Place.id.in_(place_ids)))).scalars())
+
+    rejected, accepted = {}, []
+    for position, row in enumerate(rows):
+        if row.user_id not in known_users:
+            rejected[position] = f"사용자를 찾을 수 없습니다: user_id={row.user_id}"
+        elif row.place_id is not None and row.place_id not in known_places:
+            rejected[position] = f"장소를 찾을 수 없습니다: place_id={row.place_id}"
+        else:
+            accepted.append(row)
+    if not accepted:
+        return [], rejected
+
+    now = datetime.utcnow()
+    values = [
+        {
+            "user_id": row.user_id,
+            "place_id": row.place_id,
+            "place_name": row.place_name,
+            "place_address": row.place_address,
+            "review_date": row.review_date,
+            "rating": row.rating,
+            "companion": row.companion,
+            "review_text": row.review_text,
+            "created_at": row.created_at or now,
+        }
+        for row in accepted
+    ]
+    stmt = insert(models.Review).returning(models.Review.id, sort_by_parameter_order=True)
+    review_ids = (await db.execute(stmt, values)).scalars().all()
+
+    user_changes = Counter((row.user_id, row.rating) for row in accepted)
+    place_changes = Counter((row.place_id, row.rating) for row in accepted if row.place_id is not None)
+    for (user_id, rating), count in user_changes.items():
+        await db.execute(_user_stats_statement(db, user_id, rating, count))
+    for (place_id, rating), count in place_changes.items():
+        await db.execute(_place_stats_statement(place_id, rating, count))
+    await db.commit()
+
+    for review_id, row in zip(review_ids, accepted):
+        review_search.review_index.upsert(review_id, row.place_name, row.place_address, row.review_text)
+    return list(zip(review_ids, accepted)), rejected
+
+async def stream_reviews_async(db: AsyncSession, user_id: Optional[int] = None, place_id: Optional[int] = None,
+                               after_id: Optional[int] = None):
+    """
+    리뷰 행을 id 순으로 서버 측 커서에서 DB_STREAM_YIELD_PER개씩 묶어 반환하는 비동기 제너레이터
+    - 전체 결과를 메모리에 올리지 않음 (after_id로 중단한 지점부터 다시 내보내기 가능)
+    """
+    stmt = select(*REVIEW_EXPORT_COLUMNS)
+    if user_id is not None:
+        stmt = stmt.where(models.Review.user_id == user_id)
+    if place_id is not None:
+        stmt = stmt.where(models.Review.place_id == place_id)
+    if after_id is not None:
+        stmt = stmt.where(models.Review.id > after_id)
+    stmt = stmt.order_by(models.Review.id).execution_options(**database.STREAM_EXECUTION_OPTIONS)
+    result = await db.stream(stmt)
+    try:
+        async for rows in result.partitions():
+            yield rows
+    finally:
+        await result.close()
+
+async def get_review_images_by_review_ids_async(db: AsyncSession, review_ids: List[int]) -> dict:
+    """리뷰 id 목록의 이미지를 한 번에 조회 - {리뷰 id: [이미지 행, ...]} (순서대로)"""
+    images = {}
+    if not review_ids:
+        return images
+    result = await db.execute(
+        select(*REVIEW_IMAGE_EXPORT_COLUMNS)
+        .where(models.ReviewImage.review_id.in_(review_ids))
+        .order_by(models.ReviewImage.review_id, models.ReviewImage.position)
+    )
+    for image in result:
+        images.setdefault(image.review_id, []).append(image)
+    return images
+
+# ==================== 로그인 세션 (user_sessions) ====================
+
+async def create_user_session_async(db: AsyncSession, user_id: int, token_digest: str, expires_at: datetime,
+                                    user_agent: Optional[str] = None, is_http_only: bool = True,
+                                    is_secure: bool = True) -> models.UserSession:
+    """세션 추가 (users 행은 건드리지 않음, 커밋은 호출자가 수행)"""
+    session = models.UserSession(
+        user_id=user_id,
+        token_digest=token_digest,
+        expires_at=expires_at,
+        user_agent=user_agent[:255] if user_agent else None,
+        is_http_only=is_http_only,
+        is_secure=is_secure,
+    )
+    db.add(session)
+    await db.flush()
+    return session
+
+async def get_active_user_session_async(db: AsyncSession, token_digest: str, now: datetime):
+    """토큰 다이게스트로 만료되지 않은 세션 조회 (유니크 인덱스 한 번)"""
+    result = await db.execute(
+        select(models.UserSession).where(
+            models.UserSession.token_digest == token_digest,
+            models.UserSession.expires_at > now,
+        )
+    )
+    return result.scalar_one_or_none()
+
+async def get_active_user_session_with_user_async(db: AsyncSession, token_digest: str, now: datetime):
+    """만료되지 않은 세션과 그 사용자를 한 번에 조회 ((세션, 사용자) 또는 None, 인증 캐시 미스 경로)"""
+    result = await db.execute(
+        select(models.UserSession, models.User)
+        .join(models.User, models.User.id == models.UserSession.user_id)
+        .where(
+            models.UserSession.token_digest == token_digest,
+            models.UserSession.expires_at > now,
+        )
+    )
+    return result.tuples().one_or_none()
+
+async def count_active_user_sessions_async(db: AsyncSession, user_id: int, now: datetime) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(models.UserSession).where(
+            models.UserSession.user_id == user_id,
+            models.UserSession.expires_at > now,
+        )
+    )
+    return result.scalar_one()
+
+async def trim_user_sessions_async(db: AsyncSession, user_id: int, max_sessions: int) -> List[str]:
+    """사용자별 최대 세션 수를 넘는 오래된 세션 삭제, 삭제된 토큰 다이게스트 반환 (커밋은 호출자가 수행)"""
+    if max_sessions <= 0:
+        return []
+    overflow = (
+        select(models.UserSession.id)
+        .where(models.UserSession.user_id == user_id)
+        .order_by(models.UserSession.created_at.desc(), models.UserSession.id.desc())
+        .offset(max_sessions)
+    )
+    result = await db.execute(
+        delete(models.UserSession)
+        .where(models.UserSession.id.in_(overflow))
+        .returning(models.UserSession.token_digest)
+    )
+    return result.scalars().all()
+
+async def delete_user_sessions_async(db: AsyncSession, token_digest: Optional[str] = None,
+                                     user_id: Optional[int] = None) -> List[str]:
+    """조건에 맞는 세션 삭제, 삭제된 토큰 다이게스트 반환 (커밋은 호출자가 수행)"""
+    stmt = delete(models.UserSession)
+    if token_digest is not None:
+        stmt = stmt.where(models.UserSession.token_digest == token_digest)
+    if user_id is not None:
+        stmt = stmt.where(models.UserSession.user_id == user_id)
+    result = await db.execute(stmt.returning(models.UserSession.token_digest))
+    return result.scalars().all()
+
+async def delete_expired_user_sessions_batch_async(db: AsyncSession, before: datetime,
+                                                   after: Optional[Tuple[datetime, int]], limit: int):
+    """
+    before 이전에 만료된 세션을 (expires_at, id) 키셋 순서로 after 다음부터 limit개 삭제 (커밋은 호출자가 수행)
+    - idx_user_sessions_expires 범위 스캔, 앞 배치에서 지운 구간(vacuum 전의 죽은 인덱스 항목)은 다시 훑지 않음
+    - (삭제된 토큰 다이게스트 목록, 마지막 키) 반환, 삭제할 세션이 없으면 마지막 키는 None
+    """
+    batch = select(models.UserSession.id).where(models.UserSession.expires_at < before)
+    if after is not None:
+        batch = batch.where(tuple_(models.UserSession.expires_at, models.UserSession.id) > tuple_(*after))
+    batch = batch.order_by(models.UserSession.expires_at, models.UserSession.id).limit(limit)
+    result = await db.execute(
+        delete(models.UserSession)
+        .where(models.UserSession.id.in_(batch))
+        .returning(models.UserSession.expires_at, models.UserSession.id, models.UserSession.token_digest)
+    )
+    rows = result.all()
+    if not rows:
+        return [], None
+    last = max((expires_at, session_id) for expires_at, session_id, _ in rows)
+    return [digest for _, _, digest in rows], last
+
+async def try_advisory_xact_lock_async(db: AsyncSession, key: int) -> bool:
+    """
+    트랜잭션 단위 advisory lock 시도 (PostgreSQL, 커밋/롤백 시 자동 해제되어 커넥션 풀에 잠금이 남지 않음)
+    - 다른 DB는 잠금 없이 True (SQLite는 쓰기 트랜잭션이 어차피 하나)
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(key))))
+
+async def touch_last_login_async(db: AsyncSession, user_id: int, now: datetime) -> bool:
+    """
+    마지막 로그인 시각 갱신 - 기록된 값이 SESSION_LAST_LOGIN_UPDATE_SECONDS보다 오래되었을 때만 UPDATE
+    (로그인마다 users 행을 다시 쓰지 않도록, 커밋은 호출자가 수행)
+    """
+    stale_before = now - timedelta(seconds=settings.SESSION_LAST_LOGIN_UPDATE_SECONDS)
+    result = await db.execute(
+        update(models.User)
+        .where(
+            models.User.id == user_id,
+            or_(models.User.last_login_at.is_(None), models.User.last_login_at < stale_before),
+        )
+        .values(last_login_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
 
 # ==================== 새로운 비동기 함수들 (코루틴 적용) ====================
 
@@ -139,27 +1009,20 @@ async def get_user_by_username_async(db: AsyncSession, username: str):
     )
     return result.scalar_one_or_none()
 
-# 비동기 사용자 생성 (병렬 중복 체크)
+# 비동기 사용자 생성 (중복 체크 포함)
 async def create_user_async(db: AsyncSession, user: schemas.UserCreate):
-    """비동기 사용자 생성 - 이메일/사용자명 중복 체크를 병렬 처리"""
-    
-    # 병렬로 중복 체크
-    email_check_task = asyncio.create_task(get_user_by_email_async(db, user.email))
-    username_check_task = asyncio.create_task(get_user_by_username_async(db, user.username))
-    
-    # 결과 대기 (병렬 실행으로 성능 향상)
-    existing_email_user, existing_username_user = await asyncio.gather(
-        email_check_task,
-        username_check_task
-    )
+    """비동기 사용자 생성 - 이메일/사용자명 중복 체크 후 생성"""
     
+    # 하나의 AsyncSession은 동시 실행을 지원하지 않으므로 순차 조회
+    existing_email_user = await get_user_by_email_async(db, user.email)
     if existing_email_user:
         raise ValueError("이미 가입된 이메일입니다")
+    existing_username_user = await get_user_by_username_async(db, user.username)
     if existing_username_user:
         raise ValueError("이미 사용 중인 사용자 이름입니다")
     
-    # 비동기 사용자 생성
-    hashed_password = pwd_context.hash(user.password)
+    # bcrypt 해싱은 CPU 작업이므로 전용 해싱 실행기에서 실행 (대기열이 가득 차면 HashingOverloadedError)
+    hashed_password = await password_hasher.hash(user.password)
     db_user = models.User(
         email=user.email,
         username=user.username,
@@ -170,24 +1033,61 @@ async def create_user_async(db: AsyncSession, user: schemas.UserCreate):
     await db.refresh(db_user)
     return db_user
 
+# 비동기 비밀번호 검증 (이벤트 루프 차단 방지)
+async def verify_password_async(plain_password, hashed_password):
+    verified, _ = await password_hasher.verify_and_update(plain_password, hashed_password)
+    return verified
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """
+    이메일/비밀번호 확인 - 일치하면 사용자, 아니면 None
+    - 해시의 bcrypt 비용이 현재 설정(PASSWORD_BCRYPT_ROUNDS)과 다르면 새 해시로 교체해 커밋
+    """
+    user = await get_user_by_email_async(db, email)
+    if not user:
+        return None
+    verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
+
 # 비동기 리뷰 생성
 async def create_review_async(db: AsyncSession, review_data: dict):
-    """비동기 리뷰 생성"""
+    """비동기 리뷰 생성 (장소가 지정된 경우 장소 집계도 같은 트랜잭션에서 갱신)"""
     db_review = models.Review(
         user_id=review_data["user_id"],
+        place_id=review_data.get("place_id"),
         place_name=review_data["place_name"],
         place_address=review_data["place_address"],
         review_date=review_data["review_date"],
         rating=review_data["rating"],
         companion=review_data["companion"],
         review_text=review_data["review_text"],
-        image_paths=review_data["image_paths"]
+        images=_review_images(review_data.get("images"))
     )
     db.add(db_review)
+    await apply_review_stats_async(db, _NO_REVIEW, _review_stats_key(db_review))
     await db.commit()
     await db.refresh(db_review)
+    _index_review(db_review)
     return db_review
 
+# 비동기 리뷰 이미지 크기/변형 정보 저장 (후처리 완료 시)
+async def update_review_image_variants_async(db: AsyncSession, review_id: int, processed: list):
+    """후처리 결과(이미지 순서와 같은 목록)를 리뷰 이미지 행에 기록"""
+    review = await db.get(models.Review, review_id)
+    if not review:
+        return None
+    for image, info in zip(review.images, processed):
+        image.width = info.get("width")
+        image.height = info.get("height")
+        image.variants = info.get("variants") or []
+    await db.commit()
+    return review
+
 # 비동기 리뷰 목록 조회 (필터링 포함)
 async def get_reviews_by_user_async(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10):
     """비동기 사용자 리뷰 목록 조회"""
@@ -200,19 +1100,159 @@ async def get_reviews_by_user_async(db: AsyncSession, user_id: int, skip: int =
     )
     return result.scalars().all()
 
-# 비동기 리뷰 상세 정보 조회 (관련 데이터 병렬 로딩)
+# 비동기 리뷰 목록 키셋 페이지 조회 (created_at, id 역순)
+async def get_reviews_by_user_page_async(db: AsyncSession, user_id: int, limit: int, cursor: Optional[str] = None):
+    """비동기 사용자 리뷰 페이지 조회 - (리뷰 목록, 다음 커서) 반환"""
+    stmt = pagination.apply_keyset(
+        select(models.Review).filter(models.Review.user_id == user_id),
+        models.Review.created_at, models.Review.id, cursor, limit,
+    )
+    result = await db.execute(stmt)
+    return pagination.split_page(result.scalars().all(), limit)
+
+async def get_reviews_by_place_page_async(db: AsyncSession, place_name: str, limit: int, cursor: Optional[str] = None):
+    """비동기 장소별 리뷰 페이지 조회 - (리뷰 목록, 다음 커서) 반환"""
+    stmt = pagination.apply_keyset(
+        select(models.Review).filter(models.Review.place_name == place_name),
+        models.Review.created_at, models.Review.id, cursor, limit,
+    )
+    result = await db.execute(stmt)
+    return pagination.split_page(result.scalars().all(), limit)
+
+async def get_reviews_by_place_id_page_async(db: AsyncSession, place_id: int, limit: int, cursor: Optional[str] = None):
+    """비동기 장소(place_id)별 리뷰 페이지 조회 - (리뷰 목록, 다음 커서) 반환"""
+    stmt = pagination.apply_keyset(
+        select(models.Review).filter(models.Review.place_id == place_id),
+        models.Review.created_at, models.Review.id, cursor, limit,
+    )
+    result = await db.execute(stmt)
+    return pagination.split_page(result.scalars().all(), limit)
+
+async def get_search_history_page_async(db: AsyncSession, user_id: int, limit: int, cursor: Optional[str] = None):
+    """비동기 검색 기록 페이지 조회 - (검색 기록 목록, 다음 커서) 반환"""
+    stmt = pagination.apply_keyset(
+        select(models.SearchHistory).filter(models.SearchHistory.user_id == user_id),
+        models.SearchHistory.created_at, models.SearchHistory.id, cursor, limit,
+    )
+    result = await db.execute(stmt)
+    return pagination.split_page(result.scalars().all(), limit)
+
+async def get_recent_search_history_async(db: AsyncSession, user_id: int, limit: int):
+    """사용자의 최근 검색 기록 (최신순, 자동완성 적재용)"""
+    result = await db.execute(
+        select(models.SearchHistory)
+        .filter(models.SearchHistory.user_id == user_id)
+        .order_by(models.SearchHistory.created_at.desc(), models.SearchHistory.id.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+async def get_popular_searches_async(db: AsyncSession, limit: int, min_users: int):
+    """
+    min_users명 이상이 검색한 검색어 - [(검색어, 검색한 사용자 수, 마지막 검색 시각)] (사용자 수 역순)
+    (한 사용자만 검색한 개인적인 검색어는 제외)
+    """
+    text_expr = func.coalesce(models.SearchHistory.name, models.SearchHistory.query)
+    users = func.count(func.distinct(models.SearchHistory.user_id))
+    result = await db.execute(
+        select(text_expr, users, func.max(models.SearchHistory.created_at))
+        .group_by(text_expr)
+        .having(users >= min_users)
+        .order_by(users.desc())
+        .limit(limit)
+    )
+    return result.all()
+
+async def get_autocomplete_places_async(db: AsyncSession, limit: int):
+    """리뷰가 있는 장소 - [(id, 이름, 리뷰 수, 마지막 리뷰 시각)] (리뷰 수 역순)"""
+    result = await db.execute(
+        select(models.Place.id, models.Place.name, models.Place.review_count, models.Place.last_review_at)
+        .where(models.Place.review_count > 0)
+        .order_by(models.Place.review_count.desc())
+        .limit(limit)
+    )
+    return result.all()
+
+# 비동기 검색 기록 저장 (중복 키 충돌 시 최신 검색 시각으로 갱신)
+async def upsert_search_history_async(db: AsyncSession, user_id: int, query: str, is_place: bool, name: Optional[str]):
+    """
+    비동기 검색 기록 저장 - INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 문장으로 처리
+    - 사용자별 보관 수(SEARCH_HISTORY_MAX_PER_USER)를 넘는 오래된 기록은 같은 트랜잭션에서 삭제
+    """
+    stmt = _dialect_insert(db, models.SearchHistory).values(
+        user_id=user_id,
+        query=query,
+        is_place=is_place,
+        name=name if is_place else None,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(models.SEARCH_HISTORY_DEDUP_KEY),
+        set_={"query": stmt.excluded.query, "created_at": func.now()},
+    ).returning(
+        models.SearchHistory.id,
+        models.SearchHistory.query,
+        models.SearchHistory.is_place,
+        models.SearchHistory.name,
+        models.SearchHistory.created_at,
+    )
+    record = (await db.execute(stmt)).one()
+    await _trim_search_history_async(db, [user_id])
+    await db.commit()
+    return record
+
+# 비동기 검색 기록 일괄 저장 (쓰기 지연 버퍼 flush)
+async def upsert_search_history_batch_async(db: AsyncSession, records: list):
+    """
+    비동기 검색 기록 일괄 저장 - 다중 행 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 처리
+    - records는 중복 키가 없어야 함 (같은 문장에서 한 행을 두 번 갱신할 수 없음)
+    - created_at은 버퍼에 들어온 시각을 그대로 사용
+    """
+    if not records:
+        return
+    stmt = _dialect_insert(db, models.SearchHistory).values([
+        {
+            "user_id": record.user_id,
+            "query": record.query,
+            "is_place": record.is_place,
+            "name": record.name,
+            "created_at": record.created_at,
+        }
+        for record in records
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(models.SEARCH_HISTORY_DEDUP_KEY),
+        set_={"query": stmt.excluded.query, "created_at": stmt.excluded.created_at},
+    )
+    await db.execute(stmt)
+    await _trim_search_history_async(db, {record.user_id for record in records})
+    await db.commit()
+
+async def _trim_search_history_async(db: AsyncSession, user_ids):
+    """사용자별 최대 보관 수(SEARCH_HISTORY_MAX_PER_USER)를 넘는 오래된 검색 기록 삭제 (커밋은 호출자가 수행)"""
+    max_per_user = settings.SEARCH_HISTORY_MAX_PER_USER
+    if max_per_user <= 0:
+        return
+    ranked = (
+        select(
+            models.SearchHistory.id,
+            func.row_number().over(
+                partition_by=models.SearchHistory.user_id,
+                order_by=(models.SearchHistory.created_at.desc(), models.SearchHistory.id.desc()),
+            ).label("rank"),
+        )
+        .filter(models.SearchHistory.user_id.in_(list(user_ids)))
+        .subquery()
+    )
+    overflow = select(ranked.c.id).where(ranked.c.rank > max_per_user)
+    await db.execute(delete(models.SearchHistory).where(models.SearchHistory.id.in_(overflow)))
+
+# 비동기 리뷰 상세 정보 조회 (관련 데이터 함께 로딩)
 async def get_review_with_details_async(db: AsyncSession, review_id: int, user_id: int):
-    """비동기 리뷰 상세 정보 조회 - 관련 데이터를 병렬로 로딩"""
+    """비동기 리뷰 상세 정보 조회 - 리뷰와 같은 장소의 다른 리뷰를 함께 반환"""
     
-    # 병렬로 데이터 조회
-    review_task = asyncio.create_task(get_review_async(db, review_id, user_id))
-    same_place_reviews_task = asyncio.create_task(get_same_place_reviews_async(db, review_id))
-    
-    # 결과 대기
-    review, same_place_reviews = await asyncio.gather(
-        review_task,
-        same_place_reviews_task
-    )
+    # 같은 세션에서의 동시 쿼리는 허용되지 않으므로 순차 실행
+    review = await get_review_async(db, review_id, user_id)
+    same_place_reviews = await get_same_place_reviews_async(db, review_id)
     
     return {
         'review': review,
@@ -230,23 +1270,23 @@ async def get_review_async(db: AsyncSession, review_id: int, user_id: int):
     return result.scalar_one_or_none()
 
 async def get_same_place_reviews_async(db: AsyncSession, review_id: int):
-    """비동기 같은 장소의 다른 리뷰들 조회"""
-    # 먼저 해당 리뷰의 장소명 조회
+    """비동기 같은 장소의 다른 리뷰들 조회 (장소가 연결된 리뷰는 place_id, 아니면 장소명 기준)"""
+    # 먼저 해당 리뷰의 장소 조회
     review_result = await db.execute(
-        select(models.Review.place_name).filter(models.Review.id == review_id)
+        select(models.Review.place_id, models.Review.place_name).filter(models.Review.id == review_id)
     )
-    place_name = review_result.scalar_one_or_none()
+    row = review_result.one_or_none()
     
-    if not place_name:
+    if not row:
         return []
     
+    place_id, place_name = row
+    same_place = models.Review.place_id == place_id if place_id is not None else models.Review.place_name == place_name
     # 같은 장소의 다른 리뷰들 조회
     result = await db.execute(
         select(models.Review)
-        .filter(
-            models.Review.place_name == place_name,
-            models.Review.id != review_id
-        )
+        .filter(same_place, models.Review.id != review_id)
+        .order_by(models.Review.created_at.desc(), models.Review.id.desc())
         .limit(5)
     )
     return result.scalars().all()
@@ -265,12 +1305,15 @@ async def update_review_async(db: AsyncSession, review_id: int, review_update: s
     if not review:
         return None
     
+    before = _review_stats_key(review)
     update_data = review_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(review, key, value)
     
+    await apply_review_stats_async(db, before, _review_stats_key(review))
     await db.commit()
     await db.refresh(review)
+    _index_review(review)
     return review
 
 # 비동기 리뷰 삭제
@@ -287,6 +1330,11 @@ async def delete_review_async(db: AsyncSession, review_id: int, user_id: int):
     if not review:
         return False
     
+    orphans = await release_media_blobs_async(db, [image.digest for image in review.images])
+    before = _review_stats_key(review)
     await db.delete(review)
+    await apply_review_stats_async(db, before, _NO_REVIEW)
     await db.commit()
+    review_search.review_index.discard(review_id)
+    await remove_unreferenced_blobs_async(db, orphans)
     return True
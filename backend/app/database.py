@@ -1,41 +1,320 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
+import threading
+import time
 from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy.exc import TimeoutError as SATimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import functions
 from sqlalchemy.orm import sessionmaker
+from .config import settings
+from . import metrics, query_budget
 
 # 데이터베이스 접속 URL 환경변수에서 읽기 (없으면 기본값 사용)
 SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     "postgresql://postgres:postgres@db:5432/revieweat"
 )
 
+def _to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환 (psycopg2 -> asyncpg, sqlite -> aiosqlite)"""
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+# 비동기 접속 URL (별도 지정이 없으면 DATABASE_URL에서 유도)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _to_async_url(SQLALCHEMY_DATABASE_URL))
+
+# INSERT ... ON CONFLICT(upsert) 구문을 만들 수 있는 DB (crud._dialect_insert)
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+class UnsupportedDatabaseError(RuntimeError):
+    """DATABASE_URL/ASYNC_DATABASE_URL이 지원하지 않는 DB를 가리킴 (설정 오류, 앱 시작 시 검사)"""
+
+class PoolStatsMixin:
+    """풀 체크아웃 대기 시간/타임아웃/연결 오류 횟수를 기록하는 QueuePool 확장"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkout_count = 0
+        self.timeout_count = 0
+        self.error_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except SATimeoutError:
+            with self._stats_lock:
+                self.timeout_count += 1
+            raise
+        except Exception:
+            with self._stats_lock:
+                self.error_count += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkout_count += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkout_count,
+                "timeouts": self.timeout_count,
+                "connect_errors": self.error_count,
+                "total_wait_seconds": round(self.total_wait_seconds, 6),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.checkout_count, 6) if self.checkout_count else 0.0,
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+            }
+
+class InstrumentedQueuePool(PoolStatsMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _pool_options(poolclass) -> dict:
+    """Settings 기반 풀 옵션 (SQLite는 기본 풀 사용)"""
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _sync_engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    options = _pool_options(InstrumentedQueuePool)
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+def _async_engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    options = _pool_options(InstrumentedAsyncQueuePool)
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    options["connect_args"] = connect_args
+    return options
+
 # SQLAlchemy 엔진 생성 (DB 연결 객체)
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_sync_engine_options(SQLALCHEMY_DATABASE_URL))
+
+# 비동기 엔진 생성 (asyncpg, 실제 연결은 첫 사용 시 생성)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options(ASYNC_DATABASE_URL))
+
+# SQL 실행 시간/행 수 지표와 느린 쿼리 로그 (비동기 엔진은 내부 동기 엔진에 등록)
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(async_engine.sync_engine)
+# 요청 단위 SQL 문 수 예산 (get_db 세션에 연결된 카운터에 기록)
+if settings.QUERY_BUDGET_ENABLED:
+    query_budget.instrument_engine(engine)
+    query_budget.instrument_engine(async_engine.sync_engine)
+
+# 서버 측 커서 기반 스트리밍 조회용 실행 옵션 (대량 조회 시 사용)
+STREAM_EXECUTION_OPTIONS = {"stream_results": True, "yield_per": settings.DB_STREAM_YIELD_PER}
+
+def pool_stats() -> dict:
+    """현재 워커의 동기/비동기 풀 통계"""
+    stats = {"pid": os.getpid(), "backend": "async" if settings.USE_ASYNC_DB else "sync"}
+    for name, pool in (("sync_pool", engine.pool), ("async_pool", async_engine.sync_engine.pool)):
+        if isinstance(pool, PoolStatsMixin):
+            stats[name] = pool.stats()
+        else:
+            stats[name] = {"status": pool.status()}
+    return stats
 
 # 세션 팩토리 생성 (ORM 세션 관리)
 SessionLocal = sessionmaker(
-    autocommit=False, 
-    autoflush=False, 
+    autocommit=False,
+    autoflush=False,
     bind=engine
 )
 
+# 비동기 세션 팩토리 (커밋 후 속성 재조회로 인한 암묵적 IO 방지)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# 동기 모드에서 어댑터가 사용하는 세션 팩토리 (비동기 모드와 동일한 커밋 동작)
+ThreadedSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
+)
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    """SQLite의 now()를 SQLAlchemy DateTime 저장 형식(마이크로초 포함)으로 맞춤 (키셋 비교 정확도)"""
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
 # 베이스 클래스 (모든 ORM 모델의 부모)
 Base = declarative_base()
 
-def get_db():
-    """FastAPI 의존성 주입용 DB 세션 생성 및 반환 (요청마다 새 세션)"""
+
+class SyncSessionAdapter:
+    """
+    동기 Session을 AsyncSession과 같은 인터페이스로 감싼 어댑터
+    - USE_ASYNC_DB=False 일 때 사용 (psycopg2 + 스레드풀, 처리량 A/B 비교용)
+    - IO가 발생하는 메서드는 스레드풀에서 실행
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        return await self._run(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await self._run(self.sync_session.scalar, *args, **kwargs)
+
+    async def stream(self, statement, *args, **kwargs):
+        """서버 측 커서로 실행 (AsyncSession.stream 대응, 결과는 partitions로 나눠 읽기)"""
+        statement = statement.execution_options(stream_results=True)
+        result = await self._run(self.sync_session.execute, statement, *args, **kwargs)
+        return ThreadedStreamResult(self, result)
+
+    async def scalars(self, *args, **kwargs):
+        return await self._run(self.sync_session.scalars, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._run(self.sync_session.get, *args, **kwargs)
+
+    async def merge(self, *args, **kwargs):
+        return await self._run(self.sync_session.merge, *args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        return await self._run(self.sync_session.refresh, *args, **kwargs)
+
+    async def delete(self, instance):
+        return await self._run(self.sync_session.delete, instance)
+
+    async def flush(self, *args, **kwargs):
+        return await self._run(self.sync_session.flush, *args, **kwargs)
+
+    async def commit(self):
+        return await self._run(self.sync_session.commit)
+
+    async def rollback(self):
+        return await self._run(self.sync_session.rollback)
+
+    async def close(self):
+        return await self._run(self.sync_session.close)
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+
+class ThreadedStreamResult:
+    """SyncSessionAdapter.stream 결과 - 묶음 단위 fetch를 스레드풀에서 실행 (AsyncResult.partitions 대응)"""
+
+    def __init__(self, adapter: SyncSessionAdapter, result):
+        self._adapter = adapter
+        self._result = result
+
+    async def partitions(self, size: int = None):
+        size = size or settings.DB_STREAM_YIELD_PER
+        while True:
+            rows = await self._adapter._run(self._result.fetchmany, size)
+            if not rows:
+                break
+            yield rows
+
+    async def close(self):
+        await self._adapter._run(self._result.close)
+
+
+def get_sync_db():
+    """동기 DB 세션 생성 및 반환 (스크립트/관리 작업용)"""
     db = SessionLocal()
     try:
         yield db  # 세션 객체 반환
     finally:
         db.close()  # 요청 종료 시 세션 정리
 
+async def get_db(request: Request = None):
+    """
+    FastAPI 의존성 주입용 DB 세션 생성 및 반환 (요청마다 새 세션, USE_ASYNC_DB로 백엔드 선택)
+    - 요청 의존성으로 쓰이면 세션에 SQL 문 수 카운터 연결 (요청 밖 session_scope는 request 없음)
+    """
+    if settings.USE_ASYNC_DB:
+        db = AsyncSessionLocal()
+    else:
+        db = SyncSessionAdapter(ThreadedSessionLocal())
+    counter = query_budget.attach(db, request)
+    try:
+        yield db
+    finally:
+        await db.close()
+        query_budget.report(counter)
+
+@asynccontextmanager
+async def session_scope():
+    """요청 밖(백그라운드 작업 등)에서 사용할 세션 컨텍스트"""
+    async for db in get_db():
+        yield db
+
 def create_tables():
     """모든 테이블을 데이터베이스에 생성 (모델 import 필요)"""
-    from .models import User, SearchHistory, Review  # UserSession 제거
+    from .models import User, SearchHistory, Review
     Base.metadata.create_all(bind=engine)
 
+def check_supported_dialect():
+    """두 엔진이 모두 지원하는 DB인지 확인 (요청 처리 중이 아니라 앱 시작 시 실패하도록)"""
+    for name, url, dialect in (("DATABASE_URL", SQLALCHEMY_DATABASE_URL, engine.dialect.name),
+                               ("ASYNC_DATABASE_URL", ASYNC_DATABASE_URL, async_engine.dialect.name)):
+        if dialect not in SUPPORTED_DIALECTS:
+            raise UnsupportedDatabaseError(
+                f"{name}의 DB({dialect})는 지원하지 않습니다. 지원: {', '.join(SUPPORTED_DIALECTS)}"
+            )
+
+async def create_tables_async():
+    """선택된 백엔드로 모든 테이블 생성 (앱 시작 시 사용)"""
+    from .models import User, SearchHistory, Review
+    if settings.USE_ASYNC_DB:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+
 def init_db():
     """데이터베이스 초기화 함수 (개발 환경에서 테이블 생성 용도)"""
-    from .models import User, SearchHistory, Review  # UserSession 제거
+    from .models import User, SearchHistory, Review
     create_tables()
@@ -1,9 +1,13 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
 from . import database, auth
 
-# 데이터베이스 세션을 의존성으로 주입하는 함수
+# 데이터베이스 세션을 의존성으로 주입하는 함수 (비동기 세션)
 get_db = database.get_db
 
 # 현재 인증된(로그인된) 사용자를 의존성으로 주입하는 함수
-get_current_user = auth.get_current_user
\ No newline at end of file
+get_current_user = auth.get_current_user
+
+# 관리자(role=admin) 사용자를 의존성으로 주입하는 함수 (관리 API용)
+get_current_admin = auth.get_current_admin
+
+# 내부 통계/지표 엔드포인트 접근 검사 (INTERNAL_API_TOKEN 또는 관리자)
+require_internal_access = auth.require_internal_access
@@ -0,0 +1,84 @@
+import math
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_
+
+EARTH_RADIUS_M = 6371008.8
+
+# 축(위도/경도)별 격자 비트 수 - 52비트 셀 값, 최소 셀 약 0.6m x 0.3m
+CELL_BITS = 26
+# 범위 조회 시 사용할 최대 셀 수 (셀이 많아지면 더 큰 셀 단위로 조회)
+MAX_COVERING_CELLS = 16
+
+# (min_lat, min_lng, max_lat, max_lng)
+BoundingBox = Tuple[float, float, float, float]
+
+# ==================== 거리/격자 계산 ====================
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 사이 대권 거리 (미터)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+def bbox_around(lat: float, lng: float, radius_m: float) -> BoundingBox:
+    """중심과 반경을 감싸는 경계 상자 (날짜변경선은 넘지 않도록 경도를 자름)"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = math.cos(math.radians(lat))
+    dlng = 180.0 if cos_lat < 1e-9 else min(180.0, math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat)))
+    return (max(-90.0, lat - dlat), max(-180.0, lng - dlng), min(90.0, lat + dlat), min(180.0, lng + dlng))
+
+def _axis_index(value: float, low: float, span: float) -> int:
+    return min((1 << CELL_BITS) - 1, max(0, int((value - low) / span * (1 << CELL_BITS))))
+
+def _interleave(lng_index: int, lat_index: int, bits: int) -> int:
+    """경도/위도 비트를 번갈아 배치 (geohash와 같은 Z-order, 경도 비트가 상위)"""
+    cell = 0
+    for bit in range(bits - 1, -1, -1):
+        cell = (cell << 2) | (((lng_index >> bit) & 1) << 1) | ((lat_index >> bit) & 1)
+    return cell
+
+def encode_cell(lat: Optional[float], lng: Optional[float]) -> Optional[int]:
+    """좌표를 52비트 격자 셀 값으로 변환 (같은 상위 비트를 가진 셀은 인접 영역)"""
+    if lat is None or lng is None:
+        return None
+    return _interleave(_axis_index(lng, -180.0, 360.0), _axis_index(lat, -90.0, 180.0), CELL_BITS)
+
+def covering_ranges(box: BoundingBox) -> List[Tuple[int, int]]:
+    """
+    경계 상자를 덮는 셀 값 범위 목록 [(lo, hi), ...] (hi 미포함)
+    - 셀 수가 MAX_COVERING_CELLS 이하가 되는 가장 작은 셀 크기를 고르고, 이어지는 범위는 합침
+    """
+    min_lat, min_lng, max_lat, max_lng = box
+    lat_lo, lat_hi = _axis_index(min_lat, -90.0, 180.0), _axis_index(max_lat, -90.0, 180.0)
+    lng_lo, lng_hi = _axis_index(min_lng, -180.0, 360.0), _axis_index(max_lng, -180.0, 360.0)
+    for level in range(CELL_BITS, -1, -1):
+        shift = CELL_BITS - level
+        lat_cells = range(lat_lo >> shift, (lat_hi >> shift) + 1)
+        lng_cells = range(lng_lo >> shift, (lng_hi >> shift) + 1)
+        if len(lat_cells) * len(lng_cells) <= MAX_COVERING_CELLS:
+            break
+    prefixes = sorted(_interleave(x, y, level) for x in lng_cells for y in lat_cells)
+    ranges: List[Tuple[int, int]] = []
+    for prefix in prefixes:
+        lo, hi = prefix << (2 * shift), (prefix + 1) << (2 * shift)
+        if ranges and ranges[-1][1] == lo:
+            ranges[-1] = (ranges[-1][0], hi)
+        else:
+            ranges.append((lo, hi))
+    return ranges
+
+def cell_filter(cell_column, box: BoundingBox):
+    """셀 컬럼 B-tree 범위 조건 (경계 상자를 덮는 셀들, 상자 밖 후보는 좌표 조건으로 따로 제거)"""
+    return or_(*(and_(cell_column >= lo, cell_column < hi) for lo, hi in covering_ranges(box)))
+
+def approx_distance_order(lat_column, lng_column, lat: float, lng: float):
+    """
+    중심에서 가까운 순 정렬용 SQL 식 (등장방형 근사 거리의 제곱, 삼각함수 없이 B-tree 범위 조회 결과를 정렬)
+    - 반경 수십 km 안에서는 대권 거리와 순서가 거의 같음, 최종 순위는 haversine_m으로 다시 계산
+    """
+    lng_scale = math.cos(math.radians(lat))
+    dlat = lat_column - lat
+    dlng = (lng_column - lng) * lng_scale
+    return dlat * dlat + dlng * dlng
@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from .config import settings
+
+# Pillow는 선택 의존성 (없으면 이미지를 원본 그대로 보관)
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # pragma: no cover - Pillow 미설치 환경
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Pillow 포맷 -> blob 확장자 (같은 내용이 .jpg/.jpeg처럼 다른 경로로 저장되지 않도록 한 가지로 고정)
+CANONICAL_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif", "AVIF": ".avif"}
+
+class ImageTooLargeError(Exception):
+    """픽셀 수가 Pillow 한도(MAX_IMAGE_PIXELS의 2배)를 넘는 이미지 (압축 폭탄, 디코딩하지 않고 거부)"""
+
+# 프로세스 풀 (첫 사용 시 생성, 앱 종료 시 정리)
+_executor: Optional[ProcessPoolExecutor] = None
+
+# ==================== 프로세스 풀 관리 ====================
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_PROCESS_WORKERS)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+def processing_available() -> bool:
+    return settings.IMAGE_PROCESSING_ENABLED and Image is not None
+
+# ==================== 이미지 처리 (자식 프로세스에서 실행) ====================
+
+def _variant_path(path: str, suffix: str, ext: str) -> str:
+    base, _ = os.path.splitext(path)
+    return f"{base}{suffix}.{ext}"
+
+def _save_atomic(image, path: str, **params) -> int:
+    """
+    같은 디렉터리의 고유한 임시 파일에 저장 후 rename (부분 파일이 서빙되지 않도록)
+    - 같은 파일을 만드는 작업이 동시에 돌아도 임시 파일이 겹치지 않음 (마지막 rename이 이김, 내용은 같음)
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".part", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            image.save(tmp, **params)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return os.path.getsize(path)
+
+def strip_metadata(path: str):
+    """
+    EXIF 방향을 픽셀에 적용하고 메타데이터(EXIF/위치 정보) 없이 다시 저장, 이미지 포맷 반환
+    - Pillow가 없거나 이미지가 아니면 None, EXIF가 없으면 파일은 그대로 둠
+    - 픽셀 수가 한도를 넘으면 ImageTooLargeError (자식 프로세스에서 호출자에게 그대로 전달됨)
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as opened:
+            original_format = opened.format
+            if not opened.getexif():
+                return original_format
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except Image.DecompressionBombError:
+        raise ImageTooLargeError(
+            f"이미지 픽셀 수가 허용 한도({Image.MAX_IMAGE_PIXELS * 2}픽셀)를 초과했습니다"
+        ) from None
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    save_params = {"format": original_format}
+    if original_format == "JPEG":
+        image = image.convert("RGB")
+        save_params.update(quality=95, optimize=True)
+    _save_atomic(image, path, **save_params)
+    return original_format
+
+def _file_digest(path: str) -> tuple:
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as stored:
+        while chunk := stored.read(1024 * 1024):
+            hasher.update(chunk)
+            size += len(chunk)
+    return hasher.hexdigest(), size
+
+def prepare_upload(path: str) -> Optional[dict]:
+    """
+    공개 전 업로드 임시 파일 준비: 메타데이터 제거 후 저장될 바이트의 digest/크기와 확장자 반환
+    - 이미지가 아니면 None (업로드 스레드에서 계산한 원본 digest를 그대로 사용)
+    """
+    image_format = strip_metadata(path)
+    if image_format is None:
+        return None
+    digest, size = _file_digest(path)
+    return {"digest": digest, "bytes": size, "extension": CANONICAL_EXTENSIONS.get(image_format)}
+
+def process_image(path: str) -> dict:
+    """
+    원본 이미지(업로드 시 메타데이터 제거됨)에서 변형 생성
+    - 썸네일 크기별 WebP 변형 생성 (+ 설정 시 AVIF)
+    - 콘텐츠 주소 기반이므로 이미 있는 변형은 다시 인코딩하지 않음
+    - 생성된 변형 목록 반환
+    """
+    with Image.open(path) as opened:
+        original_format = opened.format
+        width, height = opened.size
+
+    decoded = None
+    variants = []
+
+    def source_image():
+        nonlocal decoded
+        if decoded is None:
+            with Image.open(path) as opened:
+                opened.load()
+                decoded = opened
+            if decoded.mode not in ("RGB", "RGBA"):
+                decoded = decoded.convert("RGBA" if decoded.mode in ("LA", "P", "PA") else "RGB")
+        return decoded
+
+    def add_variant(max_side: Optional[int], fmt: str, ext: str, **params):
+        variant_path = _variant_path(path, f"_{max_side}" if max_side else "", ext)
+        if os.path.exists(variant_path):
+            with Image.open(variant_path) as existing:
+                size = existing.size
+        else:
+            img = source_image()
+            if max_side:
+                img = img.copy()
+                img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            size = img.size
+            _save_atomic(img, variant_path, format=fmt, **params)
+        variants.append({
+            "path": variant_path,
+            "width": size[0],
+            "height": size[1],
+            "format": ext,
+            "bytes": os.path.getsize(variant_path),
+        })
+
+    avif = settings.IMAGE_AVIF_ENABLED and features.check("avif")
+    for max_side in sorted(settings.IMAGE_THUMBNAIL_SIZES):
+        if max_side >= max(width, height):
+            continue
+        add_variant(max_side, "WEBP", "webp", quality=settings.IMAGE_WEBP_QUALITY, method=4)
+        if avif:
+            add_variant(max_side, "AVIF", "avif", quality=settings.IMAGE_WEBP_QUALITY)
+
+    if original_format != "WEBP":
+        add_variant(None, "WEBP", "webp", quality=settings.IMAGE_WEBP_QUALITY, method=4)
+    if avif:
+        add_variant(None, "AVIF", "avif", quality=settings.IMAGE_WEBP_QUALITY)
+
+    return {
+        "path": path,
+        "width": width,
+        "height": height,
+        "bytes": os.path.getsize(path),
+        "variants": variants,
+    }
+
+# ==================== 비동기 진입점 ====================
+
+async def prepare_upload_async(path: str) -> Optional[dict]:
+    """
+    업로드 임시 파일의 메타데이터 제거를 프로세스 풀에서 실행 (API 워커의 스레드/이벤트 루프를 점유하지 않음)
+    - 후처리를 끈 경우(IMAGE_PROCESSING_ENABLED=false)에도 위치 정보는 지워야 하므로 스레드에서 실행
+    """
+    if Image is None:
+        return None
+    if not processing_available():
+        return await asyncio.to_thread(prepare_upload, path)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), prepare_upload, path)
+
+async def process_images(paths: List[str]) -> List[dict]:
+    """
+    프로세스 풀에서 이미지들을 병렬 처리 (실패한 이미지는 원본 정보만 기록)
+    - 같은 원본(같은 사진을 여러 번 첨부)은 한 번만 처리하고 결과를 입력 순서대로 돌려줌
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    unique = list(dict.fromkeys(paths))
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, process_image, path) for path in unique),
+        return_exceptions=True,
+    )
+    by_path = {}
+    for path, result in zip(unique, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"이미지 후처리 실패: {path} ({result})")
+            by_path[path] = {"path": path, "variants": []}
+        else:
+            by_path[path] = result
+    return [by_path[path] for path in paths]
+
+async def process_review_images(review_id: int, paths: List[str]):
+    """리뷰 저장 후 백그라운드에서 실행: 후처리 결과(크기/변형)를 리뷰 이미지 행에 기록"""
+    # 자식 프로세스가 DB 모듈을 불러오지 않도록 함수 안에서 import
+    from . import crud, database
+
+    if not paths or not processing_available():
+        return
+    processed = await process_images(paths)
+    try:
+        async with database.session_scope() as db:
+            await crud.update_review_image_variants_async(db, review_id, processed)
+    except Exception as e:
+        logger.error(f"이미지 변형 정보 저장 실패 (review_id={review_id}): {e}")
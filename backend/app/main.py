@@ -1,20 +1,28 @@
-from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, Form, Response
+import logging
+from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, Form, Request, Response, BackgroundTasks, Query
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta, datetime
 from typing import List, Optional
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
-import os
-import uuid
 
-from . import models, schemas, crud, database, auth, dependencies
+from . import models, schemas, crud, database, auth, dependencies, storage, image_processing, media, pagination, search_buffer, places, review_search, autocomplete, bulk_reviews, responses, password_hashing, session_store, session_sweeper, metrics
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+# 기본 응답은 orjson 직렬화 (목록 엔드포인트는 응답을 직접 만들어 jsonable_encoder 변환 생략)
+# Default()로 감싸야 response_model이 있는 엔드포인트는 pydantic의 JSON 직렬화 경로를 그대로 사용
+app = FastAPI(default_response_class=Default(responses.FastJSONResponse))
 
 # -------------------- [공통 설정 및 초기화] --------------------
+# 업로드 본문 크기 제한 (Starlette가 multipart 본문을 임시 파일로 받기 전에 검사, CORS 안쪽이라 413에도 CORS 헤더가 붙음)
+app.add_middleware(storage.UploadSizeLimitMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -22,15 +30,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[pagination.NEXT_CURSOR_HEADER],
 )
 
-# 정적 파일 서빙 설정
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 라우트별 응답 시간/상태 코드 지표 (가장 바깥 미들웨어, CORS 처리 시간 포함)
+if auth.config.settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
-# DB 테이블 생성 (앱 시작 시 한 번만)
+# 정적 파일 서빙 설정 (ETag/Range/장기 캐시 지원)
+app.mount("/uploads", media.MediaFiles(directory=auth.config.settings.UPLOAD_DIR), name="uploads")
+
+# DB 테이블 생성 (앱 시작 시 한 번만), 검색 기록 쓰기 지연 버퍼와 만료 세션 정리 작업 시작
 @app.on_event("startup")
-def on_startup():
-    models.Base.metadata.create_all(bind=database.engine)
+async def on_startup():
+    database.check_supported_dialect()
+    await database.create_tables_async()
+    if auth.config.settings.SEARCH_HISTORY_WRITE_BEHIND:
+        search_buffer.search_history_buffer.start()
+    if auth.config.settings.SESSION_SWEEP_ENABLED:
+        session_sweeper.session_sweeper.start()
+
+# 남은 검색 기록 기록, 세션 정리 작업 중지, 장소 프록시 연결과 이미지 후처리/비밀번호 해싱 프로세스 풀 정리
+@app.on_event("shutdown")
+async def on_shutdown():
+    await search_buffer.search_history_buffer.stop()
+    await session_sweeper.session_sweeper.stop()
+    await places.places_proxy.close()
+    image_processing.shutdown_executor()
+    password_hashing.password_hasher.shutdown()
+
+# 비밀번호 해싱 대기열이 가득 차면 해싱 없이 바로 503 (회원가입/로그인 폭주 시 다른 요청 보호)
+@app.exception_handler(password_hashing.HashingOverloadedError)
+async def hashing_overloaded_handler(request: Request, exc: password_hashing.HashingOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 class SearchHistoryRequest(BaseModel):
     query: str
@@ -44,35 +80,36 @@ async def root():
 
 # -------------------- [회원가입 기능] --------------------
 @app.post("/register", response_model=schemas.UserResponse)
-def register(user: schemas.UserCreate, db: Session = Depends(dependencies.get_db)):
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(dependencies.get_db)):
     """
     회원가입 처리
     - 이메일/사용자명 중복 체크
     - 신규 사용자 생성
     """
-    if crud.get_user_by_email(db, user.email):
-        raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
-    if crud.get_user_by_username(db, user.username):
-        raise HTTPException(status_code=400, detail="이미 사용 중인 사용자 이름입니다.")
-    created_user = crud.create_user(db, user)
+    try:
+        created_user = await crud.create_user_async(db, user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"{e}.")
     return created_user
 
 # -------------------- [로그인 및 토큰 발급 기능] --------------------
 @app.post("/token", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
+    request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(dependencies.get_db),
+    db: AsyncSession = Depends(dependencies.get_db),
 ):
     """
     로그인 및 JWT 토큰 발급
-    - 이메일/비밀번호 검증
+    - 이메일/비밀번호 검증 (bcrypt 비용 설정이 바뀐 해시는 새 비용으로 다시 저장)
     - 토큰 만료 시간 설정
     - HTTP Only, Secure 쿠키 설정
-    - 사용자 테이블에 세션 정보 저장
+    - 세션 저장소에 기기별 세션 추가 (다른 기기의 세션은 유지, 사용자당 SESSION_MAX_PER_USER개까지)
+    - 마지막 로그인 시각은 오래된 경우에만 갱신 (로그인마다 users 행을 다시 쓰지 않음)
     """
-    user = crud.get_user_by_email(db, form_data.username)
-    if not user or not crud.verify_password(form_data.password, user.hashed_password):
+    user = await crud.authenticate_user_async(db, form_data.username, form_data.password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다.",
@@ -87,19 +124,24 @@ def login_for_access_token(
         expires_delta=access_token_expires,
     )
     
-    # 사용자 테이블에 세션 정보 저장 (HTTP Only, Secure 체크 확인용)
+    # 세션 저장 (HTTP Only, Secure 쿠키로 발급, 세션이 없는 토큰은 인증에서 거부되므로 실패 시 로그인 실패)
+    now = datetime.utcnow()
     try:
-        user.session_token = access_token
-        user.is_http_only = True  # ✓ 체크됨
-        user.is_secure = True     # ✓ 체크됨
-        user.session_expires_at = datetime.utcnow() + access_token_expires
-        user.last_login_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(user)
-    except Exception as e:
-        db.rollback()
-        print(f"세션 저장 오류: {e}")
+        _, evicted = await session_store.session_store.create(
+            db, user.id, access_token, now + access_token_expires,
+            user_agent=request.headers.get("user-agent"), is_http_only=True, is_secure=True,
+        )
+        await crud.touch_last_login_async(db, user.id, now)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"세션 저장 오류: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="세션을 저장하지 못했습니다. 잠시 후 다시 시도해 주세요."
+        )
+    # 기기 수 제한으로 밀려난 세션의 캐시 무효화
+    auth.principal_cache.invalidate_digests(evicted)
     
     # HTTP Only, Secure 쿠키 설정 (보안 강화)
     response.set_cookie(
@@ -116,24 +158,26 @@ def login_for_access_token(
 
 # -------------------- [로그아웃 기능] --------------------
 @app.post("/logout")
-def logout(
+async def logout(
     response: Response,
+    token: str = Depends(auth.oauth2_scheme),
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
     """
     로그아웃 처리
     - 쿠키 삭제
-    - 사용자 테이블의 세션 무효화
+    - 현재 기기의 세션만 삭제 (다른 기기의 세션은 유지)
+    - 인증 캐시에서 토큰 제거
     """
-    # 현재 사용자의 세션 무효화
+    auth.principal_cache.invalidate(token)
+    # 현재 토큰의 세션 무효화
     try:
-        current_user.session_token = None
-        current_user.session_expires_at = None
-        db.commit()
+        await session_store.session_store.revoke(db, token)
+        await db.commit()
     except Exception as e:
-        db.rollback()
-        print(f"세션 무효화 오류: {e}")
+        await db.rollback()
+        logger.warning(f"세션 무효화 오류: {e}")
     
     response.delete_cookie(
         key="access_token",
@@ -146,98 +190,130 @@ def logout(
 
 # -------------------- [세션 상태 확인 기능] --------------------
 @app.get("/session-status", response_model=schemas.SessionStatusResponse)
-def get_session_status(
+async def get_session_status(
+    token: str = Depends(auth.oauth2_scheme),
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
-    """현재 사용자의 세션 보안 설정 확인"""
-    session_active = (
-        current_user.session_token is not None and 
-        current_user.session_expires_at is not None and 
-        current_user.session_expires_at > datetime.utcnow()
-    )
+    """현재 기기 세션의 보안 설정과 사용자의 활성 세션(기기) 수 확인"""
+    session = await session_store.session_store.get(db, token)
     
     return schemas.SessionStatusResponse(
         user_id=current_user.id,
         username=current_user.username,
-        http_only_enabled=current_user.is_http_only,  # ✓ 체크 상태
-        secure_enabled=current_user.is_secure,        # ✓ 체크 상태
-        session_active=session_active,
+        email=current_user.email,
+        http_only_enabled=session.is_http_only if session else False,  # ✓ 체크 상태
+        secure_enabled=session.is_secure if session else False,        # ✓ 체크 상태
+        session_active=session is not None,
+        active_sessions=await session_store.session_store.count_active(db, current_user.id),
         last_login_at=current_user.last_login_at,
-        session_expires_at=current_user.session_expires_at
+        session_expires_at=session.expires_at if session else None,
+        created_at=current_user.created_at
     )
 
 # -------------------- [내 정보 조회 기능] --------------------
 @app.get("/users/me", response_model=schemas.UserResponse)
-def read_users_me(current_user: models.User = Depends(dependencies.get_current_user)):
+async def read_users_me(current_user: models.User = Depends(dependencies.get_current_user)):
     return current_user
 
 # -------------------- [세션 정보 포함 사용자 정보 조회] --------------------
 @app.get("/users/me/with-session", response_model=schemas.UserWithSessionResponse)
-def read_users_me_with_session(current_user: models.User = Depends(dependencies.get_current_user)):
-    """세션 정보를 포함한 사용자 정보 조회"""
-    return current_user
+async def read_users_me_with_session(
+    token: str = Depends(auth.oauth2_scheme),
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """현재 기기 세션 정보를 포함한 사용자 정보 조회"""
+    session = await session_store.session_store.get(db, token)
+    return schemas.UserWithSessionResponse(
+        id=current_user.id,
+        email=current_user.email,
+        username=current_user.username,
+        role=current_user.role,
+        session_token=token if session else None,
+        is_http_only=session.is_http_only if session else True,
+        is_secure=session.is_secure if session else True,
+        session_expires_at=session.expires_at if session else None,
+        last_login_at=current_user.last_login_at,
+        created_at=current_user.created_at,
+        updated_at=current_user.updated_at,
+    )
 
 # -------------------- [리뷰 작성 기능] --------------------
 @app.post("/api/reviews", status_code=status.HTTP_201_CREATED)
 async def create_review(
+    background_tasks: BackgroundTasks,
     place_name: str = Form(...),
     place_address: str = Form(...),
     review_date: str = Form(...),
     rating: str = Form(...),
     companion: str = Form(...),
     review_text: str = Form(...),
+    place_id: Optional[str] = Form(None),
+    place_lat: Optional[float] = Form(None),
+    place_lng: Optional[float] = Form(None),
     images: List[UploadFile] = File(default=[]),
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
     """
     리뷰 작성 및 이미지 업로드
-    - 이미지 파일 저장
+    - 이미지 파일 저장 (파일/요청 크기 제한)
     - 리뷰 데이터 DB 저장
+    - 썸네일/WebP 변형 생성 및 EXIF 제거는 응답 후 백그라운드에서 처리
+    - place_id(Google place_id)가 있으면 장소와 연결하고 장소 집계 갱신
     """
+    stars = schemas.parse_rating(rating)
+    if stars is None:
+        raise HTTPException(status_code=400, detail="평점은 1~5 사이여야 합니다.")
+
+    # 이미지 파일 저장 (스레드풀에서 청크 단위로 동시 저장)
+    try:
+        uploads = await storage.save_uploads(images)
+    except storage.UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
     try:
-        # 이미지 파일 저장
-        image_paths = []
-        if images:
-            for image in images:
-                if image.filename and image.filename.strip() and image.size > 0:
-                    os.makedirs("uploads", exist_ok=True)
-                    file_extension = os.path.splitext(image.filename)[1]
-                    unique_filename = f"{uuid.uuid4()}{file_extension}"
-                    file_path = f"uploads/{unique_filename}"
-                    with open(file_path, "wb") as buffer:
-                        content = await image.read()
-                        buffer.write(content)
-                    image_paths.append(file_path)
-                    print(f"이미지 저장됨: {file_path}")
-        
         # 리뷰 데이터 준비 및 DB 저장
         review_data = {
             "user_id": current_user.id,
             "place_name": place_name,
             "place_address": place_address,
             "review_date": datetime.fromisoformat(review_date.replace('Z', '+00:00')),
-            "rating": rating,
+            "rating": stars,
             "companion": companion,
             "review_text": review_text,
-            "image_paths": ",".join(image_paths) if image_paths else None,
+            "images": uploads,
             "created_at": datetime.utcnow()
         }
         
-        saved_review = crud.create_review(db, review_data)
+        # 장소 저장, blob 참조 수 증가와 리뷰 저장을 한 트랜잭션으로 커밋
+        if place_id:
+            review_data["place_id"] = await crud.upsert_place_async(
+                db, place_id, place_name, place_address, place_lat, place_lng
+            )
+        await crud.acquire_media_blobs_async(db, uploads)
+        saved_review = await crud.create_review_async(db, review_data)
+        if saved_review.place_id:
+            autocomplete.autocomplete_service.record_place(saved_review.place_id, place_name)
+        background_tasks.add_task(image_processing.process_review_images, saved_review.id, [upload.path for upload in uploads])
         return {
             "message": "리뷰가 성공적으로 저장되었습니다.",
             "review_id": saved_review.id,
+            "place_id": saved_review.place_id,
             "place_name": place_name,
-            "rating": rating,
-            "image_count": len(image_paths),
-            "image_paths": image_paths,
+            "rating": stars,
+            "image_count": len(saved_review.images),
+            "images": [_format_image(image) for image in saved_review.images],
             "status": "success"
         }
     except Exception as e:
-        print(f"리뷰 저장 오류: {str(e)}")
-        db.rollback()
+        logger.exception(f"리뷰 저장 오류: {e}")
+        await db.rollback()
+        storage.discard_unpublished(uploads)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"리뷰 저장 중 오류가 발생했습니다: {str(e)}"
@@ -245,49 +321,41 @@ async def create_review(
 
 # -------------------- [검색 기록 저장 기능] --------------------
 @app.post("/search-history/", status_code=status.HTTP_201_CREATED)
-def save_search_history(
+async def save_search_history(
     request: SearchHistoryRequest,
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
     """
     검색 기록 저장
-    - 중복 검색 기록 삭제 후 저장
-    - 장소/일반 검색 구분
-    """
-    if request.is_place and request.name:
-        existing = db.query(models.SearchHistory).filter(
-            models.SearchHistory.user_id == current_user.id,
-            models.SearchHistory.is_place == True,
-            models.SearchHistory.name == request.name
-        ).first()
-    else:
-        existing = db.query(models.SearchHistory).filter(
-            models.SearchHistory.user_id == current_user.id,
-            models.SearchHistory.is_place == False,
-            models.SearchHistory.query == request.query
-        ).first()
-    
-    if existing:
-        db.delete(existing)
-    
-    search_record = models.SearchHistory(
-        query=request.query,
-        is_place=request.is_place,
-        name=request.name if request.is_place else None,
-        user_id=current_user.id
-    )
-    
+    - 같은 검색(장소는 name, 일반 검색은 query 기준)은 새로 쌓지 않고 최신 시각으로 갱신
+    - 사용자별 최대 보관 수를 넘는 오래된 기록은 자동 삭제
+    - 쓰기 지연 버퍼 사용 시 버퍼에만 넣고 응답 (id는 일괄 저장 후 부여)
+    """
+    buffer = search_buffer.search_history_buffer
+    if buffer.running:
+        search_record = buffer.add(current_user.id, request.query, request.is_place, request.name)
+        autocomplete.autocomplete_service.record_search(current_user.id, request.query, request.is_place, request.name)
+        return {
+            "id": search_record.id,
+            "query": search_record.query,
+            "is_place": search_record.is_place,
+            "name": search_record.name,
+            "created_at": search_record.created_at,
+            "message": "검색 기록이 저장되었습니다."
+        }
+
     try:
-        db.add(search_record)
-        db.commit()
-        db.refresh(search_record)
+        search_record = await crud.upsert_search_history_async(
+            db, current_user.id, request.query, request.is_place, request.name
+        )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"검색 기록 저장 중 오류가 발생했습니다: {str(e)}"
         )
+    autocomplete.autocomplete_service.record_search(current_user.id, request.query, request.is_place, request.name)
     
     return {
         "id": search_record.id,
@@ -300,19 +368,22 @@ def save_search_history(
 
 # -------------------- [검색 기록 조회 기능] --------------------
 @app.get("/search-history/")
-def get_search_history(
-    limit: int = 10,
+async def get_search_history(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
-    """내 검색 기록 목록 조회"""
-    history = db.query(models.SearchHistory).filter(
-        models.SearchHistory.user_id == current_user.id
-    ).order_by(
-        models.SearchHistory.created_at.desc()
-    ).limit(limit).all()
-    
-    return [
+    """
+    내 검색 기록 목록 조회 (키셋 페이지네이션)
+    - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달
+    - 아직 일괄 저장되지 않은 내 검색 기록은 조회 전에 먼저 기록 (페이지 사이에서 중복/누락되지 않도록)
+    """
+    buffer = search_buffer.search_history_buffer
+    if buffer.pending_for(current_user.id):
+        await buffer.flush(current_user.id)
+    history, next_cursor = await crud.get_search_history_page_async(db, current_user.id, limit, cursor)
+    page = responses.FastJSONResponse([
         {
             "id": record.id,
             "query": record.query,
@@ -321,96 +392,367 @@ def get_search_history(
             "created_at": record.created_at
         }
         for record in history
-    ]
+    ])
+    pagination.set_next_cursor(page, next_cursor)
+    return page
 
 # -------------------- [검색 기록 삭제 기능] --------------------
 @app.delete("/search-history/{history_id}")
-def delete_search_history(
+async def delete_search_history(
     history_id: int,
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
     """특정 검색 기록 삭제"""
-    history = db.query(models.SearchHistory).filter(
+    result = await db.execute(select(models.SearchHistory).filter(
         models.SearchHistory.id == history_id,
         models.SearchHistory.user_id == current_user.id
-    ).first()
+    ))
+    history = result.scalar_one_or_none()
     
     if not history:
         raise HTTPException(status_code=404, detail="검색 기록을 찾을 수 없습니다.")
     
-    db.delete(history)
-    db.commit()
+    search_buffer.search_history_buffer.discard(current_user.id, history.is_place, history.name, history.query)
+    autocomplete.autocomplete_service.forget_search(current_user.id, history.name or history.query)
+    await db.delete(history)
+    await db.commit()
     return {"message": "검색 기록이 삭제되었습니다."}
 
 @app.delete("/search-history/")
-def clear_all_search_history(
+async def clear_all_search_history(
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
     """전체 검색 기록 삭제"""
-    deleted_count = db.query(models.SearchHistory).filter(
+    search_buffer.search_history_buffer.discard_user(current_user.id)
+    autocomplete.autocomplete_service.forget_search(current_user.id)
+    result = await db.execute(delete(models.SearchHistory).filter(
         models.SearchHistory.user_id == current_user.id
-    ).delete()
-    db.commit()
+    ))
+    deleted_count = result.rowcount
+    await db.commit()
     return {"message": f"{deleted_count}개의 검색 기록이 삭제되었습니다."}
 
-# -------------------- [세션 정리 기능] --------------------
-@app.post("/cleanup-sessions")
-def cleanup_expired_sessions(
-    db: Session = Depends(dependencies.get_db)
+# -------------------- [검색창 자동완성 기능] --------------------
+@app.get("/autocomplete")
+async def get_autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """
+    검색창 자동완성 (입력한 앞부분으로 시작하는 검색어/장소)
+    - kind: history(내 최근 검색), place(리뷰가 있는 장소, place_id 포함), query(인기 검색어)
+    - 내 최근 검색을 먼저, 나머지는 검색 빈도와 최근성을 합친 점수 순
+    - Google 자동완성은 결과가 부족할 때만 /api/places/autocomplete로 따로 호출
+    """
+    return await autocomplete.autocomplete_service.suggest(db, current_user.id, q, limit)
+
+# -------------------- [장소 검색 프록시 기능] --------------------
+@app.get("/api/places/autocomplete")
+async def places_autocomplete(
+    input: str = Query(..., min_length=1),
+    language: str = "ko",
+    components: Optional[str] = "country:kr",
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius: Optional[int] = Query(None, ge=1, le=50000),
+    current_user: models.User = Depends(dependencies.get_current_user),
+):
+    """
+    장소 자동완성 (Google Places autocomplete 응답 그대로 전달)
+    - 검색어와 반올림된 위치 기준으로 캐시
+    """
+    return await places.autocomplete(input, language, components, lat, lng, radius)
+
+@app.get("/api/places/details")
+async def places_details(
+    place_id: str,
+    language: str = "ko",
+    fields: Optional[str] = None,
+    current_user: models.User = Depends(dependencies.get_current_user),
+):
+    """장소 상세 정보 (Google Places details 응답 그대로 전달)"""
+    return await places.details(place_id, language, fields)
+
+@app.get("/api/places/nearby")
+async def places_nearby(
+    lat: float,
+    lng: float,
+    radius: int = Query(3000, ge=1, le=50000),
+    keyword: Optional[str] = None,
+    type: Optional[str] = None,
+    language: str = "ko",
+    current_user: models.User = Depends(dependencies.get_current_user),
+):
+    """
+    주변 장소 검색 (Google Places nearbysearch 응답 그대로 전달)
+    - 키워드와 반올림된 위치 기준으로 캐시
+    """
+    return await places.nearby(lat, lng, radius, keyword, type, language)
+
+# -------------------- [장소 정보 조회 기능] --------------------
+def _format_place(place) -> dict:
+    """장소 응답 형식 (집계 컬럼에서 평점 분포와 평균 계산, 리뷰 테이블은 조회하지 않음)"""
+    return {
+        "id": place.id,
+        "provider": place.provider,
+        "provider_place_id": place.provider_place_id,
+        "name": place.name,
+        "address": place.address,
+        "lat": place.lat,
+        "lng": place.lng,
+        "review_count": place.review_count,
+        "rating_histogram": crud.rating_histogram(place),
+        "average_rating": crud.average_rating(place),
+        "last_review_at": place.last_review_at,
+    }
+
+@app.get("/api/places/{place_id}", response_model=schemas.PlaceResponse)
+async def get_place(
+    place_id: int,
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
-    """만료된 세션 정리"""
-    updated_count = db.query(models.User).filter(
-        models.User.session_expires_at < datetime.utcnow()
-    ).update({
-        "session_token": None,
-        "session_expires_at": None
-    })
-    db.commit()
-    return {"message": f"{updated_count}개의 만료된 세션이 정리되었습니다."}
+    """장소 정보와 리뷰 집계 (리뷰 수, 평점 분포, 마지막 리뷰 시각) 조회"""
+    place = await crud.get_place_async(db, place_id)
+    if not place:
+        raise HTTPException(status_code=404, detail="장소를 찾을 수 없습니다.")
+    return _format_place(place)
+
+# -------------------- [내 주변 리뷰 장소 조회 기능] --------------------
+@app.get("/places/nearby", response_model=List[schemas.NearbyPlaceResponse])
+async def get_reviewed_places_nearby(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: int = Query(2000, ge=1, le=auth.config.settings.NEARBY_MAX_RADIUS_M),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
+    ranking: str = Query("distance", pattern="^(distance|rating)$"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """
+    리뷰가 있는 주변 장소 조회
+    - 반경 조회: lat, lng, radius(미터)
+    - 경계 상자 조회: min_lat, min_lng, max_lat, max_lng (지도 화면 영역, 거리는 상자 중심 기준)
+    - ranking: distance(가까운 순) 또는 rating(평점 높은 순)
+    """
+    box = (min_lat, min_lng, max_lat, max_lng)
+    if all(value is not None for value in box):
+        if min_lat > max_lat or min_lng > max_lng:
+            raise HTTPException(status_code=400, detail="경계 상자 범위가 올바르지 않습니다.")
+        results = await crud.get_places_in_box_async(db, box, ranking, limit)
+    elif lat is not None and lng is not None:
+        results = await crud.get_places_nearby_async(db, lat, lng, radius, ranking, limit)
+    else:
+        raise HTTPException(status_code=400, detail="lat/lng 또는 min_lat/min_lng/max_lat/max_lng가 필요합니다.")
+    return [
+        {**_format_place(result["place"]), "distance_m": round(result["distance_m"], 1)}
+        for result in results
+    ]
+
+# -------------------- [관리: 리뷰 대량 가져오기/내보내기] --------------------
+@app.post("/admin/reviews:import")
+async def import_reviews(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    admin: models.User = Depends(dependencies.get_current_admin),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """
+    리뷰 대량 가져오기 (관리자 전용, 요청 본문을 스트리밍으로 읽음)
+    - 형식: format 파라미터, 없으면 Content-Type이 text/csv면 CSV, 그 외 NDJSON
+    - 각 행은 ReviewCreate 필드 + user_id(필수), place_id, created_at(선택)
+    - BULK_IMPORT_BATCH_SIZE개씩 한 트랜잭션으로 저장, 잘못된 행은 건너뛰고 줄 번호와 함께 보고
+    """
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    return await bulk_reviews.import_reviews(db, request.stream(), format)
+
+@app.get("/admin/reviews:export")
+async def export_reviews(
+    user_id: Optional[int] = None,
+    place_id: Optional[int] = None,
+    after_id: Optional[int] = Query(None, ge=0),
+    admin: models.User = Depends(dependencies.get_current_admin),
+):
+    """
+    리뷰 대량 내보내기 (관리자 전용, id 순 NDJSON 스트리밍)
+    - 서버 측 커서로 DB_STREAM_YIELD_PER개씩 읽어 바로 전송 (행 수와 무관하게 일정한 메모리)
+    - 중단된 경우 마지막으로 받은 id를 after_id로 넘겨 이어서 받기
+    """
+    return StreamingResponse(
+        bulk_reviews.export_reviews(user_id, place_id, after_id),
+        media_type="application/x-ndjson",
+    )
+
+# -------------------- [지표 노출 (Prometheus 텍스트 형식)] --------------------
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_metrics():
+    """
+    워커 프로세스별 지표 (라우트별 응답 시간/요청 수, SQL 실행 시간/행 수, 느린 쿼리 수, 커넥션 풀)
+    - 수집기는 INTERNAL_API_TOKEN을 Bearer 토큰으로 전송 (Prometheus scrape_configs의 authorization)
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# -------------------- [내부: 커넥션 풀 통계] --------------------
+@app.get("/internal/pool-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_pool_stats():
+    """워커 프로세스별 커넥션 풀 사용 현황 (체크아웃 수, 대기 시간, 오버플로)"""
+    return database.pool_stats()
+
+# -------------------- [내부: 미디어 서빙 통계] --------------------
+@app.get("/internal/media-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_media_stats():
+    """워커 프로세스별 미디어 서빙 통계 (전송 바이트, 304 캐시 적중률)"""
+    return media.media_stats.snapshot()
+
+# -------------------- [내부: 장소 프록시 통계] --------------------
+@app.get("/internal/places-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_places_stats():
+    """워커 프로세스별 장소 프록시 통계 (캐시 적중률, 합쳐진 요청 수, upstream 호출 수)"""
+    return {**places.places_proxy.stats.snapshot(), "cached_entries": len(places.places_proxy.local)}
+
+# -------------------- [내부: 비밀번호 해싱 통계] --------------------
+@app.get("/internal/hashing-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_hashing_stats():
+    """워커 프로세스별 비밀번호 해싱 실행기 상태 (대기/실행 중 수, 503 거절 수, 평균 대기/해싱 시간)"""
+    return password_hashing.password_hasher.stats()
+
+# -------------------- [내부: 만료 세션 정리 통계] --------------------
+@app.get("/internal/session-sweeper-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_session_sweeper_stats():
+    """워커 프로세스별 만료 세션 정리 작업 상태 (실행/잠금으로 건너뛴 횟수, 배치 수, 삭제한 세션 수)"""
+    return session_sweeper.session_sweeper.stats()
+
+@app.get("/internal/autocomplete-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_autocomplete_stats():
+    """워커 프로세스별 자동완성 색인 상태 (항목 수, 캐시된 접두어/사용자 수, 조회 수)"""
+    return autocomplete.autocomplete_service.stats()
+
+@app.get("/internal/search-stats", include_in_schema=False, dependencies=[Depends(dependencies.require_internal_access)])
+async def get_search_stats():
+    """워커 프로세스별 리뷰 검색 역색인 상태 (PostgreSQL 전문 검색 사용 시 적재되지 않음)"""
+    return review_search.review_index.stats()
 
 # -------------------- [프로필 및 리뷰 조회 기능] --------------------
 @app.get("/profile")
-def get_profile(
-    current_user: models.User = Depends(dependencies.get_current_user)
+async def get_profile(
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
-    """사용자 프로필 정보 조회"""
+    """사용자 프로필 정보 조회 (리뷰 수/평점 분포는 미리 계산된 사용자 집계에서 조회)"""
+    stats = await crud.get_user_stats_async(db, current_user.id)
     return {
         "id": current_user.id,
         "email": current_user.email,
         "username": current_user.username,
         "role": current_user.role,
-        "created_at": current_user.created_at.isoformat() if current_user.created_at else None
+        "created_at": current_user.created_at.isoformat() if current_user.created_at else None,
+        "review_stats": schemas.UserStatsResponse(**stats).model_dump(mode="json"),
+    }
+
+def _format_image(image: models.ReviewImage) -> dict:
+    """리뷰 이미지 응답 형식 (크기/변형은 후처리 완료 후 채워짐)"""
+    return {
+        "id": image.id,
+        "position": image.position,
+        "path": image.path,
+        "digest": image.digest,
+        "bytes": image.bytes,
+        "width": image.width,
+        "height": image.height,
+        "variants": image.variants or [],
+    }
+
+def _format_review(review: models.Review) -> dict:
+    """리뷰 응답 형식 (날짜는 datetime 그대로, 직렬화 시 ISO 문자열)"""
+    return {
+        "id": review.id,
+        "user_id": review.user_id,
+        "place_id": review.place_id,
+        "place_name": review.place_name,
+        "place_address": review.place_address,
+        "review_date": review.review_date,
+        "rating": review.rating,
+        "companion": review.companion,
+        "review_text": review.review_text,
+        "images": [_format_image(image) for image in review.images],
+        "created_at": review.created_at
     }
 
 @app.get("/my-reviews")
-def get_my_reviews(
+async def get_my_reviews(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(dependencies.get_current_user),
-    db: Session = Depends(dependencies.get_db)
+    db: AsyncSession = Depends(dependencies.get_db)
 ):
-    """현재 로그인한 사용자의 리뷰 목록 조회"""
-    reviews = db.query(models.Review).filter(
-        models.Review.user_id == current_user.id
-    ).order_by(
-        models.Review.created_at.desc()
-    ).all()
-    
-    # 날짜 형식을 문자열로 변환
-    formatted_reviews = []
-    for review in reviews:
-        formatted_review = {
-            "id": review.id,
-            "user_id": review.user_id,
-            "place_name": review.place_name,
-            "place_address": review.place_address,
-            "review_date": review.review_date.isoformat() if review.review_date else None,
-            "rating": review.rating,
-            "companion": review.companion,
-            "review_text": review.review_text,
-            "image_paths": review.image_paths,
-            "created_at": review.created_at.isoformat() if review.created_at else None
+    """
+    현재 로그인한 사용자의 리뷰 목록 조회 (키셋 페이지네이션)
+    - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달
+    """
+    reviews, next_cursor = await crud.get_reviews_by_user_page_async(db, current_user.id, limit, cursor)
+    page = responses.FastJSONResponse([_format_review(review) for review in reviews])
+    pagination.set_next_cursor(page, next_cursor)
+    return page
+
+@app.get("/place-reviews")
+async def get_place_reviews(
+    place_name: Optional[str] = None,
+    place_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """
+    특정 장소의 리뷰 목록 조회 (키셋 페이지네이션)
+    - place_id(장소 테이블 id) 우선, 없으면 장소명 기준 (장소가 연결되지 않은 기존 리뷰용)
+    - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달
+    """
+    if place_id is not None:
+        reviews, next_cursor = await crud.get_reviews_by_place_id_page_async(db, place_id, limit, cursor)
+    elif place_name:
+        reviews, next_cursor = await crud.get_reviews_by_place_page_async(db, place_name, limit, cursor)
+    else:
+        raise HTTPException(status_code=400, detail="place_id 또는 place_name이 필요합니다.")
+    page = responses.FastJSONResponse([_format_review(review) for review in reviews])
+    pagination.set_next_cursor(page, next_cursor)
+    return page
+
+@app.get("/reviews/search")
+async def search_reviews(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: models.User = Depends(dependencies.get_current_user),
+    db: AsyncSession = Depends(dependencies.get_db)
+):
+    """
+    리뷰 전문 검색 (장소명/주소/본문, 관련도 순 키셋 페이지네이션)
+    - 검색어의 모든 단어를 포함하는 리뷰 (단어 앞부분 일치, 부분 문자열은 PostgreSQL에서 3글자, 프로세스 내 역색인에서 2글자 이상 일치)
+    - highlights: 필드별 검색어 위치 [시작, 끝), snippet: 본문 요약과 그 안의 검색어 위치
+    - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달
+    """
+    results, terms, next_cursor = await crud.search_reviews_async(db, q, limit, cursor)
+    page = responses.FastJSONResponse([
+        {
+            **_format_review(review),
+            "score": round(score, 4),
+            "highlights": {
+                "place_name": review_search.highlight_spans(review.place_name, terms),
+                "place_address": review_search.highlight_spans(review.place_address, terms),
+            },
+            "snippet": review_search.snippet(review.review_text, terms),
         }
-        formatted_reviews.append(formatted_review)
-    
-    return formatted_reviews
+        for review, score in results
+    ])
+    pagination.set_next_cursor(page, next_cursor)
+    return page
@@ -0,0 +1,94 @@
+import os
+import re
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from .config import settings
+
+# digest 이름 파일 (원본: <sha256>.ext, 변형: <sha256>_<크기>.ext)
+CONTENT_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(_\d+)?$")
+
+# ==================== 서빙 통계 ====================
+
+class MediaStats:
+    """미디어 서빙 통계 (이벤트 루프에서만 갱신)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.bytes_served = 0
+
+    def record(self, status_code: int, content_length: int):
+        self.requests += 1
+        if status_code == 304:
+            self.not_modified += 1
+        elif status_code == 206:
+            self.partial += 1
+        if status_code in (200, 206):
+            self.bytes_served += content_length
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "partial": self.partial,
+            "bytes_served": self.bytes_served,
+            "cache_hit_ratio": round(self.not_modified / self.requests, 4) if self.requests else 0.0,
+        }
+
+media_stats = MediaStats()
+
+# ==================== 정적 미디어 서빙 ====================
+
+def is_content_named(path: str) -> bool:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return bool(CONTENT_NAME_PATTERN.match(stem))
+
+class MediaFiles(StaticFiles):
+    """
+    업로드 이미지 서빙 (StaticFiles 확장)
+    - 강한 ETag: digest 이름 파일은 파일명, 그 외는 크기+수정시각(ns)
+    - digest 이름 파일은 immutable 장기 캐시, 그 외는 ETag 재검증
+    - If-None-Match(304), Range(206), pathsend(제로카피)는 FileResponse가 처리
+    - 숨김 경로(.incoming 등)는 서빙하지 않음
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await super().__call__(scope, receive, send)
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_stats.record(message["status"], int(headers.get("content-length", 0)))
+            await send(message)
+
+        await super().__call__(scope, receive, counting_send)
+
+    async def get_response(self, path: str, scope) -> Response:
+        if any(part.startswith(".") for part in path.replace("\\", "/").split("/")):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        if is_content_named(str(full_path)):
+            etag = f'"{os.path.basename(full_path)}"'
+            cache_control = f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+        else:
+            etag = f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+            cache_control = settings.MEDIA_DEFAULT_CACHE_CONTROL
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            headers={"etag": etag, "cache-control": cache_control},
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
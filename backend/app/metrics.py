@@ -0,0 +1,271 @@
+import bisect
+import functools
+import inspect
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from .config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow_query")
+
+# Prometheus 텍스트 노출 형식
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 응답 시간 구간 (초) - 캐시 적중 수 ms부터 bcrypt 로그인, 대량 내보내기까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL 실행 시간 구간 (초)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# ==================== 지표 (워커 프로세스 단위, 스레드 안전) ====================
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Counter:
+    """라벨 조합별 누적 값"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in items]
+        return lines
+
+class Histogram:
+    """라벨 조합별 구간 누적 개수/합계 (구간 찾기는 bisect 한 번)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 라벨 -> [구간별 개수(마지막은 +Inf), 합계]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class GaugeCallback:
+    """노출 시점에 콜백으로 읽는 값 ([(라벨 값 튜플, 값)] 반환)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], callback: Callable[[], list]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in self.callback()]
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines += metric.collect()
+            except Exception:
+                logger.exception("지표 수집 실패: %s", metric.name)
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP 요청 수 (라우트 템플릿, 상태 코드별)", ("method", "route", "status")))
+http_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 본문 전송 완료까지)", ("method", "route")))
+http_in_progress = 0
+registry.register(GaugeCallback(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수", (), lambda: [((), http_in_progress)]))
+
+db_duration = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL 문 실행 시간 (커서 실행 기준)", ("operation",), DB_BUCKETS))
+db_rows = registry.register(Counter(
+    "db_statement_rows_total", "SQL 문이 반환/변경한 행 수 (드라이버가 알려주는 경우)", ("operation",)))
+db_slow = registry.register(Counter(
+    "db_slow_statements_total", "SLOW_QUERY_THRESHOLD_MS를 넘은 SQL 문 수", ("operation",)))
+
+function_duration = registry.register(Histogram(
+    "function_duration_seconds", "계측한 함수의 실행 시간", ("function",)))
+
+def _pool_values() -> list:
+    from . import database
+    values = []
+    for name, pool in (("sync", database.engine.pool), ("async", database.async_engine.sync_engine.pool)):
+        for attr in ("checkedout", "overflow", "size"):
+            getter = getattr(pool, attr, None)
+            if getter is not None:
+                # QueuePool.overflow()는 풀이 다 차기 전까지 음수 (-size부터 시작)
+                values.append(((name, attr), max(0, getter())))
+    return values
+
+registry.register(GaugeCallback(
+    "db_pool_connections", "커넥션 풀 상태 (checkedout: 사용 중, overflow: 초과 생성, size: 기본 크기)",
+    ("pool", "state"), _pool_values))
+
+def render() -> str:
+    return registry.render()
+
+# ==================== 함수 실행 시간 ====================
+
+def timed(func=None, *, name: Optional[str] = None):
+    """함수 실행 시간을 function_duration_seconds에 기록 (코루틴 함수 지원, 예외도 기록)"""
+    if func is None:
+        return functools.partial(timed, name=name)
+    label = name or func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                function_duration.observe(time.perf_counter() - start, label)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            function_duration.observe(time.perf_counter() - start, label)
+    return wrapper
+
+# ==================== HTTP 요청 (ASGI 미들웨어) ====================
+
+def _route_label(scope) -> str:
+    """경로 대신 라우트 템플릿 (/places/{place_id}) - 매칭되지 않은 경로는 하나로 묶어 라벨 수 제한"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+class MetricsMiddleware:
+    """
+    라우트별 응답 시간 히스토그램과 상태 코드별 요청 수를 기록하는 순수 ASGI 미들웨어
+    (BaseHTTPMiddleware와 달리 응답 본문을 감싸지 않으므로 스트리밍 응답에도 추가 비용이 거의 없음)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        global http_in_progress
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_progress -= 1
+            method, route = scope["method"], _route_label(scope)
+            http_duration.observe(time.perf_counter() - start, method, route)
+            http_requests.inc(method, route, str(status_code))
+
+# ==================== SQL 실행 (SQLAlchemy 이벤트) ====================
+
+@functools.lru_cache(maxsize=4096)
+def _operation(statement: str) -> str:
+    """SQL 문 종류 (컴파일 캐시 덕분에 같은 문자열이 반복되므로 결과를 캐시)"""
+    keyword = statement.lstrip()[:8].split(None, 1)
+    keyword = keyword[0].upper() if keyword else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 실행 컨텍스트는 문마다 새로 만들어지므로 시작 시각을 여기에 둠 (실패한 문은 컨텍스트와 함께 버려짐)
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    operation = _operation(statement)
+    db_duration.observe(elapsed, operation)
+    rowcount = cursor.rowcount
+    if rowcount is not None and rowcount >= 0:
+        db_rows.inc(operation, amount=rowcount)
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        db_slow.inc(operation)
+        # 바인딩 값은 개인정보가 섞일 수 있어 기록하지 않음
+        slow_query_logger.warning(
+            "느린 SQL %.1f ms (행 %s, executemany=%s): %s",
+            elapsed * 1000, rowcount, executemany, " ".join(statement.split())[:settings.SLOW_QUERY_LOG_MAX_CHARS],
+        )
+
+def instrument_engine(engine):
+    """동기 엔진(비동기 엔진은 .sync_engine)에 SQL 실행 시간 기록 이벤트 등록 (한 번만)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,23 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, DateTime, ForeignKey, Boolean, JSON, Index, Float, CheckConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
 
-# User 모델: 사용자 정보 테이블 (세션 정보 포함)
+# User 모델: 사용자 정보 테이블 (세션은 user_sessions 테이블에 따로 보관)
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)  
+    id = Column(Integer, primary_key=True)  
     email = Column(String, unique=True, index=True, nullable=False)  
     username = Column(String, unique=True, index=True, nullable=False) 
     hashed_password = Column(String, nullable=False) 
     role = Column(String, default="user")  
-    
-    # 세션 관련 필드 추가
-    session_token = Column(String, nullable=True, index=True)
-    is_http_only = Column(Boolean, default=True, nullable=False)  # HTTP Only 설정 체크
-    is_secure = Column(Boolean, default=True, nullable=False)     # Secure 설정 체크
-    session_expires_at = Column(DateTime(timezone=True), nullable=True)
+    # 마지막 로그인 시각 (SESSION_LAST_LOGIN_UPDATE_SECONDS보다 오래되었을 때만 갱신)
     last_login_at = Column(DateTime(timezone=True), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now()) 
@@ -27,18 +22,20 @@ class User(Base):
     search_histories = relationship("SearchHistory", back_populates="user", cascade="all, delete-orphan")
     # 사용자와 리뷰(1:N) 관계
     reviews = relationship("Review", back_populates="user", cascade="all, delete-orphan")
+    # 사용자와 리뷰 집계(1:1) 관계
+    stats = relationship("UserStats", uselist=False, cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<User(id={self.id}, email={self.email}, username={self.username}, role={self.role}, http_only={self.is_http_only}, secure={self.is_secure})>"
+        return f"<User(id={self.id}, email={self.email}, username={self.username}, role={self.role})>"
 
 # SearchHistory 모델: 검색 기록 테이블
 class SearchHistory(Base):
     __tablename__ = "search_history"
 
-    id = Column(Integer, primary_key=True, index=True)  
-    query = Column(String, index=True, nullable=False)  
+    id = Column(Integer, primary_key=True)  
+    query = Column(String, nullable=False)  
     is_place = Column(Boolean, default=False, nullable=False)  
-    name = Column(String, index=True, nullable=True)  
+    name = Column(String, nullable=True)  
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  
     created_at = Column(DateTime(timezone=True), server_default=func.now()) 
 
@@ -48,23 +45,164 @@ class SearchHistory(Base):
     def __repr__(self):
         return f"<SearchHistory(id={self.id}, query={self.query}, is_place={self.is_place}, name={self.name}, user_id={self.user_id})>"
 
+# UserSession 모델: 로그인 세션 (사용자당 기기별 여러 개, 토큰 원문 대신 SHA-256 다이게스트 보관)
+class UserSession(Base):
+    __tablename__ = "user_sessions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token_digest = Column(String(64), nullable=False)  # auth.token_digest(토큰)
+    is_http_only = Column(Boolean, default=True, nullable=False)  # HTTP Only 쿠키로 발급
+    is_secure = Column(Boolean, default=True, nullable=False)     # Secure 쿠키로 발급
+    user_agent = Column(String(255), nullable=True)  # 기기 구분용
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<UserSession(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
+
+# 인증 핫패스의 토큰 조회 (다이게스트 일치)
+Index("uq_user_sessions_token_digest", UserSession.token_digest, unique=True)
+# 사용자별 세션 목록/기기 수 제한 (최신순)
+Index("idx_user_sessions_user_created", UserSession.user_id, UserSession.created_at.desc(), UserSession.id.desc())
+# 만료 세션 정리
+Index("idx_user_sessions_expires", UserSession.expires_at)
+
+# 검색 기록 키셋 페이지네이션용 복합 인덱스 (user_id별 최신순)
+Index("idx_search_history_user_created", SearchHistory.user_id, SearchHistory.created_at.desc(), SearchHistory.id.desc())
+# 검색 기록 중복 방지 키 (장소 검색은 name, 일반 검색은 query 기준) - ON CONFLICT 대상
+SEARCH_HISTORY_DEDUP_KEY = (
+    SearchHistory.user_id,
+    SearchHistory.is_place,
+    func.coalesce(SearchHistory.name, SearchHistory.query),
+)
+Index("uq_search_history_user_key", *SEARCH_HISTORY_DEDUP_KEY, unique=True)
+
 # Review 모델: 리뷰 테이블
 class Review(Base):
     __tablename__ = "reviews"
 
-    id = Column(Integer, primary_key=True, index=True) 
+    id = Column(Integer, primary_key=True) 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  
+    place_id = Column(Integer, ForeignKey("places.id"), nullable=True)  # 기존 리뷰는 백필 전까지 NULL
     place_name = Column(String, nullable=False)  
     place_address = Column(String, nullable=True)  
     review_date = Column(DateTime, nullable=False) 
-    rating = Column(String, nullable=False)  
+    rating = Column(SmallInteger, nullable=False)  # 별점 1~5
     companion = Column(String, nullable=True)  
     review_text = Column(String, nullable=False)  
-    image_paths = Column(String, nullable=True) 
     created_at = Column(DateTime(timezone=True), server_default=func.now())  
 
     # 리뷰와 사용자(N:1) 관계
     user = relationship("User", back_populates="reviews")
+    # 리뷰와 장소(N:1) 관계
+    place = relationship("Place", back_populates="reviews")
+    # 리뷰와 이미지(1:N) 관계, 순서대로 정렬 (리뷰 조회 시 IN 쿼리 한 번으로 함께 로드)
+    images = relationship(
+        "ReviewImage",
+        back_populates="review",
+        order_by="ReviewImage.position",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    __table_args__ = (CheckConstraint("rating BETWEEN 1 AND 5", name="ck_reviews_rating"),)
 
     def __repr__(self):
         return f"<Review(user_id={self.user_id}, place={self.place_name}, rating={self.rating})>"
+
+# 리뷰 키셋 페이지네이션용 복합 인덱스 (사용자별/장소별 최신순)
+Index("idx_reviews_user_created", Review.user_id, Review.created_at.desc(), Review.id.desc())
+Index("idx_reviews_place_created", Review.place_name, Review.created_at.desc(), Review.id.desc())
+Index("idx_reviews_place_id_created", Review.place_id, Review.created_at.desc(), Review.id.desc())
+
+# ReviewImage 모델: 리뷰 이미지 (리뷰당 순서대로 여러 장, 파일은 media_blobs의 콘텐츠 주소 경로)
+class ReviewImage(Base):
+    __tablename__ = "review_images"
+
+    id = Column(Integer, primary_key=True)
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), nullable=False)
+    position = Column(SmallInteger, nullable=False)  # 리뷰 안에서의 순서 (0부터)
+    digest = Column(String(64), nullable=False)  # 저장된 파일의 SHA-256 (media_blobs.digest, 백필 전 레거시 행은 파일명)
+    path = Column(String, nullable=False)
+    bytes = Column(BigInteger, nullable=True)
+    width = Column(Integer, nullable=True)  # 후처리 전에는 NULL
+    height = Column(Integer, nullable=True)
+    variants = Column(JSON, nullable=True)  # 썸네일/WebP 변형 목록 (후처리 결과)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    review = relationship("Review", back_populates="images")
+
+    def __repr__(self):
+        return f"<ReviewImage(review_id={self.review_id}, position={self.position}, path={self.path})>"
+
+# 리뷰별 이미지 순서 (리뷰 목록의 이미지 일괄 로드도 이 인덱스 사용)
+Index("uq_review_images_review_position", ReviewImage.review_id, ReviewImage.position, unique=True)
+
+# Place 모델: 장소 제공자(Google) place_id 기준 장소 테이블 (리뷰 집계 포함)
+class Place(Base):
+    __tablename__ = "places"
+
+    id = Column(Integer, primary_key=True)
+    provider = Column(String, nullable=False, default="google")
+    provider_place_id = Column(String, nullable=False)  # 제공자의 place_id
+    name = Column(String, nullable=False)
+    address = Column(String, nullable=True)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
+    geo_cell = Column(BigInteger, nullable=True)  # 좌표의 52비트 격자 셀 값 (geo.encode_cell)
+
+    # 리뷰 추가/수정/삭제 시 같은 트랜잭션에서 갱신되는 집계
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)  # 평점별 리뷰 수 (★ 1~5개)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    last_review_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # 장소와 리뷰(1:N) 관계
+    reviews = relationship("Review", back_populates="place")
+
+    def __repr__(self):
+        return f"<Place(id={self.id}, provider_place_id={self.provider_place_id}, name={self.name}, review_count={self.review_count})>"
+
+# 제공자 place_id 중복 방지 (장소 upsert 시 ON CONFLICT 대상)
+PLACE_PROVIDER_KEY = (Place.provider, Place.provider_place_id)
+Index("uq_places_provider_place_id", *PLACE_PROVIDER_KEY, unique=True)
+# 격자 셀 범위 조회용 인덱스 (PostGIS가 없을 때 위치 기반 조회)
+# review_count를 조건에 넣으면 리뷰마다 일어나는 집계 UPDATE가 HOT 갱신이 되지 못하므로 전체 인덱스로 둠
+Index("idx_places_geo_cell", Place.geo_cell)
+
+# UserStats 모델: 사용자별 리뷰 집계 (리뷰 추가/수정/삭제 시 같은 트랜잭션에서 갱신)
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)  # 평점별 리뷰 수 (★ 1~5개)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    last_review_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, review_count={self.review_count})>"
+
+# MediaBlob 모델: 콘텐츠 주소 기반 이미지 저장소 (digest당 파일 하나, 리뷰 참조 수 관리)
+class MediaBlob(Base):
+    __tablename__ = "media_blobs"
+
+    digest = Column(String(64), primary_key=True)  # 저장된 파일(메타데이터 제거 후)의 SHA-256
+    path = Column(String, nullable=False)
+    bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # 이 blob을 참조하는 리뷰 이미지 수
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<MediaBlob(digest={self.digest}, ref_count={self.ref_count})>"
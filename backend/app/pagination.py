@@ -0,0 +1,74 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+# 다음 페이지 커서를 전달하는 응답 헤더 (본문은 기존과 같은 리스트 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# ==================== 커서 인코딩 ====================
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="잘못된 페이지 커서입니다."
+    )
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """(created_at, id) 정렬 키를 불투명한 URL-safe 토큰으로 변환"""
+    return _encode([created_at.isoformat(), row_id])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 토큰을 (created_at, id)로 복원, 형식이 잘못되면 400"""
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """(점수, id) 정렬 키를 토큰으로 변환 (검색 결과처럼 점수 역순으로 정렬되는 목록용)"""
+    return _encode([score, row_id])
+
+def decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    """커서 토큰을 (점수, id)로 복원, 형식이 잘못되면 400"""
+    try:
+        score, row_id = _decode(cursor)
+        return float(score), int(row_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+# ==================== 키셋 페이지네이션 ====================
+
+def apply_keyset(stmt, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    (created_at DESC, id DESC) 순서의 키셋 조건 적용
+    - 다음 페이지 존재 여부 확인을 위해 limit + 1 행 조회
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+def split_page(rows: Sequence, limit: int) -> Tuple[list, Optional[str]]:
+    """limit + 1 조회 결과를 현재 페이지와 다음 커서로 분리"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
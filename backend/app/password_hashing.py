@@ -0,0 +1,113 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from .config import settings
+
+# 비밀번호 해싱 컨텍스트 (설정한 bcrypt 비용과 다른 해시는 로그인 성공 시 다시 해싱)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
+
+class HashingOverloadedError(RuntimeError):
+    """해싱 대기열이 가득 차 요청을 받지 않음 (503으로 응답)"""
+
+# ==================== 해싱 (자식 프로세스에서 실행) ====================
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(일치 여부, 비용 설정이 바뀌었으면 새 해시) - 해시 형식이 잘못되면 불일치"""
+    try:
+        return pwd_context.verify_and_update(password, hashed_password)
+    except ValueError:
+        return False, None
+
+# ==================== 전용 실행기 ====================
+
+class PasswordHasher:
+    """
+    비밀번호 해싱 전용 실행기 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - 기본은 프로세스 풀 (GIL 밖에서 실행, 기본 스레드풀을 쓰는 다른 작업이 뒤에 밀리지 않음)
+    - 동시 해싱 수는 PASSWORD_HASH_CONCURRENCY, 기다리거나 실행 중인 요청이 PASSWORD_HASH_MAX_PENDING개에
+      이르면 바로 HashingOverloadedError (로그인 폭주 시 대기열이 끝없이 길어지지 않도록)
+    """
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            workers = settings.PASSWORD_HASH_CONCURRENCY
+            if settings.PASSWORD_HASH_BACKEND == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            self._slots = asyncio.Semaphore(workers)
+        return self._executor
+
+    async def _run(self, func, *args):
+        executor = self._get_executor()
+        if self.pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            self.rejected += 1
+            raise HashingOverloadedError("로그인 요청이 많아 잠시 후 다시 시도해 주세요.")
+        self.pending += 1
+        queued = time.perf_counter()
+        try:
+            async with self._slots:
+                started = time.perf_counter()
+                self.running += 1
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+                finally:
+                    self.running -= 1
+                    self.completed += 1
+                    waited = started - queued
+                    self.total_wait_seconds += waited
+                    self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                    self.total_hash_seconds += time.perf_counter() - started
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        verified, new_hash = await self._run(_verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return verified, new_hash
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.PASSWORD_HASH_BACKEND,
+            "concurrency": settings.PASSWORD_HASH_CONCURRENCY,
+            "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+            "bcrypt_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+            "pending": self.pending,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.completed, 6) if self.completed else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+            "avg_hash_seconds": round(self.total_hash_seconds / self.completed, 6) if self.completed else 0.0,
+        }
+
+# 앱 전체에서 공유하는 해싱 실행기 (워커 프로세스 단위)
+password_hasher = PasswordHasher()
@@ -0,0 +1,331 @@
+import asyncio
+import json
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+import httpx
+from fastapi import HTTPException, status
+from .config import settings
+
+# redis는 선택 의존성 (없거나 PLACES_CACHE_REDIS_URL이 비어 있으면 프로세스 내 캐시만 사용)
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis 미설치 환경
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# 캐시해도 되는 Google 응답 상태 (할당량 초과/권한 오류 등은 캐시하지 않음)
+CACHEABLE_STATUSES = {"OK", "ZERO_RESULTS"}
+
+# ==================== 캐시 키 정규화 ====================
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    """검색어 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 하나로, 소문자)"""
+    if value is None:
+        return None
+    return " ".join(unicodedata.normalize("NFC", value).split()).lower()
+
+def round_location(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """위치를 PLACES_LOCATION_PRECISION 자리로 반올림 (가까운 위치의 요청이 같은 캐시 항목을 사용)"""
+    if lat is None or lng is None:
+        return None
+    precision = settings.PLACES_LOCATION_PRECISION
+    return f"{round(lat, precision):.{precision}f},{round(lng, precision):.{precision}f}"
+
+def cache_key(endpoint: str, params: Dict[str, Optional[str]]) -> str:
+    """엔드포인트와 정규화된 파라미터로 만든 캐시 키 (값이 없는 파라미터는 제외, 순서 무관)"""
+    items = sorted((name, value) for name, value in params.items() if value not in (None, ""))
+    return f"places:{endpoint}:" + "&".join(f"{name}={value}" for name, value in items)
+
+# ==================== 프로세스 내 LRU 캐시 ====================
+
+class CacheEntry:
+    __slots__ = ("payload", "fetched_at")
+
+    def __init__(self, payload: dict, fetched_at: float):
+        self.payload = payload
+        self.fetched_at = fetched_at
+
+    def age(self, now: float) -> float:
+        return now - self.fetched_at
+
+class PlacesLRU:
+    """
+    캐시 키 -> 응답 캐시 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - fresh_ttl 이내는 그대로 응답, fresh_ttl + stale_ttl 이내는 만료된 응답을 주고 백그라운드에서 갱신
+    - 최대 크기 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+    """
+
+    def __init__(self, max_size: int, fresh_ttl: float, stale_ttl: float):
+        self.max_size = max_size
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.age(now) >= self.fresh_ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# ==================== 공유 캐시 (redis, 선택) ====================
+
+class SharedCache:
+    """워커/인스턴스 간 공유 캐시 (redis), 장애 시 프로세스 내 캐시만으로 계속 동작"""
+
+    def __init__(self, url: str, ttl: float):
+        self.ttl = ttl
+        self._client = redis_asyncio.from_url(url) if url and redis_asyncio is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        if self._client is None:
+            return None
+        try:
+            raw = await self._client.get(key)
+        except Exception as e:
+            logger.warning(f"장소 공유 캐시 조회 실패: {e}")
+            return None
+        if raw is None:
+            return None
+        fetched_at, payload = json.loads(raw)
+        return CacheEntry(payload, fetched_at)
+
+    async def set(self, key: str, entry: CacheEntry):
+        if self._client is None:
+            return
+        try:
+            raw = json.dumps([entry.fetched_at, entry.payload], ensure_ascii=False, separators=(",", ":"))
+            await self._client.set(key, raw, ex=max(1, int(self.ttl)))
+        except Exception as e:
+            logger.warning(f"장소 공유 캐시 저장 실패: {e}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+# ==================== 통계 ====================
+
+class PlacesStats:
+    """장소 프록시 통계 (이벤트 루프에서만 갱신)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.stale_served = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "stale_served": self.stale_served,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "hit_ratio": (self.local_hits + self.shared_hits) / self.requests if self.requests else 0.0,
+        }
+
+# ==================== 프록시 ====================
+
+class PlacesUpstreamError(Exception):
+    """Google Places 호출 실패 (네트워크 오류, 5xx, 캐시할 수 없는 상태 코드)"""
+
+class PlacesProxy:
+    """
+    Google Places 프록시 (autocomplete/details/nearbysearch)
+    - 프로세스 내 LRU -> 공유 캐시(redis) -> Google 순으로 조회
+    - 같은 키의 동시 조회는 upstream 호출 하나를 공유 (request coalescing)
+    - 만료된 항목은 stale 기간 동안 그대로 응답하고 백그라운드에서 한 번만 갱신
+    """
+
+    def __init__(self, base_url: str, api_key: str, timeout: float, local: PlacesLRU, shared: SharedCache):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.local = local
+        self.shared = shared
+        self.stats = PlacesStats()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.shared.close()
+
+    async def _call_upstream(self, endpoint: str, params: Dict[str, Optional[str]]) -> dict:
+        query = {name: value for name, value in params.items() if value not in (None, "")}
+        query["key"] = self.api_key
+        self.stats.upstream_calls += 1
+        try:
+            response = await self._get_client().get(f"{self.base_url}/{endpoint}/json", params=query)
+            response.raise_for_status()
+            payload = response.json()
+        except httpx.HTTPStatusError as e:
+            self.stats.upstream_errors += 1
+            raise PlacesUpstreamError(f"Google Places 호출 실패: HTTP {e.response.status_code}") from e
+        except (httpx.HTTPError, ValueError) as e:
+            # 예외 메시지에는 API 키가 포함된 URL이 들어갈 수 있어 예외 종류만 기록
+            self.stats.upstream_errors += 1
+            raise PlacesUpstreamError(f"Google Places 호출 실패: {type(e).__name__}") from e
+        if payload.get("status") not in CACHEABLE_STATUSES:
+            self.stats.upstream_errors += 1
+            raise PlacesUpstreamError(f"Google Places 오류 상태: {payload.get('status')}")
+        return payload
+
+    async def _fetch_and_store(self, key: str, endpoint: str, params: Dict[str, Optional[str]]) -> CacheEntry:
+        entry = CacheEntry(await self._call_upstream(endpoint, params), time.time())
+        self.local.set(key, entry)
+        await self.shared.set(key, entry)
+        return entry
+
+    def _fetch_coalesced(self, key: str, endpoint: str, params: Dict[str, Optional[str]]) -> asyncio.Future:
+        """같은 키로 진행 중인 upstream 호출이 있으면 그 결과를 공유"""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            return inflight
+        task = asyncio.ensure_future(self._fetch_and_store(key, endpoint, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    def _revalidate(self, key: str, endpoint: str, params: Dict[str, Optional[str]]):
+        """만료된 항목 백그라운드 갱신 (실패는 로그만 남기고 기존 항목 유지)"""
+        def _log_failure(task: asyncio.Future):
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"장소 캐시 갱신 실패 ({key}): {task.exception()}")
+        self._fetch_coalesced(key, endpoint, params).add_done_callback(_log_failure)
+
+    async def lookup(self, endpoint: str, params: Dict[str, Optional[str]], key_params: Dict[str, Optional[str]]) -> dict:
+        """
+        캐시를 거쳐 Google Places 응답 조회
+        - params는 upstream에 그대로 전달, key_params는 정규화된 캐시 키 구성용
+        """
+        self.stats.requests += 1
+        key = cache_key(endpoint, key_params)
+        now = time.time()
+
+        entry = self.local.get(key, now)
+        if entry is None:
+            entry = await self.shared.get(key)
+            if entry is not None and entry.age(now) < self.local.fresh_ttl + self.local.stale_ttl:
+                self.stats.shared_hits += 1
+                self.local.set(key, entry)
+            else:
+                entry = None
+        else:
+            self.stats.local_hits += 1
+
+        if entry is not None:
+            if entry.age(now) >= self.local.fresh_ttl:
+                self.stats.stale_served += 1
+                self._revalidate(key, endpoint, params)
+            return entry.payload
+
+        # shield: 먼저 기다리던 요청이 취소돼도 같은 호출을 공유하는 다른 요청은 계속 진행
+        entry = await asyncio.shield(self._fetch_coalesced(key, endpoint, params))
+        return entry.payload
+
+places_proxy = PlacesProxy(
+    base_url=settings.PLACES_API_BASE_URL,
+    api_key=settings.GOOGLE_MAPS_API_KEY,
+    timeout=settings.PLACES_UPSTREAM_TIMEOUT,
+    local=PlacesLRU(
+        max_size=settings.PLACES_CACHE_MAX_SIZE,
+        fresh_ttl=settings.PLACES_CACHE_TTL_SECONDS,
+        stale_ttl=settings.PLACES_CACHE_STALE_SECONDS,
+    ),
+    shared=SharedCache(
+        settings.PLACES_CACHE_REDIS_URL,
+        ttl=settings.PLACES_CACHE_TTL_SECONDS + settings.PLACES_CACHE_STALE_SECONDS,
+    ),
+)
+
+# ==================== 엔드포인트별 조회 ====================
+
+async def _lookup(endpoint: str, params: Dict[str, Optional[str]], key_params: Dict[str, Optional[str]]) -> dict:
+    if not places_proxy.api_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="장소 검색이 설정되지 않았습니다."
+        )
+    try:
+        return await places_proxy.lookup(endpoint, params, key_params)
+    except PlacesUpstreamError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="장소 정보를 가져오지 못했습니다."
+        )
+
+# upstream에도 반올림된 위치를 보내 캐시 항목과 실제 응답이 같은 위치 기준이 되도록 함
+async def autocomplete(text: str, language: str, components: Optional[str],
+                       lat: Optional[float], lng: Optional[float], radius: Optional[int]) -> dict:
+    location = round_location(lat, lng)
+    params = {"input": text.strip(), "language": language, "components": components,
+              "location": location, "radius": str(radius) if location and radius else None}
+    key_params = dict(params, input=normalize_text(text))
+    return await _lookup("autocomplete", params, key_params)
+
+async def details(place_id: str, language: str, fields: Optional[str]) -> dict:
+    # fields는 순서와 무관하게 같은 키가 되도록 정렬
+    fields_key = ",".join(sorted({field.strip() for field in fields.split(",") if field.strip()})) if fields else None
+    params = {"place_id": place_id, "language": language, "fields": fields_key}
+    return await _lookup("details", params, params)
+
+async def nearby(lat: float, lng: float, radius: int, keyword: Optional[str],
+                 type: Optional[str], language: str) -> dict:
+    location = round_location(lat, lng)
+    params = {"location": location, "radius": str(radius), "keyword": keyword.strip() if keyword else None,
+              "type": type, "language": language}
+    key_params = dict(params, keyword=normalize_text(keyword))
+    return await _lookup("nearbysearch", params, key_params)
+
+async def find_place(text: str, language: str = "ko") -> Optional[dict]:
+    """
+    장소명(+주소) 텍스트로 가장 잘 맞는 장소 후보 하나 조회 (findplacefromtext, 백필 작업용)
+    - 후보가 없으면 None, upstream 실패 시 PlacesUpstreamError
+    """
+    params = {"input": text.strip(), "inputtype": "textquery", "language": language,
+              "fields": "formatted_address,geometry,name,place_id"}
+    key_params = dict(params, input=normalize_text(text))
+    payload = await places_proxy.lookup("findplacefromtext", params, key_params)
+    candidates = payload.get("candidates") or []
+    return candidates[0] if candidates else None
@@ -0,0 +1,134 @@
+import functools
+import logging
+import re
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . import metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# 세션 info / 커넥션 실행 옵션에 카운터를 담는 키
+COUNTER_KEY = "query_counter"
+
+# IN (?, ?, ?) 처럼 개수만 다른 바인딩 목록을 같은 모양으로 취급 (sqlite ?, psycopg2 %(name)s, asyncpg $1)
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+))+\s*\)")
+
+statements_per_request = metrics.registry.register(metrics.Histogram(
+    "db_statements_per_request", "요청 하나가 실행한 SQL 문 수 (get_db 세션 기준)", ("route",),
+    (1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+))
+violations = metrics.registry.register(metrics.Counter(
+    "db_query_budget_violations_total", "SQL 문 수 예산 초과(budget)/같은 모양 반복(repeat) 요청 수", ("route", "kind"),
+))
+
+class QueryBudgetExceeded(RuntimeError):
+    """요청의 SQL 문 수가 예산을 넘었거나 같은 모양의 문이 반복됨 (QUERY_BUDGET_MODE=raise)"""
+
+@functools.lru_cache(maxsize=4096)
+def statement_shape(statement: str) -> str:
+    """바인딩 목록 길이를 지운 SQL 문 (컴파일 캐시 덕분에 같은 문자열이 반복되므로 결과를 캐시)"""
+    return _PARAM_LIST.sub("(...)", statement)
+
+def route_key(request) -> str:
+    """예산 설정 키 ("GET /places/{place_id}", 라우트 템플릿 기준)"""
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', None) or request.url.path}"
+
+class QueryCounter:
+    """
+    요청 하나(get_db 세션 하나)의 SQL 문 수와 모양별 실행 횟수
+    - budget: 허용 문 수 (0 이면 검사 안 함), repeat_threshold: 같은 모양 허용 횟수 (0 이면 검사 안 함)
+    - raise 모드는 처음 넘은 문에서 바로 예외 (추적 정보가 문제의 코드를 가리킴), log 모드는 요청 끝에 한 번 경고
+    """
+
+    def __init__(self, route: str, budget: int, repeat_threshold: int, raise_on_violation: bool):
+        self.route = route
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+        self.raise_on_violation = raise_on_violation
+        self.count = 0
+        self.shapes: Dict[str, int] = {}
+        self.raised = False
+
+    def record(self, statement: str):
+        self.count += 1
+        shape = statement_shape(statement)
+        repeats = self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if not self.raise_on_violation or self.raised:
+            return
+        if self.budget and self.count > self.budget:
+            self.raised = True
+            raise QueryBudgetExceeded(f"{self.route}: SQL 문 {self.count}개 실행 (예산 {self.budget}개)")
+        if self.repeat_threshold and repeats > self.repeat_threshold:
+            self.raised = True
+            raise QueryBudgetExceeded(
+                f"{self.route}: 같은 모양의 SQL 문을 {repeats}번 실행 (N+1 의심, 허용 {self.repeat_threshold}번): {_preview(shape)}"
+            )
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.count > self.budget
+
+    def repeated(self) -> Dict[str, int]:
+        if not self.repeat_threshold:
+            return {}
+        return {shape: n for shape, n in self.shapes.items() if n > self.repeat_threshold}
+
+def _preview(statement: str) -> str:
+    return " ".join(statement.split())[:200]
+
+def attach(db, request) -> Optional[QueryCounter]:
+    """요청 의존성의 세션에 카운터 연결 (요청 밖 세션이나 비활성 시 None)"""
+    if request is None or not settings.QUERY_BUDGET_ENABLED:
+        return None
+    route = route_key(request)
+    budget = settings.QUERY_BUDGET_ROUTES.get(route, settings.QUERY_BUDGET_DEFAULT)
+    # 라우트별 예산이 0 이면 그 라우트는 반복 검사도 하지 않음 (대량 가져오기처럼 배치마다 같은 문을 쓰는 경우)
+    exempt = settings.QUERY_BUDGET_ROUTES.get(route) == 0
+    counter = QueryCounter(
+        route,
+        budget,
+        0 if exempt else settings.QUERY_REPEAT_THRESHOLD,
+        settings.QUERY_BUDGET_MODE == "raise",
+    )
+    db.sync_session.info[COUNTER_KEY] = counter
+    request.state.query_counter = counter
+    return counter
+
+def report(counter: Optional[QueryCounter]):
+    """요청 끝에 문 수 기록, 예산 초과/반복이 있으면 지표와 경고 로그 (log 모드)"""
+    if counter is None:
+        return
+    statements_per_request.observe(counter.count, counter.route)
+    repeated = counter.repeated()
+    if counter.over_budget:
+        violations.inc(counter.route, "budget")
+    if repeated:
+        violations.inc(counter.route, "repeat")
+    if (counter.over_budget or repeated) and not counter.raised:
+        logger.warning(
+            "SQL 문 예산 위반: %s 문 %d개 (예산 %s), 반복 %s",
+            counter.route, counter.count, counter.budget or "제한 없음",
+            "; ".join(f"{n}번 {_preview(shape)}" for shape, n in sorted(repeated.items(), key=lambda item: -item[1])[:3]) or "없음",
+        )
+
+# ==================== SQLAlchemy 이벤트 ====================
+
+@event.listens_for(Session, "after_begin")
+def _after_begin(session, transaction, connection):
+    # 세션이 트랜잭션마다 잡는 커넥션에 카운터를 실행 옵션으로 전달 (flush의 INSERT/UPDATE, 지연 로딩 포함)
+    counter = session.info.get(COUNTER_KEY)
+    if counter is not None:
+        connection.execution_options(**{COUNTER_KEY: counter})
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = context.execution_options.get(COUNTER_KEY) if context is not None else None
+    if counter is not None:
+        counter.record(statement)
+
+def instrument_engine(engine):
+    """동기 엔진(비동기 엔진은 .sync_engine)에 SQL 문 수 기록 이벤트 등록 (한 번만)"""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
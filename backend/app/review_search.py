@@ -0,0 +1,280 @@
+import bisect
+import re
+import unicodedata
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .config import settings
+
+# 검색 대상 필드와 가중치 (PostgreSQL tsvector 가중치 A/B/C와 같은 순서)
+FIELD_WEIGHTS = (("place_name", 3), ("place_address", 2), ("review_text", 1))
+
+_WORD = re.compile(r"\w+")
+
+# 이 길이 이상의 검색어는 단어 중간 일치도 허용 ('치찌' -> '김치찌개', 프로세스 내 역색인)
+SUBSTRING_MIN_CHARS = 2
+# PostgreSQL 검색의 부분 문자열 일치(ILIKE) 최소 길이 - 2글자 패턴은 trigram을 뽑을 수 없어
+# trigram 인덱스를 쓰지 못하고 OR로 묶인 tsvector 조건까지 순차 스캔이 되므로 3글자 이상만 (2글자는 앞부분 일치만)
+TRIGRAM_SUBSTRING_MIN_CHARS = 3
+
+# 무효 문서가 이 수 이상이면서 전체 문서 번호의 이 비율 이상이면 포스팅 압축
+_COMPACT_MIN_DEAD = 1000
+_COMPACT_DEAD_RATIO = 0.5
+
+# ==================== 검색어 처리 ====================
+
+def normalize(text: Optional[str]) -> str:
+    """유니코드 NFC + 소문자 (한글 자모 조합형/완성형 차이 제거)"""
+    return unicodedata.normalize("NFC", text or "").lower()
+
+def words(text: Optional[str]) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+def search_terms(query: str) -> List[str]:
+    """검색어를 단어 목록으로 분리 (중복 제거, 최대 SEARCH_MAX_TERMS개)"""
+    terms = []
+    for word in words(query):
+        if word not in terms:
+            terms.append(word)
+    return terms[:settings.SEARCH_MAX_TERMS]
+
+def _grams(text: str) -> set:
+    """글자 2-gram 집합 (한 글자면 비어 있음)"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+# ==================== 하이라이트 ====================
+
+def highlight_spans(text: Optional[str], terms: List[str]) -> List[List[int]]:
+    """text에서 검색어가 나타나는 [시작, 끝) 위치 목록 (대소문자 무시)"""
+    if not text or not terms:
+        return []
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    return [[match.start(), match.end()] for match in pattern.finditer(text)]
+
+def snippet(text: Optional[str], terms: List[str], width: Optional[int] = None) -> dict:
+    """첫 검색어 위치를 중심으로 자른 본문 일부와 그 안의 하이라이트 위치"""
+    width = width or settings.SEARCH_SNIPPET_CHARS
+    text = text or ""
+    spans = highlight_spans(text, terms)
+    if len(text) <= width:
+        return {"text": text, "highlights": spans}
+    center = spans[0][0] if spans else 0
+    start = max(0, min(center - width // 3, len(text) - width))
+    end = start + width
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    shift = len(prefix) - start
+    return {
+        "text": prefix + text[start:end] + suffix,
+        "highlights": [[s + shift, e + shift] for s, e in spans if s >= start and e <= end],
+    }
+
+# ==================== 프로세스 내 역색인 (PostgreSQL 전문 검색이 없을 때) ====================
+
+class ReviewSearchIndex:
+    """
+    단어 -> 리뷰 역색인 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - 검색어는 단어의 앞부분과 일치 ('맛집' -> '맛집이', '맛집을'), 여러 검색어는 모두 포함해야 함
+    - SUBSTRING_MIN_CHARS 이상인 검색어는 단어 중간과도 일치 (단어 목록의 글자 2-gram 색인으로 후보 단어를 찾음)
+    - 점수는 필드 가중치(장소명 3, 주소 2, 본문 1) x 출현 횟수의 합
+    - 포스팅은 내부 문서 번호(추가 순서, 오름차순) 배열로 보관, 수정/삭제된 문서 번호는 무효 처리 후
+      무효 문서가 많아지면 압축(compact)
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.loading = False
+        self.compactions = 0
+        self._pending: List[Tuple[int, Optional[tuple]]] = []
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._sorted_words: List[str] = []
+        self._word_grams: Dict[str, set] = {}  # 글자 2-gram -> 그 2-gram을 포함하는 단어들
+        self._doc_reviews = array("I")  # 문서 번호 -> 리뷰 id (0 이면 무효)
+        self._review_docs: Dict[int, int] = {}  # 리뷰 id -> 현재 문서 번호
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._review_docs)
+
+    # ---------- 적재 ----------
+
+    def begin_load(self):
+        """전체 적재 시작 (적재 중 들어온 변경은 적재 후 반영)"""
+        self._reset()
+        self.loading = True
+        self._pending = []
+
+    def finish_load(self):
+        self.loading = False
+        self.loaded = True
+        pending, self._pending = self._pending, []
+        for review_id, fields in pending:
+            if fields is None:
+                self._remove(review_id)
+            else:
+                self._add(review_id, *fields)
+        self._maybe_compact()
+
+    def abort_load(self):
+        """적재 실패 시 다음 검색에서 다시 적재하도록 초기화"""
+        self.loading = False
+        self._pending = []
+        self._reset()
+
+    def load_rows(self, rows):
+        """(id, place_name, place_address, review_text) 행을 적재 중에 추가"""
+        for review_id, place_name, place_address, review_text in rows:
+            self._add(review_id, place_name, place_address, review_text)
+
+    # ---------- 변경 반영 ----------
+
+    def upsert(self, review_id: int, place_name: Optional[str], place_address: Optional[str], review_text: Optional[str]):
+        """리뷰 추가/수정 반영 (적재 전에는 무시)"""
+        if self.loading:
+            self._pending.append((review_id, (place_name, place_address, review_text)))
+        elif self.loaded:
+            self._add(review_id, place_name, place_address, review_text)
+            self._maybe_compact()
+
+    def discard(self, review_id: int):
+        if self.loading:
+            self._pending.append((review_id, None))
+        elif self.loaded:
+            self._remove(review_id)
+            self._maybe_compact()
+
+    def _add(self, review_id: int, place_name, place_address, review_text):
+        self._remove(review_id)
+        weights: Dict[str, int] = {}
+        for (field, weight), value in zip(FIELD_WEIGHTS, (place_name, place_address, review_text)):
+            for word in words(value):
+                weights[word] = weights.get(word, 0) + weight
+        doc = len(self._doc_reviews)
+        self._doc_reviews.append(review_id)
+        self._review_docs[review_id] = doc
+        for word, weight in weights.items():
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = (array("I"), array("B"))
+                bisect.insort(self._sorted_words, word)
+                for gram in _grams(word):
+                    self._word_grams.setdefault(gram, set()).add(word)
+            posting[0].append(doc)
+            posting[1].append(min(weight, 255))
+
+    def _remove(self, review_id: int):
+        doc = self._review_docs.pop(review_id, None)
+        if doc is None:
+            return
+        self._doc_reviews[doc] = 0
+        self._dead += 1
+
+    # ---------- 압축 ----------
+
+    def _maybe_compact(self):
+        if self._dead >= _COMPACT_MIN_DEAD and self._dead >= len(self._doc_reviews) * _COMPACT_DEAD_RATIO:
+            self.compact()
+
+    def compact(self):
+        """
+        무효 문서를 포스팅에서 제거하고 문서 번호를 다시 매김 (순서 유지, 포스팅이 빈 단어는 삭제)
+        - 수정/삭제가 쌓여 포스팅과 문서 번호 배열이 계속 커지지 않도록
+        """
+        remap = array("i", [-1]) * len(self._doc_reviews)
+        doc_reviews = array("I")
+        for doc, review_id in enumerate(self._doc_reviews):
+            if review_id:
+                remap[doc] = len(doc_reviews)
+                doc_reviews.append(review_id)
+        for word in list(self._postings):
+            docs, weights = self._postings[word]
+            kept_docs, kept_weights = array("I"), array("B")
+            for doc, weight in zip(docs, weights):
+                new_doc = remap[doc]
+                if new_doc >= 0:
+                    kept_docs.append(new_doc)
+                    kept_weights.append(weight)
+            if kept_docs:
+                self._postings[word] = (kept_docs, kept_weights)
+                continue
+            del self._postings[word]
+            for gram in _grams(word):
+                owners = self._word_grams.get(gram)
+                if owners is not None:
+                    owners.discard(word)
+                    if not owners:
+                        del self._word_grams[gram]
+        self._sorted_words = sorted(self._postings)
+        self._doc_reviews = doc_reviews
+        self._review_docs = {review_id: doc for doc, review_id in enumerate(doc_reviews)}
+        self._dead = 0
+        self.compactions += 1
+
+    # ---------- 검색 ----------
+
+    def _matching_words(self, term: str) -> set:
+        """검색어로 시작하는 단어 + (SUBSTRING_MIN_CHARS 이상이면) 검색어를 중간에 포함하는 단어"""
+        matched = set()
+        start = bisect.bisect_left(self._sorted_words, term)
+        for word in self._sorted_words[start:]:
+            if not word.startswith(term):
+                break
+            matched.add(word)
+        if len(term) >= SUBSTRING_MIN_CHARS:
+            # 검색어의 모든 2-gram을 가진 단어 중 실제로 검색어를 포함하는 단어 (가장 작은 후보 집합부터)
+            candidates = sorted((self._word_grams.get(gram, set()) for gram in _grams(term)), key=len)
+            if candidates and candidates[0]:
+                for word in candidates[0]:
+                    if term in word:
+                        matched.add(word)
+        return matched
+
+    def _term_scores(self, term: str) -> Dict[int, int]:
+        """검색어와 일치하는 모든 단어의 포스팅을 합친 {문서 번호: 점수}"""
+        scores: Dict[int, int] = {}
+        for word in self._matching_words(term):
+            docs, weights = self._postings[word]
+            for doc, weight in zip(docs, weights):
+                scores[doc] = scores.get(doc, 0) + weight
+        return scores
+
+    def search(self, terms: List[str], limit: int, after: Optional[Tuple[float, int]] = None) -> List[Tuple[float, int]]:
+        """
+        검색어를 모두 포함하는 리뷰를 (점수, 리뷰 id) 역순으로 최대 limit개 반환
+        - after가 있으면 그 (점수, id) 다음부터 (키셋 페이지네이션)
+        """
+        if not terms:
+            return []
+        per_term = sorted((self._term_scores(term) for term in terms), key=len)
+        results = []
+        for doc, score in per_term[0].items():
+            review_id = self._doc_reviews[doc]
+            if not review_id:
+                continue
+            total = float(score)
+            for other in per_term[1:]:
+                extra = other.get(doc)
+                if extra is None:
+                    break
+                total += extra
+            else:
+                key = (total, review_id)
+                if after is None or key < after:
+                    results.append(key)
+        results.sort(reverse=True)
+        return results[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "reviews": len(self._review_docs),
+            "words": len(self._postings),
+            "grams": len(self._word_grams),
+            "dead_docs": self._dead,
+            "compactions": self.compactions,
+        }
+
+# 앱 전체에서 공유하는 역색인 (워커 프로세스 단위, 첫 검색 시 적재)
+review_index = ReviewSearchIndex()
@@ -1,6 +1,30 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, BeforeValidator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Annotated
+
+
+def parse_rating(value) -> Optional[int]:
+    """평점 입력('★★★☆☆', '3', 3)을 1~5 정수로 변환, 해석할 수 없으면 None"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        stars = value
+    else:
+        value = str(value).strip()
+        if "★" in value:
+            stars = value.count("★")
+        elif value.isdigit():
+            stars = int(value)
+        else:
+            return None
+    return stars if 1 <= stars <= 5 else None
+
+def _coerce_rating(value):
+    stars = parse_rating(value)
+    return value if stars is None else stars
+
+# 별점 1~5 (별 문자열 입력도 허용)
+Rating = Annotated[int, BeforeValidator(_coerce_rating), Field(ge=1, le=5)]
 
 
 # User 관련 스키마 (회원/로그인 등)
@@ -22,7 +46,7 @@ class UserResponse(UserBase):
 
     model_config = ConfigDict(from_attributes=True)
 
-# User 세션 정보 포함 응답 스키마
+# User 세션 정보 포함 응답 스키마 (현재 기기 세션)
 class UserWithSessionResponse(UserBase):
     id: int
     role: str
@@ -46,7 +70,7 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 
-# 세션 상태 확인 스키마 (users 테이블 기반)
+# 세션 상태 확인 스키마 (현재 토큰의 세션 기준)
 class SessionStatusResponse(BaseModel):
     user_id: int
     username: str
@@ -54,6 +78,7 @@ class SessionStatusResponse(BaseModel):
     http_only_enabled: bool
     secure_enabled: bool
     session_active: bool
+    active_sessions: int = 0  # 사용자의 활성 세션(기기) 수
     last_login_at: Optional[datetime] = None
     session_expires_at: Optional[datetime] = None
     created_at: datetime
@@ -94,42 +119,87 @@ class ReviewCreate(BaseModel):
     place_name: str
     place_address: Optional[str] = None
     review_date: datetime 
-    rating: str
+    rating: Rating
     companion: Optional[str] = None
     review_text: str 
-    image_paths: Optional[str] = None 
+
+# 리뷰 대량 가져오기 행 (작성자/장소 id 지정, created_at이 없으면 가져온 시각)
+class ReviewImportRow(ReviewCreate):
+    user_id: int
+    place_id: Optional[int] = None
+    created_at: Optional[datetime] = None
 
 class ReviewUpdate(BaseModel):
     place_name: Optional[str] = None
     place_address: Optional[str] = None
     review_date: Optional[datetime] = None  
-    rating: Optional[str] = None
+    rating: Optional[Rating] = None
     companion: Optional[str] = None
     review_text: Optional[str] = None 
-    image_paths: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# 리뷰 이미지 응답 스키마 (크기/변형은 후처리 완료 후 채워짐)
+class ReviewImageResponse(BaseModel):
+    id: int
+    position: int
+    path: str
+    digest: str
+    bytes: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[dict] = []
 
     model_config = ConfigDict(from_attributes=True)
 
 class ReviewResponse(BaseModel):
     id: int
     user_id: int
+    place_id: Optional[int] = None
     place_name: str
     place_address: Optional[str] = None
     review_date: datetime  
-    rating: str
+    rating: int
     companion: Optional[str] = None
     review_text: str  
-    image_paths: Optional[str] = None
+    images: List[ReviewImageResponse] = []
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
+# 장소 응답 스키마 (리뷰 집계 포함)
+class PlaceResponse(BaseModel):
+    id: int
+    provider: str
+    provider_place_id: str
+    name: str
+    address: Optional[str] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    review_count: int
+    rating_histogram: dict  # {"1": 리뷰 수, ..., "5": 리뷰 수}
+    average_rating: Optional[float] = None
+    last_review_at: Optional[datetime] = None
+
+
+# 사용자 리뷰 집계 응답 스키마
+class UserStatsResponse(BaseModel):
+    review_count: int
+    rating_histogram: dict  # {"1": 리뷰 수, ..., "5": 리뷰 수}
+    average_rating: Optional[float] = None
+    last_review_at: Optional[datetime] = None
+
+
+# 주변 장소 응답 스키마 (중심 또는 경계 상자 중심에서의 거리 포함)
+class NearbyPlaceResponse(PlaceResponse):
+    distance_m: float
+
 # 리뷰 생성 응답 스키마
 class ReviewCreateResponse(BaseModel):
     message: str
     review_id: int  # str에서 int로 수정
     place_name: str
-    rating: str
+    rating: int
     image_count: int
     status: str
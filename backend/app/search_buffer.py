@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from . import crud, database
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# 중복 방지 키 (user_id, is_place, coalesce(name, query)) - uq_search_history_user_key와 동일
+DedupKey = Tuple[int, bool, str]
+
+@dataclass
+class PendingSearch:
+    """아직 DB에 기록되지 않은 검색 기록 (조회 응답에서 SearchHistory 행과 같은 속성으로 사용)"""
+    user_id: int
+    query: str
+    is_place: bool
+    name: Optional[str]
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    id: Optional[int] = None  # DB에 기록되기 전에는 id 없음
+    attempts: int = 0  # 일괄 저장 실패 횟수
+
+    @property
+    def key(self) -> DedupKey:
+        return dedup_key(self.user_id, self.is_place, self.name, self.query)
+
+def dedup_key(user_id: int, is_place: bool, name: Optional[str], query: str) -> DedupKey:
+    return (user_id, is_place, name if name is not None else query)
+
+# ==================== 쓰기 지연 버퍼 ====================
+
+class SearchHistoryBuffer:
+    """
+    검색 기록 쓰기 지연(write-behind) 버퍼 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - 같은 키의 검색은 버퍼 안에서 최신 것 하나로 합침
+    - 개수(SEARCH_HISTORY_FLUSH_SIZE) 또는 시간(SEARCH_HISTORY_FLUSH_INTERVAL) 기준으로 다중 행 upsert 한 번에 기록
+    - 앱 종료 시 남은 기록을 모두 기록, 프로세스가 비정상 종료되면 버퍼 내용은 유실됨
+    - 버퍼 크기(max_size)와 기록별 재시도 횟수(max_retries)에 상한이 있음 (DB 장애나 문제 행이 버퍼를 막지 않도록)
+    """
+
+    def __init__(self, flush_size: int, flush_interval: float, max_size: int, max_retries: int):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.max_retries = max_retries
+        self.dropped = 0
+        self._pending: Dict[DedupKey, PendingSearch] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 flush 작업 종료 후 남은 기록 기록"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def add(self, user_id: int, query: str, is_place: bool, name: Optional[str]) -> PendingSearch:
+        record = PendingSearch(user_id=user_id, query=query, is_place=is_place, name=name if is_place else None)
+        # 기존 항목을 지우고 다시 넣어 삽입 순서(=최신순)를 유지
+        self._pending.pop(record.key, None)
+        self._pending[record.key] = record
+        self._enforce_max_size()
+        if len(self._pending) >= self.flush_size:
+            self._wakeup.set()
+        return record
+
+    def pending_for(self, user_id: int) -> List[PendingSearch]:
+        """사용자의 미기록 검색 기록 (최신순)"""
+        return [record for record in reversed(self._pending.values()) if record.user_id == user_id]
+
+    def discard_user(self, user_id: int):
+        """사용자의 미기록 검색 기록 폐기 (전체 삭제 요청 시)"""
+        for key in [key for key, record in self._pending.items() if record.user_id == user_id]:
+            del self._pending[key]
+
+    def discard(self, user_id: int, is_place: bool, name: Optional[str], query: str):
+        self._pending.pop(dedup_key(user_id, is_place, name, query), None)
+
+    async def flush(self, user_id: Optional[int] = None) -> int:
+        """
+        버퍼 내용(user_id를 주면 그 사용자의 기록만)을 다중 행 upsert 한 번으로 기록, 기록한 행 수 반환
+        - 실패한 기록은 최대 max_retries번까지 다음 주기에 다시 시도
+        - 재시도 횟수를 다 쓴 기록은 한 건씩 따로 기록해 문제 행만 버림 (나머지 행까지 계속 실패하지 않도록)
+        """
+        async with self._flush_lock:
+            if self.dropped:
+                logger.warning("검색 기록 버퍼가 가득 차 오래된 기록 %d건을 버림", self.dropped)
+                self.dropped = 0
+            if user_id is None:
+                batch, self._pending = self._pending, {}
+            else:
+                batch = {key: record for key, record in self._pending.items() if record.user_id == user_id}
+                for key in batch:
+                    del self._pending[key]
+            if not batch:
+                return 0
+            records = list(batch.values())
+            try:
+                await self._write(records)
+                return len(records)
+            except Exception:
+                logger.exception("검색 기록 일괄 저장 실패 (%d건)", len(records))
+
+            retry, exhausted = {}, []
+            for record in records:
+                record.attempts += 1
+                if record.attempts < self.max_retries:
+                    retry[record.key] = record
+                else:
+                    exhausted.append(record)
+            # flush 도중 들어온 같은 키의 더 최신 기록을 덮어쓰지 않도록 병합
+            retry.update(self._pending)
+            self._pending = retry
+            self._enforce_max_size()
+            return await self._write_each(exhausted)
+
+    async def _write(self, records: List[PendingSearch]):
+        async with database.session_scope() as db:
+            await crud.upsert_search_history_batch_async(db, records)
+
+    async def _write_each(self, records: List[PendingSearch]) -> int:
+        """재시도 횟수를 다 쓴 기록을 한 건씩 기록, 그래도 실패하면 로그를 남기고 버림"""
+        written = 0
+        for record in records:
+            try:
+                await self._write([record])
+                written += 1
+            except Exception as e:
+                logger.error(
+                    "검색 기록 저장 포기 (user_id=%s, is_place=%s, %d번 실패): %s",
+                    record.user_id, record.is_place, record.attempts + 1, e,
+                )
+        return written
+
+    def _enforce_max_size(self):
+        """버퍼 최대 크기를 넘으면 가장 오래된 기록부터 버림 (DB 장애가 길어져도 메모리가 무한히 늘지 않도록)"""
+        while len(self._pending) > self.max_size:
+            del self._pending[next(iter(self._pending))]
+            self.dropped += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+search_history_buffer = SearchHistoryBuffer(
+    flush_size=settings.SEARCH_HISTORY_FLUSH_SIZE,
+    flush_interval=settings.SEARCH_HISTORY_FLUSH_INTERVAL,
+    max_size=settings.SEARCH_HISTORY_BUFFER_MAX_SIZE,
+    max_retries=settings.SEARCH_HISTORY_FLUSH_MAX_RETRIES,
+)
@@ -0,0 +1,173 @@
+import abc
+import hashlib
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from . import crud, models
+from .config import settings
+
+# 만료 세션 정리 잠금 키 (PostgreSQL advisory lock, 워커/인스턴스 간 동시 정리 방지)
+SWEEP_LOCK_KEY = 0x5E5510
+
+def token_digest(token: str) -> str:
+    """세션 조회 키 (토큰 원문은 저장하지 않음, 인증 캐시 키와 같은 SHA-256)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class SessionStore(abc.ABC):
+    """
+    로그인 세션 저장소 인터페이스 (사용자당 기기별 여러 세션)
+    - 시각은 모두 UTC naive datetime, 만료된 세션은 조회되지 않음
+    - get_with_user는 (세션, 사용자) 또는 None (인증 캐시 미스 시 한 번의 조회로 세션과 사용자 확인)
+    - 변경 메서드는 커밋하지 않음 (SQL 저장소는 호출자가 커밋, 메모리 저장소는 즉시 반영)
+    - create는 (세션, 기기 수 제한으로 밀려난 세션의 토큰 다이게스트 목록) 반환
+    - 삭제 계열 메서드는 지운 세션의 토큰 다이게스트 목록 반환 (인증 캐시 무효화용)
+    - sweep_expired는 만료 세션 정리 작업(session_sweeper)의 배치 하나 - before 이전에 만료된 세션을
+      (expires_at, id) 순서로 after 다음부터 limit개 삭제하고 (다이게스트 목록, 마지막 키) 반환,
+      다른 워커가 정리 중이면 None
+    """
+
+    @abc.abstractmethod
+    async def create(self, db, user_id: int, token: str, expires_at: datetime, user_agent: Optional[str] = None,
+                     is_http_only: bool = True, is_secure: bool = True):
+        ...
+
+    @abc.abstractmethod
+    async def get(self, db, token: str):
+        ...
+
+    @abc.abstractmethod
+    async def get_with_user(self, db, token: str):
+        ...
+
+    @abc.abstractmethod
+    async def count_active(self, db, user_id: int) -> int:
+        ...
+
+    @abc.abstractmethod
+    async def revoke(self, db, token: str) -> List[str]:
+        ...
+
+    @abc.abstractmethod
+    async def revoke_user(self, db, user_id: int) -> List[str]:
+        ...
+
+    @abc.abstractmethod
+    async def sweep_expired(self, db, before: datetime, after: Optional[Tuple[datetime, int]], limit: int):
+        ...
+
+class SQLSessionStore(SessionStore):
+    """user_sessions 테이블 (토큰 다이게스트 유니크 인덱스로 조회)"""
+
+    async def create(self, db, user_id, token, expires_at, user_agent=None, is_http_only=True, is_secure=True):
+        session = await crud.create_user_session_async(
+            db, user_id, token_digest(token), expires_at, user_agent, is_http_only, is_secure
+        )
+        evicted = await crud.trim_user_sessions_async(db, user_id, settings.SESSION_MAX_PER_USER)
+        return session, evicted
+
+    async def get(self, db, token):
+        return await crud.get_active_user_session_async(db, token_digest(token), datetime.utcnow())
+
+    async def get_with_user(self, db, token):
+        return await crud.get_active_user_session_with_user_async(db, token_digest(token), datetime.utcnow())
+
+    async def count_active(self, db, user_id):
+        return await crud.count_active_user_sessions_async(db, user_id, datetime.utcnow())
+
+    async def revoke(self, db, token):
+        return await crud.delete_user_sessions_async(db, token_digest=token_digest(token))
+
+    async def revoke_user(self, db, user_id):
+        return await crud.delete_user_sessions_async(db, user_id=user_id)
+
+    async def sweep_expired(self, db, before, after, limit):
+        # 배치 트랜잭션 동안만 잠금 (커밋하면 해제, 배치 사이에 다른 워커가 끼어들어도 삭제는 멱등)
+        if not await crud.try_advisory_xact_lock_async(db, SWEEP_LOCK_KEY):
+            return None
+        return await crud.delete_expired_user_sessions_batch_async(db, before, after, limit)
+
+@dataclass
+class SessionRecord:
+    """메모리 저장소의 세션 (UserSession 행과 같은 속성)"""
+    id: int
+    user_id: int
+    token_digest: str
+    expires_at: datetime
+    user_agent: Optional[str] = None
+    is_http_only: bool = True
+    is_secure: bool = True
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 세션 저장소 (테스트/단일 워커 개발용, 재시작하면 모든 세션이 사라짐)"""
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionRecord] = {}
+        self._ids = itertools.count(1)
+
+    def _active(self, session: Optional[SessionRecord]) -> Optional[SessionRecord]:
+        return session if session is not None and session.expires_at > datetime.utcnow() else None
+
+    async def create(self, db, user_id, token, expires_at, user_agent=None, is_http_only=True, is_secure=True):
+        session = SessionRecord(
+            next(self._ids), user_id, token_digest(token), expires_at,
+            user_agent[:255] if user_agent else None, is_http_only, is_secure,
+        )
+        self._sessions[session.token_digest] = session
+        evicted = []
+        limit = settings.SESSION_MAX_PER_USER
+        if limit > 0:
+            mine = sorted(
+                (s for s in self._sessions.values() if s.user_id == user_id),
+                key=lambda s: (s.created_at, s.id), reverse=True,
+            )
+            for stale in mine[limit:]:
+                evicted.append(self._sessions.pop(stale.token_digest).token_digest)
+        return session, evicted
+
+    async def get(self, db, token):
+        return self._active(self._sessions.get(token_digest(token)))
+
+    async def get_with_user(self, db, token):
+        session = await self.get(db, token)
+        if session is None:
+            return None
+        user = await db.get(models.User, session.user_id)
+        return (session, user) if user is not None else None
+
+    async def count_active(self, db, user_id):
+        return sum(1 for s in self._sessions.values() if s.user_id == user_id and self._active(s))
+
+    async def revoke(self, db, token):
+        session = self._sessions.pop(token_digest(token), None)
+        return [session.token_digest] if session else []
+
+    async def revoke_user(self, db, user_id):
+        digests = [key for key, s in self._sessions.items() if s.user_id == user_id]
+        for key in digests:
+            del self._sessions[key]
+        return digests
+
+    async def sweep_expired(self, db, before, after, limit):
+        expired = sorted(
+            (s for s in self._sessions.values()
+             if s.expires_at < before and (after is None or (s.expires_at, s.id) > after)),
+            key=lambda s: (s.expires_at, s.id),
+        )[:limit]
+        for session in expired:
+            del self._sessions[session.token_digest]
+        if not expired:
+            return [], None
+        return [s.token_digest for s in expired], (expired[-1].expires_at, expired[-1].id)
+
+def _create_store() -> SessionStore:
+    backend = settings.SESSION_STORE_BACKEND
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sql":
+        return SQLSessionStore()
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {backend}")
+
+# 앱 전체에서 공유하는 세션 저장소 (SESSION_STORE_BACKEND로 선택)
+session_store = _create_store()
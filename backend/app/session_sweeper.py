@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+from . import auth, database
+from .config import settings
+from .session_store import session_store
+
+logger = logging.getLogger(__name__)
+
+class SessionSweeper:
+    """
+    만료 세션 정리 작업 (워커 프로세스 단위, 이벤트 루프에서만 사용)
+    - interval초마다 만료 시각 순 키셋으로 batch_size개씩 삭제, 배치마다 커밋
+      (한 번에 지우는 UPDATE/DELETE처럼 긴 행 잠금과 큰 트랜잭션을 만들지 않음)
+    - 배치 사이에 batch_pause초 쉼 (다른 쿼리와 autovacuum에 양보)
+    - 배치마다 advisory lock을 시도해 다른 워커가 정리 중이면 이번 주기는 건너뜀
+    """
+
+    def __init__(self, interval: float, batch_size: int, batch_pause: float):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._sweep_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.skipped_locked = 0
+        self.errors = 0
+        self.batches = 0
+        self.deleted = 0
+        self.in_progress = False
+        self.last_started_at: Optional[datetime] = None
+        self.last_deleted = 0
+        self.last_duration_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 작업 종료 (진행 중인 배치는 롤백되어 다음 실행 때 다시 정리)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sweep(self) -> int:
+        """지금 시각 이전에 만료된 세션을 배치 단위로 모두 정리, 이번 실행에서 삭제한 세션 수 반환"""
+        async with self._sweep_lock:
+            self.in_progress = True
+            self.last_started_at = datetime.utcnow()
+            self.last_deleted = 0
+            started = time.perf_counter()
+            before, after = self.last_started_at, None
+            try:
+                while True:
+                    async with database.session_scope() as db:
+                        swept = await session_store.sweep_expired(db, before, after, self.batch_size)
+                        if swept is None:
+                            self.skipped_locked += 1
+                            break
+                        digests, after = swept
+                        await db.commit()
+                    if not digests:
+                        break
+                    # 캐시 항목은 세션 만료 시각에 이미 만료되므로 메모리 정리 목적
+                    auth.principal_cache.invalidate_digests(digests)
+                    self.batches += 1
+                    self.deleted += len(digests)
+                    self.last_deleted += len(digests)
+                    if len(digests) < self.batch_size:
+                        break
+                    await asyncio.sleep(self.batch_pause)
+            finally:
+                self.runs += 1
+                self.in_progress = False
+                self.last_duration_seconds = time.perf_counter() - started
+            if self.last_deleted:
+                logger.info("만료 세션 %d개 정리 (%.2f초)", self.last_deleted, self.last_duration_seconds)
+            return self.last_deleted
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception:
+                self.errors += 1
+                logger.exception("만료 세션 정리 실패, 다음 주기에 재시도")
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "in_progress": self.in_progress,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "batch_pause_seconds": self.batch_pause,
+            "runs": self.runs,
+            "skipped_locked": self.skipped_locked,
+            "errors": self.errors,
+            "batches": self.batches,
+            "deleted": self.deleted,
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_deleted": self.last_deleted,
+            "last_duration_seconds": round(self.last_duration_seconds, 6),
+        }
+
+# 앱 전체에서 공유하는 만료 세션 정리 작업 (워커 프로세스 단위)
+session_sweeper = SessionSweeper(
+    interval=settings.SESSION_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.SESSION_SWEEP_BATCH_SIZE,
+    batch_pause=settings.SESSION_SWEEP_BATCH_PAUSE_SECONDS,
+)
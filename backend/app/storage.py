@@ -0,0 +1,275 @@
+import asyncio
+import glob
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from fastapi import HTTPException, UploadFile, status
+from starlette.responses import JSONResponse
+from .config import settings
+from . import image_processing
+
+logger = logging.getLogger(__name__)
+
+# ==================== 예외 정의 ====================
+
+class UploadTooLargeError(Exception):
+    """파일 또는 요청 전체 크기 제한 초과 (이미지 픽셀 수 한도 초과 포함)"""
+
+
+# ==================== 저장 결과 ====================
+
+@dataclass
+class StoredUpload:
+    """
+    콘텐츠 주소 기반 업로드 (digest는 저장되는 바이트 - 메타데이터 제거 후 - 의 SHA-256)
+    - save_uploads 직후에는 임시 파일(tmp_path)에만 있음, 리뷰 저장 트랜잭션에서 blob 잠금을 잡고 publish
+    """
+    path: str
+    digest: str
+    bytes: int
+    created: bool = False  # publish 시 새로 저장했는지 (False면 기존 blob 재사용)
+    tmp_path: Optional[str] = None  # 아직 공개되지 않은 임시 파일
+
+
+# ==================== 요청 단위 용량 관리 ====================
+
+class UploadBudget:
+    """요청 하나에서 동시에 저장 중인 파일들이 공유하는 바이트 한도 (스레드 안전)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._lock = threading.Lock()
+
+    def consume(self, n: int):
+        with self._lock:
+            self.used_bytes += n
+            if self.used_bytes > self.max_bytes:
+                raise UploadTooLargeError(
+                    f"요청 전체 업로드 크기가 {self.max_bytes}바이트를 초과했습니다"
+                )
+
+
+# ==================== 요청 본문 크기 제한 (ASGI 미들웨어) ====================
+
+def request_body_limit() -> int:
+    """multipart 요청 본문 한도 (파일 전체 한도 + 폼 필드/경계 문자열 여유분)"""
+    return settings.UPLOAD_MAX_REQUEST_BYTES + settings.UPLOAD_FORM_OVERHEAD_BYTES
+
+class UploadSizeLimitMiddleware:
+    """
+    multipart/form-data 요청 본문을 Starlette가 임시 파일로 받아 두기 전에 크기 제한
+    - Content-Length가 한도를 넘으면 본문을 읽지 않고 바로 413
+    - 길이를 알 수 없거나(chunked) 거짓인 경우 receive를 감싸 한도를 넘는 순간 읽기를 멈추고 413
+    - 다른 형식(관리자 대량 가져오기 스트림 등)은 그대로 통과
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        content_type = b""
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value
+            elif name == b"content-length":
+                content_length = value
+        if not content_type.lower().startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        limit = request_body_limit()
+        detail = f"요청 전체 업로드 크기가 {settings.UPLOAD_MAX_REQUEST_BYTES}바이트를 초과했습니다"
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # 본문 파싱 중 발생한 HTTPException은 FastAPI가 그대로 전달해 413 응답이 됨
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+# ==================== 경로 규칙 ====================
+
+def blob_path(digest: str, extension: str) -> str:
+    """
+    digest 앞 두 글자로 디렉터리를 나눈 불변 경로 (예: uploads/ab/abcd...jpg)
+    - blob은 digest로만 식별, 같은 digest가 이미 있으면 media_blobs에 기록된 처음 경로를 그대로 사용
+    """
+    return f"{settings.UPLOAD_DIR}/{digest[:2]}/{digest}{extension.lower()}"
+
+def digest_from_path(path: str) -> str:
+    """blob 경로에서 digest 추출"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def _normalize_extension(filename: str) -> str:
+    extension = os.path.splitext(filename)[1].lower()
+    return ".jpg" if extension == ".jpeg" else extension
+
+
+# ==================== 파일 저장 ====================
+
+def _is_valid_upload(image: UploadFile) -> bool:
+    """빈 파일 필드(파일명 없음/크기 0)는 건너뜀"""
+    return bool(image.filename and image.filename.strip()) and image.size != 0
+
+def _copy_to_disk(source, extension: str, budget: UploadBudget) -> StoredUpload:
+    """
+    업로드 파일을 청크 단위로 임시 파일에 복사하면서 해시 계산 (스레드풀에서 실행)
+    - 공개(publish)는 리뷰 저장 트랜잭션에서 blob 잠금을 잡은 뒤 수행
+    - 파일/요청 크기 제한 초과 시 임시 파일 삭제 후 예외
+    """
+    incoming_dir = f"{settings.UPLOAD_DIR}/.incoming"
+    os.makedirs(incoming_dir, exist_ok=True)
+    tmp_path = f"{incoming_dir}/{uuid.uuid4()}{extension}"
+    hasher = hashlib.sha256()
+    written = 0
+    try:
+        with open(tmp_path, "wb") as buffer:
+            while True:
+                chunk = source.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > settings.UPLOAD_MAX_FILE_BYTES:
+                    raise UploadTooLargeError(
+                        f"파일 하나의 크기가 {settings.UPLOAD_MAX_FILE_BYTES}바이트를 초과했습니다"
+                    )
+                budget.consume(len(chunk))
+                hasher.update(chunk)
+                buffer.write(chunk)
+
+        digest = hasher.hexdigest()
+        return StoredUpload(blob_path(digest, extension), digest, written, tmp_path=tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+async def _save_one(image: UploadFile, budget: UploadBudget, semaphore: asyncio.Semaphore) -> StoredUpload:
+    extension = _normalize_extension(image.filename)
+    async with semaphore:
+        await image.seek(0)
+        stored = await asyncio.to_thread(_copy_to_disk, image.file, extension, budget)
+    return await _prepare(stored, extension)
+
+async def _prepare(stored: StoredUpload, extension: str) -> StoredUpload:
+    """임시 파일의 메타데이터 제거 후 digest/blob 경로 확정 (실패하면 임시 파일 삭제)"""
+    # EXIF 제거는 이미지 프로세스 풀에서 (API 워커에서 디코딩/재인코딩하지 않음), digest는 저장될 바이트 기준
+    try:
+        prepared = await image_processing.prepare_upload_async(stored.tmp_path)
+    except BaseException as e:
+        discard_unpublished([stored])
+        if isinstance(e, image_processing.ImageTooLargeError):
+            raise UploadTooLargeError(str(e)) from None
+        raise
+    if prepared is not None:
+        stored.digest, stored.bytes = prepared["digest"], prepared["bytes"]
+        stored.path = blob_path(stored.digest, prepared["extension"] or extension)
+    return stored
+
+async def stage_existing_file(path: str) -> StoredUpload:
+    """
+    디스크에 있는 파일을 업로드와 같은 방식으로 임시 파일에 복사해 준비 (메타데이터 제거, digest 계산)
+    - 콘텐츠 주소 이전 이미지 백필용 (app.image_backfill), 공개는 업로드와 같이 acquire_media_blobs_async에서
+    """
+    extension = _normalize_extension(path)
+
+    def copy() -> StoredUpload:
+        with open(path, "rb") as source:
+            return _copy_to_disk(source, extension, UploadBudget(settings.UPLOAD_MAX_FILE_BYTES))
+
+    stored = await asyncio.to_thread(copy)
+    return await _prepare(stored, extension)
+
+def publish_uploads(uploads: List[StoredUpload], paths: Dict[str, str]):
+    """
+    임시 파일을 digest별 blob 경로(media_blobs에 기록된 경로)로 공개 (스레드풀에서 실행)
+    - 호출자가 이 digest들의 blob 잠금을 잡은 상태여야 함 (고아 정리와 겹치지 않도록)
+    - 파일이 이미 있으면 임시 파일만 삭제 (중복 제거), 없으면 fsync 후 rename (원자적 공개)
+    """
+    for upload in uploads:
+        if upload.tmp_path is None:
+            continue
+        upload.path = paths.get(upload.digest, upload.path)
+        if os.path.exists(upload.path):
+            os.remove(upload.tmp_path)
+            upload.created = False
+        else:
+            with open(upload.tmp_path, "rb+") as published:
+                os.fsync(published.fileno())
+            os.makedirs(os.path.dirname(upload.path), exist_ok=True)
+            os.replace(upload.tmp_path, upload.path)
+            upload.created = True
+        upload.tmp_path = None
+        logger.info(f"이미지 저장됨: {upload.path}{'' if upload.created else ' (기존 파일 재사용)'}")
+
+def remove_files(paths: List[str]):
+    """저장된 파일 정리 (리뷰 저장 실패 시 롤백용)"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def discard_unpublished(uploads: List[StoredUpload]):
+    """
+    공개되지 않은 임시 파일 정리 (리뷰 저장 실패 시)
+    - 이미 공개된 blob은 지우지 않음 (그사이 다른 요청이 재사용했을 수 있음, 참조가 없으면 고아 정리에서 삭제)
+    """
+    remove_files([upload.tmp_path for upload in uploads if upload.tmp_path])
+
+def remove_blob_files(path: str):
+    """참조가 없어진 blob과 파생 변형(썸네일/WebP) 파일 삭제"""
+    base, _ = os.path.splitext(path)
+    remove_files([path] + glob.glob(f"{glob.escape(base)}_*") + glob.glob(f"{glob.escape(base)}.*"))
+
+async def save_uploads(images: List[UploadFile]) -> List[StoredUpload]:
+    """
+    업로드 이미지를 동시에 디스크로 스트리밍 저장하고 결과 목록 반환 (입력 순서 유지)
+    - 크기를 미리 알 수 있으면 복사 전에 제한 검사
+    - 하나라도 실패하면 새로 저장된 파일을 삭제하고 예외 전달
+    """
+    valid_images = [image for image in images if _is_valid_upload(image)]
+    if not valid_images:
+        return []
+
+    declared_sizes = [image.size for image in valid_images if image.size is not None]
+    if any(size > settings.UPLOAD_MAX_FILE_BYTES for size in declared_sizes):
+        raise UploadTooLargeError(
+            f"파일 하나의 크기가 {settings.UPLOAD_MAX_FILE_BYTES}바이트를 초과했습니다"
+        )
+    if sum(declared_sizes) > settings.UPLOAD_MAX_REQUEST_BYTES:
+        raise UploadTooLargeError(
+            f"요청 전체 업로드 크기가 {settings.UPLOAD_MAX_REQUEST_BYTES}바이트를 초과했습니다"
+        )
+
+    budget = UploadBudget(settings.UPLOAD_MAX_REQUEST_BYTES)
+    semaphore = asyncio.Semaphore(settings.UPLOAD_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_save_one(image, budget, semaphore) for image in valid_images),
+        return_exceptions=True,
+    )
+
+    saved = [r for r in results if isinstance(r, StoredUpload)]
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        discard_unpublished(saved)
+        raise errors[0]
+    return saved
@@ -0,0 +1,163 @@
+"""
+JSON 응답 직렬화 벤치마크
+
+리뷰 목록(/my-reviews) 한 페이지와 같은 모양의 응답(리뷰마다 이미지 3장, 변형 6개)을 만들어
+응답 본문을 만드는 방식별 시간을 비교하고, 대량 내보내기처럼 큰 결과를 한 번에 직렬화할 때와
+묶음 단위 NDJSON 스트리밍(responses.iter_ndjson)의 최대 메모리 사용량을 비교해 출력합니다.
+
+    기존          isoformat 문자열 dict 목록 → jsonable_encoder → JSONResponse(표준 json)
+    기본 경로      datetime dict 목록 → jsonable_encoder → FastJSONResponse (엔드포인트가 dict 반환 시)
+    직접 응답      datetime dict 목록 → FastJSONResponse 직접 반환 (목록 엔드포인트)
+    표준 json     직접 응답과 같지만 orjson이 없을 때의 대체 경로
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.json_encoders --page 100 --export-rows 50000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app import responses
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+def make_review(review_id: int) -> SimpleNamespace:
+    created_at = BASE_TIME + timedelta(minutes=review_id, microseconds=review_id)
+    images = [
+        SimpleNamespace(
+            id=review_id * 10 + position,
+            position=position,
+            path=f"uploads/ab/cd/{review_id:08x}{position:02d}.jpg",
+            digest=f"{review_id:060x}{position:04x}",
+            bytes=1_500_000 + position,
+            width=4032,
+            height=3024,
+            variants=[
+                {"size": size, "format": fmt, "path": f"uploads/ab/cd/{review_id:08x}_{size}.{fmt}", "width": size, "height": size * 3 // 4}
+                for size in (160, 480, 1080)
+                for fmt in ("jpeg", "webp")
+            ],
+        )
+        for position in range(3)
+    ]
+    return SimpleNamespace(
+        id=review_id,
+        user_id=review_id % 500,
+        place_id=review_id % 2000,
+        place_name=f"강남 파스타 {review_id % 2000}호점",
+        place_address=f"서울 강남구 테헤란로 {review_id % 300}길",
+        review_date=created_at - timedelta(days=1),
+        rating=review_id % 5 + 1,
+        companion="친구",
+        review_text="분위기 좋고 파스타가 맛있어요. 주차는 조금 불편하지만 재방문 의사 있습니다. " * 3,
+        images=images,
+        created_at=created_at,
+    )
+
+def format_image(image) -> dict:
+    return {
+        "id": image.id,
+        "position": image.position,
+        "path": image.path,
+        "digest": image.digest,
+        "bytes": image.bytes,
+        "width": image.width,
+        "height": image.height,
+        "variants": image.variants or [],
+    }
+
+def format_review(review, iso: bool) -> dict:
+    """main._format_review와 같은 모양 (iso=True 이면 이전처럼 날짜를 isoformat 문자열로)"""
+    return {
+        "id": review.id,
+        "user_id": review.user_id,
+        "place_id": review.place_id,
+        "place_name": review.place_name,
+        "place_address": review.place_address,
+        "review_date": review.review_date.isoformat() if iso else review.review_date,
+        "rating": review.rating,
+        "companion": review.companion,
+        "review_text": review.review_text,
+        "images": [format_image(image) for image in review.images],
+        "created_at": review.created_at.isoformat() if iso else review.created_at,
+    }
+
+def stdlib_response(reviews) -> bytes:
+    content = [format_review(review, False) for review in reviews]
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=responses._default).encode("utf-8")
+
+ENCODERS = (
+    ("기존", lambda reviews: JSONResponse(jsonable_encoder([format_review(r, True) for r in reviews])).body),
+    ("기본 경로", lambda reviews: responses.FastJSONResponse(jsonable_encoder([format_review(r, False) for r in reviews])).body),
+    ("직접 응답", lambda reviews: responses.FastJSONResponse([format_review(r, False) for r in reviews]).body),
+    ("표준 json", stdlib_response),
+)
+
+def measure(func, reviews, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(reviews)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), body
+
+def peak_memory(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+async def _partitions(total: int, size: int):
+    """서버 측 커서처럼 size개씩 행을 만들어 넘김 (이전 묶음은 참조하지 않음)"""
+    for start in range(1, total + 1, size):
+        yield [make_review(i) for i in range(start, min(start + size, total + 1))]
+
+def export_whole(total: int):
+    rows = [make_review(i) for i in range(1, total + 1)]
+    body = b"".join(responses.dumps(format_review(row, False)) + b"\n" for row in rows)
+    return len(body)
+
+def export_streaming(total: int, size: int):
+    async def consume():
+        sent = 0
+        async for chunk in responses.iter_ndjson(_partitions(total, size), lambda row: format_review(row, False)):
+            sent += len(chunk)
+        return sent
+    return asyncio.run(consume())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=100, help="목록 한 페이지의 리뷰 수")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--export-rows", type=int, default=50000)
+    parser.add_argument("--yield-per", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"orjson: {'사용' if responses.orjson is not None else '없음 (표준 json 대체 경로)'}")
+    reviews = [make_review(i) for i in range(1, args.page + 1)]
+    print(f"리뷰 {args.page}개 페이지 응답 본문 생성 (중앙값)")
+    baseline = None
+    for name, func in ENCODERS:
+        median, body = measure(func, reviews, args.repeat)
+        baseline = baseline or median
+        print(f"{name:<8} {median:8.3f} ms  x{baseline / median:5.2f}  {len(body) / 1024:7.1f} KiB")
+
+    print(f"리뷰 {args.export_rows}개 NDJSON 내보내기 최대 메모리")
+    for name, func in (
+        ("전체 목록", lambda: export_whole(args.export_rows)),
+        (f"스트리밍({args.yield_per})", lambda: export_streaming(args.export_rows, args.yield_per)),
+    ):
+        start = time.perf_counter()
+        peak = peak_memory(func)
+        print(f"{name:<14} {peak:8.1f} MiB  {time.perf_counter() - start:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+로그인 폭주 벤치마크 (비밀번호 해싱 실행기)
+
+해싱 실행 방식(PASSWORD_HASH_BACKEND)별로 uvicorn 서버를 띄우고, 여러 클라이언트가 /token을 계속 호출하는
+동안 가벼운 엔드포인트(/users/me)를 일정 간격으로 호출해 두 쪽의 p50/p99 응답 시간과 503 거절 수를 출력합니다.
+DB는 임시 SQLite 파일을 사용합니다 (USE_ASYNC_DB=false로 동기 DB 백엔드의 스레드풀 경합도 확인 가능).
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.login_flood --clients 64 --seconds 10 --backends thread,process
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+EMAIL, PASSWORD = "flood@example.com", "pw123456"
+# 벤치마크 서버의 내부 통계 엔드포인트 토큰 (INTERNAL_API_TOKEN)
+INTERNAL_TOKEN = "login-flood-benchmark"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+async def wait_ready(client: httpx.AsyncClient):
+    for _ in range(100):
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+async def run_flood(base_url: str, clients: int, seconds: float, probe_interval: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        await wait_ready(client)
+        await client.post("/register", json={"email": EMAIL, "username": "flood", "password": PASSWORD})
+        token = (await client.post("/token", data={"username": EMAIL, "password": PASSWORD})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        deadline = time.perf_counter() + seconds
+        login_times, probe_times, statuses = [], [], {}
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/token", data={"username": EMAIL, "password": PASSWORD})
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    login_times.append(time.perf_counter() - start)
+                elif response.status_code == 503:
+                    await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/users/me", headers=headers)
+                probe_times.append(time.perf_counter() - start)
+                await asyncio.sleep(probe_interval)
+
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(clients)))
+        stats = (await client.get("/internal/hashing-stats", headers={"Authorization": f"Bearer {INTERNAL_TOKEN}"})).json()
+    return {"login": login_times, "probe": probe_times, "statuses": statuses, "stats": stats}
+
+def run_backend(backend: str, args) -> dict:
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/flood.db",
+            "UPLOAD_DIR": tmp,
+            "PASSWORD_HASH_BACKEND": backend,
+            "PASSWORD_HASH_CONCURRENCY": str(args.concurrency),
+            "PASSWORD_HASH_MAX_PENDING": str(args.max_pending),
+            "PASSWORD_BCRYPT_ROUNDS": str(args.rounds),
+            "USE_ASYNC_DB": "false" if args.sync_db else "true",
+            "PRINCIPAL_CACHE_ENABLED": "true",
+            "INTERNAL_API_TOKEN": INTERNAL_TOKEN,
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            return asyncio.run(run_flood(f"http://127.0.0.1:{port}", args.clients, args.seconds, args.probe_interval))
+        finally:
+            server.terminate()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    parser.add_argument("--backends", default="thread,process")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--sync-db", action="store_true", help="USE_ASYNC_DB=false (기본 스레드풀에서 DB 호출)")
+    args = parser.parse_args()
+
+    print(f"클라이언트 {args.clients}, {args.seconds:.0f}초, bcrypt 비용 {args.rounds}, 동시 해싱 {args.concurrency}, 최대 대기 {args.max_pending}")
+    for backend in args.backends.split(","):
+        result = run_backend(backend, args)
+        login, probe, stats = result["login"], result["probe"], result["stats"]
+        print(
+            f"{backend:<8} 로그인 성공 {len(login):5d}  p50 {percentile(login, 0.5):8.1f} ms  p99 {percentile(login, 0.99):8.1f} ms | "
+            f"/users/me p50 {percentile(probe, 0.5):7.1f} ms  p99 {percentile(probe, 0.99):7.1f} ms | "
+            f"응답 {result['statuses']}  거절 {stats['rejected']}  평균 대기 {stats['avg_wait_seconds'] * 1000:.1f} ms"
+        )
+        if probe:
+            print(f"{'':<8} /users/me 호출 {len(probe)}회, 평균 {statistics.mean(probe) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
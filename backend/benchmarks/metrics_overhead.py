@@ -0,0 +1,76 @@
+"""
+지표 수집 오버헤드 벤치마크
+
+요청/SQL 문 하나마다 지표 수집이 더하는 시간을 측정해 출력합니다.
+    HTTP    최소 ASGI 앱을 직접 호출 (그대로 / MetricsMiddleware로 감쌈) - 요청당 추가 시간
+    SQL     SQLite 메모리 DB에서 SELECT 1 실행 (이벤트 없음 / instrument_engine 등록) - 문당 추가 시간
+운영에서 켜 둘 수 있는지 판단하기 위한 값으로, 실제 요청/쿼리 시간(수 ms)과 비교합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.metrics_overhead --requests 50000 --statements 50000
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import create_engine, text
+from app import metrics
+
+class _Route:
+    path = "/reviews/{review_id}"
+
+async def inner_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def _send(message):
+    pass
+
+def measure_http(app, count: int) -> float:
+    """요청당 평균 시간 (µs)"""
+    async def run():
+        start = time.perf_counter()
+        for _ in range(count):
+            await app({"type": "http", "method": "GET", "path": "/reviews/1"}, _receive, _send)
+        return time.perf_counter() - start
+    return asyncio.run(run()) / count * 1e6
+
+def measure_sql(instrumented: bool, count: int) -> float:
+    """SQL 문당 평균 시간 (µs)"""
+    engine = create_engine("sqlite://")
+    if instrumented:
+        metrics.instrument_engine(engine)
+    statement = text("SELECT 1")
+    with engine.connect() as conn:
+        conn.execute(statement)
+        start = time.perf_counter()
+        for _ in range(count):
+            conn.execute(statement).all()
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed / count * 1e6
+
+def best_of(func, repeat: int) -> float:
+    return min(func() for _ in range(repeat))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--statements", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = best_of(lambda: measure_http(inner_app, args.requests), args.repeat)
+    wrapped = best_of(lambda: measure_http(metrics.MetricsMiddleware(inner_app), args.requests), args.repeat)
+    print(f"HTTP  그대로 {bare:7.2f} µs  미들웨어 {wrapped:7.2f} µs  요청당 추가 {wrapped - bare:6.2f} µs")
+
+    plain = best_of(lambda: measure_sql(False, args.statements), args.repeat)
+    hooked = best_of(lambda: measure_sql(True, args.statements), args.repeat)
+    print(f"SQL   그대로 {plain:7.2f} µs  이벤트    {hooked:7.2f} µs  문당 추가   {hooked - plain:6.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
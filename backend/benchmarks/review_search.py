@@ -0,0 +1,94 @@
+"""
+리뷰 검색(프로세스 내 역색인) 벤치마크
+
+임의의 장소명/주소/본문으로 리뷰 말뭉치를 만들고,
+역색인 적재 시간과 검색어 종류별 응답 시간을 LIKE 전체 스캔(SQLite 메모리 DB)과 비교해 출력합니다.
+PostgreSQL tsvector/trigram 검색은 EXPLAIN ANALYZE로 직접 확인하세요 (migrations/006_review_search.sql).
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.review_search --reviews 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, and_, create_engine, select
+from app.review_search import ReviewSearchIndex, search_terms
+
+metadata = MetaData()
+bench_reviews = Table(
+    "bench_reviews", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("place_name", String(255), nullable=False),
+    Column("place_address", String(255)),
+    Column("review_text", Text, nullable=False),
+)
+
+DISTRICTS = ["강남구", "서초구", "마포구", "종로구", "송파구", "용산구", "성동구", "영등포구"]
+KINDS = ["카페", "식당", "맛집", "베이커리", "술집", "분식", "고깃집", "파스타"]
+WORDS = [
+    "맛있어요", "친절해요", "분위기", "가격", "주차", "웨이팅", "커피", "디저트", "재방문", "추천",
+    "조용한", "넓은", "깔끔한", "양이", "많아요", "비싸요", "최고", "데이트", "가족", "혼밥",
+] + [f"단어{i}" for i in range(2000)]
+
+def make_row(review_id: int) -> tuple:
+    district = random.choice(DISTRICTS)
+    name = f"{district[:2]} {random.choice(KINDS)} {random.randint(1, 5000)}호점"
+    address = f"서울 {district} {random.randint(1, 300)}길"
+    text = " ".join(random.choice(WORDS) for _ in range(random.randint(8, 40)))
+    return review_id, name, address, text
+
+def like_scan(conn, terms):
+    """관련도 순으로 정렬하려면 일치하는 행을 모두 읽어야 하므로 LIMIT 없이 조회"""
+    document = bench_reviews.c.place_name + " " + bench_reviews.c.place_address + " " + bench_reviews.c.review_text
+    stmt = select(bench_reviews.c.id).where(and_(*(document.like(f"%{term}%") for term in terms)))
+    return min(21, len(conn.execute(stmt).all()))
+
+def measure(search, queries):
+    timings, found = [], []
+    for query in queries:
+        start = time.perf_counter()
+        found.append(search(search_terms(query)))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings), statistics.mean(found)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    rows = [make_row(i) for i in range(1, args.reviews + 1)]
+
+    index = ReviewSearchIndex()
+    start = time.perf_counter()
+    index.begin_load()
+    index.load_rows(rows)
+    index.finish_load()
+    print(f"리뷰 {args.reviews}개 역색인 적재 {time.perf_counter() - start:.1f} s, {index.stats()}")
+
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(bench_reviews.insert(), [dict(zip(("id", "place_name", "place_address", "review_text"), row)) for row in rows])
+
+        query_sets = (
+            ("흔한 단어", ["맛있어요", "커피", "추천"]),
+            ("드문 단어", [f"단어{i}" for i in range(100, 100 + args.repeat)]),
+            ("앞부분", ["맛", "단어1", "강남"]),
+            ("단어 중간", ["있어요", "저트", "깔끔"]),
+            ("여러 단어", ["강남 카페 조용한", "마포 맛집 재방문", "파스타 데이트"]),
+        )
+        print("검색어 종류별 (중앙값/최대, 평균 결과 수, 상위 20개)")
+        for label, queries in query_sets:
+            for name, search in (
+                ("역색인", lambda terms: len(index.search(terms, 21))),
+                ("LIKE 스캔", lambda terms: like_scan(conn, terms)),
+            ):
+                median, worst, found = measure(search, queries)
+                print(f"{label:<6} {name:<8} {median:9.2f} ms  {worst:9.2f} ms  {found:6.1f}개")
+
+
+if __name__ == "__main__":
+    main()
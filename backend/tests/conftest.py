@@ -0,0 +1,42 @@
+"""
+테스트 공통 설정
+
+앱 모듈을 불러오기 전에 임시 SQLite DB/업로드 디렉터리와 테스트용 설정을 환경변수로 지정합니다.
+(이미 지정된 환경변수는 그대로 사용, QUERY_BUDGET_MODE=raise로 SQL 문 수 예산 위반은 테스트 실패)
+"""
+import os
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix="revieweat-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DIR}/test.db")
+os.environ.setdefault("UPLOAD_DIR", f"{_TEST_DIR}/uploads")
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_BACKEND", "thread")
+os.environ.setdefault("SESSION_SWEEP_ENABLED", "false")
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+os.makedirs(os.environ["UPLOAD_DIR"], exist_ok=True)
+
+import pytest
+
+PASSWORD = "pw123456"
+
+@pytest.fixture
+def client(monkeypatch):
+    """빈 DB로 시작하는 앱 클라이언트 (테스트마다 테이블과 워커 단위 캐시/색인을 새로 만듦)"""
+    from fastapi.testclient import TestClient
+    from app import auth, autocomplete, database, main, review_search
+
+    monkeypatch.setattr(review_search, "review_index", review_search.ReviewSearchIndex())
+    monkeypatch.setattr(autocomplete, "autocomplete_service", autocomplete.AutocompleteService())
+    auth.principal_cache.clear()
+    with TestClient(main.app) as test_client:
+        yield test_client
+    auth.principal_cache.clear()
+    database.Base.metadata.drop_all(bind=database.engine)
+
+def login(client, email: str = "user@example.com", username: str = "user") -> dict:
+    """가입 후 로그인, Authorization 헤더 반환"""
+    client.post("/register", json={"email": email, "username": username, "password": PASSWORD})
+    response = client.post("/token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
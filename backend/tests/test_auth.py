@@ -0,0 +1,58 @@
+"""
+인증 테스트 - 검증된 사용자(principal) 캐시의 적중/미스 경로 SQL 문 수와 세션 무효화 반영
+"""
+import pytest
+from sqlalchemy import event, text
+from app import database
+from app.config import settings
+from .conftest import login
+
+@pytest.fixture
+def statements():
+    """요청 중 실행된 SQL 문 목록 (USE_ASYNC_DB에 따라 요청이 쓰는 엔진 기준)"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(" ".join(statement.split()))
+
+    engine = database.async_engine.sync_engine if settings.USE_ASYNC_DB else database.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+def revoke_sessions_elsewhere():
+    """다른 워커의 로그아웃처럼 이 워커의 캐시를 거치지 않고 세션 삭제"""
+    with database.engine.begin() as conn:
+        conn.execute(text("DELETE FROM user_sessions"))
+
+def test_cache_miss_loads_session_and_user_in_one_query(client, statements):
+    headers = login(client)
+    statements.clear()
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert len(statements) == 1
+    assert "user_sessions JOIN users" in statements[0]
+
+def test_cache_hit_runs_no_query(client, statements):
+    headers = login(client)
+    client.get("/users/me", headers=headers)
+    statements.clear()
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert statements == []
+
+def test_logout_is_applied_immediately_in_the_same_worker(client):
+    headers = login(client)
+    client.get("/users/me", headers=headers)
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 401
+
+def test_session_removed_elsewhere_is_rejected_after_recheck_interval(client, monkeypatch):
+    headers = login(client)
+    client.get("/users/me", headers=headers)
+    revoke_sessions_elsewhere()
+    # 재확인 간격 안에서는 캐시된 세션 확인 결과를 사용
+    assert client.get("/users/me", headers=headers).status_code == 200
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS", 0)
+    assert client.get("/users/me", headers=headers).status_code == 401
+    # 거부된 토큰은 캐시에서도 제거됨
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS", 3600)
+    assert client.get("/users/me", headers=headers).status_code == 401
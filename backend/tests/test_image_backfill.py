@@ -0,0 +1,83 @@
+"""
+콘텐츠 주소 이전 리뷰 이미지 백필(app.image_backfill) 테스트 - 008 마이그레이션이 남긴 레거시 행을 blob으로 전환
+"""
+import asyncio
+import hashlib
+import io
+import os
+import uuid
+from PIL import Image
+from sqlalchemy import text
+from app import database, image_backfill, storage
+from app.config import settings
+from .conftest import login
+from .test_uploads import REVIEW_FORM
+
+def legacy_jpeg() -> bytes:
+    """위치 정보(EXIF GPS)가 들어 있는 JPEG"""
+    image = Image.new("RGB", (640, 480), (30, 120, 200))
+    exif = Image.Exif()
+    exif[0x8825] = {1: "N", 2: (37.0, 33.0, 59.0)}
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+def add_legacy_image(review_id: int, write_file: bool = True) -> str:
+    """008 마이그레이션과 같은 모양의 행 (digest 자리에 파일명, media_blobs 행 없음)"""
+    name = str(uuid.uuid4())
+    path = f"{settings.UPLOAD_DIR}/{name}.jpeg"
+    if write_file:
+        with open(path, "wb") as legacy:
+            legacy.write(legacy_jpeg())
+        with open(f"{settings.UPLOAD_DIR}/{name}_160.webp", "wb") as variant:
+            variant.write(b"old variant")
+    with database.engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO review_images (review_id, position, digest, path, variants) VALUES (:r, 0, :d, :p, '[]')"),
+            {"r": review_id, "d": name, "p": path},
+        )
+    return path
+
+def create_review(client, headers) -> int:
+    response = client.post("/api/reviews", headers=headers, data=REVIEW_FORM)
+    assert response.status_code == 201, response.text
+    return response.json()["review_id"]
+
+def test_backfill_converts_legacy_rows_to_blobs(client):
+    headers = login(client)
+    review_id = create_review(client, headers)
+    legacy_path = add_legacy_image(review_id)
+    missing_path = add_legacy_image(create_review(client, headers), write_file=False)
+
+    stats = asyncio.run(image_backfill.backfill(batch_size=1))
+    assert stats == {"legacy_paths": 2, "converted_paths": 1, "rows_converted": 1, "skipped_paths": 1}
+
+    [image] = [r for r in client.get("/my-reviews", headers=headers).json() if r["id"] == review_id][0]["images"]
+    with open(image["path"], "rb") as stored:
+        content = stored.read()
+    assert image["digest"] == hashlib.sha256(content).hexdigest()
+    assert image["path"] == storage.blob_path(image["digest"], ".jpg")
+    assert image["bytes"] == len(content)
+    # 새 업로드와 같이 위치 정보가 지워지고 변형은 새 경로에서 다시 만들어짐
+    with Image.open(image["path"]) as converted:
+        assert not converted.getexif()
+    assert image["variants"] and all(os.path.exists(v["path"]) for v in image["variants"])
+    assert not os.path.exists(legacy_path)
+    assert not os.path.exists(legacy_path.replace(".jpeg", "_160.webp"))
+
+    with database.engine.connect() as conn:
+        assert conn.execute(text("SELECT ref_count FROM media_blobs WHERE digest = :d"), {"d": image["digest"]}).scalar() == 1
+
+    # 다시 실행하면 파일이 없는 레거시 행만 남아 있음
+    assert asyncio.run(image_backfill.backfill()) == {
+        "legacy_paths": 1, "converted_paths": 0, "rows_converted": 0, "skipped_paths": 1,
+    }
+    with database.engine.connect() as conn:
+        assert conn.execute(text("SELECT path FROM review_images WHERE path = :p"), {"p": missing_path}).scalar() == missing_path
+
+def test_backfill_dry_run_changes_nothing(client):
+    headers = login(client)
+    legacy_path = add_legacy_image(create_review(client, headers))
+    assert asyncio.run(image_backfill.backfill(dry_run=True))["legacy_paths"] == 1
+    assert os.path.exists(legacy_path)
+    assert asyncio.run(image_backfill.backfill(dry_run=True))["legacy_paths"] == 1
@@ -0,0 +1,338 @@
+"""
+장소 프록시(app.places) 테스트 - 프로세스 내 LRU/공유 캐시 계층, request coalescing, stale-while-revalidate
+
+Google 호출은 httpx.MockTransport 스텁으로, redis는 메모리 스텁으로 대체합니다.
+실행 (backend 디렉터리에서):
+    pip install -r requirements-dev.txt
+    python -m pytest -q tests
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+import httpx
+import pytest
+from app import places
+
+FRESH_TTL = 100
+STALE_TTL = 50
+
+class Clock:
+    """places 모듈이 보는 현재 시각 (테스트에서 직접 진행)"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+class StubUpstream:
+    """Google Places 스텁: 호출을 기록하고 요청마다 응답 번호를 올림 (gate가 있으면 열릴 때까지 대기)"""
+
+    def __init__(self):
+        self.calls = []
+        self.status = "OK"
+        self.http_status = 200
+        self.gate = None
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        if self.gate is not None:
+            await self.gate.wait()
+        payload = {"status": self.status, "results": [{"version": len(self.calls)}]}
+        return httpx.Response(self.http_status, json=payload)
+
+class StubRedis:
+    """redis.asyncio 클라이언트 스텁 (get/set/aclose만 사용)"""
+
+    def __init__(self):
+        self.data = {}
+        self.fail = False
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+
+    async def aclose(self):
+        pass
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(places, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+@pytest.fixture
+def upstream():
+    return StubUpstream()
+
+@pytest.fixture
+def redis():
+    return StubRedis()
+
+def make_proxy(upstream: StubUpstream, redis=None, max_size: int = 10) -> places.PlacesProxy:
+    shared = places.SharedCache("", ttl=FRESH_TTL + STALE_TTL)
+    shared._client = redis
+    proxy = places.PlacesProxy(
+        base_url="https://places.test/api",
+        api_key="test-key",
+        timeout=1.0,
+        local=places.PlacesLRU(max_size=max_size, fresh_ttl=FRESH_TTL, stale_ttl=STALE_TTL),
+        shared=shared,
+    )
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    return proxy
+
+def lookup(proxy: places.PlacesProxy, text: str = "pizza") -> dict:
+    params = {"input": text}
+    return proxy.lookup("autocomplete", params, params)
+
+def version(payload: dict) -> int:
+    return payload["results"][0]["version"]
+
+# ==================== 캐시 키 / LRU ====================
+
+def test_cache_key_ignores_empty_params_and_order():
+    assert places.cache_key("details", {"b": "2", "a": "1", "c": None, "d": ""}) == "places:details:a=1&b=2"
+
+def test_normalize_text_and_round_location():
+    assert places.normalize_text("  Gangnam   PIZZA ") == "gangnam pizza"
+    assert places.round_location(37.5664, 126.9781) == places.round_location(37.5661, 126.9779)
+    assert places.round_location(None, 127.0) is None
+
+def test_lru_evicts_least_recently_used():
+    lru = places.PlacesLRU(max_size=2, fresh_ttl=FRESH_TTL, stale_ttl=STALE_TTL)
+    lru.set("a", places.CacheEntry({"n": 1}, 0))
+    lru.set("b", places.CacheEntry({"n": 2}, 0))
+    assert lru.get("a", 1) is not None  # a를 최근 사용으로
+    lru.set("c", places.CacheEntry({"n": 3}, 0))
+    assert lru.get("b", 1) is None
+    assert lru.get("a", 1) is not None and lru.get("c", 1) is not None
+
+def test_lru_drops_entries_past_stale_window():
+    lru = places.PlacesLRU(max_size=2, fresh_ttl=FRESH_TTL, stale_ttl=STALE_TTL)
+    lru.set("a", places.CacheEntry({}, 0))
+    assert lru.get("a", FRESH_TTL + STALE_TTL - 1) is not None
+    assert lru.get("a", FRESH_TTL + STALE_TTL) is None
+    assert len(lru) == 0
+
+# ==================== 캐시 계층 ====================
+
+def test_local_hit_skips_upstream(clock, upstream):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        first = await lookup(proxy)
+        second = await lookup(proxy)
+        await proxy.close()
+        return proxy, first, second
+
+    proxy, first, second = asyncio.run(scenario())
+    assert first == second
+    assert len(upstream.calls) == 1
+    assert upstream.calls[0].url.params["key"] == "test-key"
+    assert proxy.stats.local_hits == 1
+
+def test_shared_cache_serves_other_workers(clock, upstream, redis):
+    async def scenario():
+        writer, reader = make_proxy(upstream, redis), make_proxy(upstream, redis)
+        first = await lookup(writer)
+        second = await lookup(reader)
+        third = await lookup(reader)
+        await writer.close()
+        await reader.close()
+        return reader, first, second, third
+
+    reader, first, second, third = asyncio.run(scenario())
+    assert first == second == third
+    assert len(upstream.calls) == 1
+    # 공유 캐시에서 읽은 항목은 프로세스 내 캐시에도 채워짐
+    assert reader.stats.shared_hits == 1 and reader.stats.local_hits == 1
+    stored = json.loads(next(iter(redis.data.values())))
+    assert stored[1] == first
+
+def test_shared_cache_entry_past_stale_window_is_ignored(clock, upstream, redis):
+    async def scenario():
+        writer, reader = make_proxy(upstream, redis), make_proxy(upstream, redis)
+        await lookup(writer)
+        clock.advance(FRESH_TTL + STALE_TTL)
+        payload = await lookup(reader)
+        await writer.close()
+        await reader.close()
+        return reader, payload
+
+    reader, payload = asyncio.run(scenario())
+    assert version(payload) == 2
+    assert reader.stats.shared_hits == 0
+
+def test_shared_cache_failure_falls_back_to_upstream(clock, upstream, redis):
+    redis.fail = True
+
+    async def scenario():
+        proxy = make_proxy(upstream, redis)
+        payload = await lookup(proxy)
+        again = await lookup(proxy)
+        await proxy.close()
+        return payload, again
+
+    payload, again = asyncio.run(scenario())
+    assert payload == again
+    assert len(upstream.calls) == 1
+
+def test_error_status_is_not_cached(clock, upstream):
+    upstream.status = "OVER_QUERY_LIMIT"
+
+    async def scenario():
+        proxy = make_proxy(upstream)
+        with pytest.raises(places.PlacesUpstreamError):
+            await lookup(proxy)
+        upstream.status = "OK"
+        payload = await lookup(proxy)
+        await proxy.close()
+        return proxy, payload
+
+    proxy, payload = asyncio.run(scenario())
+    assert version(payload) == 2
+    assert proxy.stats.upstream_errors == 1
+
+def test_http_error_message_does_not_leak_api_key(clock, upstream):
+    upstream.http_status = 500
+
+    async def scenario():
+        proxy = make_proxy(upstream)
+        with pytest.raises(places.PlacesUpstreamError) as excinfo:
+            await lookup(proxy)
+        await proxy.close()
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert "test-key" not in str(error)
+
+# ==================== request coalescing ====================
+
+def test_concurrent_misses_share_one_upstream_call(clock, upstream):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        upstream.gate = asyncio.Event()
+        waiters = [asyncio.create_task(lookup(proxy)) for _ in range(5)]
+        await asyncio.sleep(0)
+        upstream.gate.set()
+        results = await asyncio.gather(*waiters)
+        await proxy.close()
+        return proxy, results
+
+    proxy, results = asyncio.run(scenario())
+    assert len(upstream.calls) == 1
+    assert all(result == results[0] for result in results)
+    assert proxy.stats.coalesced == 4
+    assert proxy._inflight == {}
+
+def test_cancelled_waiter_does_not_cancel_shared_call(clock, upstream):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        upstream.gate = asyncio.Event()
+        first = asyncio.create_task(lookup(proxy))
+        second = asyncio.create_task(lookup(proxy))
+        await asyncio.sleep(0)
+        first.cancel()
+        upstream.gate.set()
+        payload = await second
+        await proxy.close()
+        return first, payload
+
+    first, payload = asyncio.run(scenario())
+    assert first.cancelled()
+    assert version(payload) == 1
+    assert len(upstream.calls) == 1
+
+def test_failed_call_is_shared_then_retried(clock, upstream):
+    upstream.status = "UNKNOWN_ERROR"
+
+    async def scenario():
+        proxy = make_proxy(upstream)
+        upstream.gate = asyncio.Event()
+        waiters = [asyncio.create_task(lookup(proxy)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        upstream.status = "OK"
+        payload = await lookup(proxy)
+        await proxy.close()
+        return results, payload
+
+    results, payload = asyncio.run(scenario())
+    assert all(isinstance(result, places.PlacesUpstreamError) for result in results)
+    assert version(payload) == 2
+
+# ==================== stale-while-revalidate ====================
+
+def test_stale_entry_is_served_and_refreshed_once(clock, upstream):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        await lookup(proxy)
+        clock.advance(FRESH_TTL + 1)
+        upstream.gate = asyncio.Event()
+        stale = [await lookup(proxy) for _ in range(3)]
+        upstream.gate.set()
+        await asyncio.gather(*proxy._inflight.values())
+        fresh = await lookup(proxy)
+        await proxy.close()
+        return proxy, stale, fresh
+
+    proxy, stale, fresh = asyncio.run(scenario())
+    assert [version(payload) for payload in stale] == [1, 1, 1]
+    assert version(fresh) == 2
+    # 백그라운드 갱신은 한 번만 (나머지는 진행 중인 갱신에 합류)
+    assert len(upstream.calls) == 2
+    assert proxy.stats.stale_served == 3 and proxy.stats.coalesced == 2
+
+def test_failed_revalidation_keeps_stale_entry(clock, upstream):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        await lookup(proxy)
+        clock.advance(FRESH_TTL + 1)
+        upstream.status = "UNKNOWN_ERROR"
+        stale = await lookup(proxy)
+        await asyncio.gather(*proxy._inflight.values(), return_exceptions=True)
+        again = await lookup(proxy)
+        await proxy.close()
+        return stale, again
+
+    stale, again = asyncio.run(scenario())
+    assert version(stale) == 1 and version(again) == 1
+
+# ==================== 엔드포인트별 조회 ====================
+
+def test_autocomplete_normalizes_key_but_sends_original_text(clock, upstream, monkeypatch):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        monkeypatch.setattr(places, "places_proxy", proxy)
+        first = await places.autocomplete("  Gangnam  Pizza", "ko", None, 37.5664, 126.9781, 500)
+        second = await places.autocomplete("gangnam pizza ", "ko", None, 37.5661, 126.9779, 500)
+        await proxy.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert len(upstream.calls) == 1
+    sent = upstream.calls[0].url.params
+    assert sent["input"] == "Gangnam  Pizza"
+    assert sent["location"] == places.round_location(37.5664, 126.9781)
+
+def test_details_fields_order_does_not_change_key(clock, upstream, monkeypatch):
+    async def scenario():
+        proxy = make_proxy(upstream)
+        monkeypatch.setattr(places, "places_proxy", proxy)
+        await places.details("P1", "ko", "name,geometry")
+        await places.details("P1", "ko", "geometry, name")
+        await proxy.close()
+
+    asyncio.run(scenario())
+    assert len(upstream.calls) == 1
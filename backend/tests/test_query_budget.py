@@ -0,0 +1,70 @@
+"""
+요청 단위 SQL 문 수 예산 테스트 - QUERY_BUDGET_MODE=raise (conftest 기본값)에서 예산 초과/N+1 반복 감지
+"""
+import logging
+import pytest
+from app import query_budget
+from app.config import settings
+from .conftest import login
+
+# 인증(세션 재확인) + 라우트의 세션 조회로 같은 모양의 SELECT를 두 번 실행하는 라우트
+REPEATING_ROUTE = "/users/me/with-session"
+
+@pytest.fixture
+def recheck_every_request(monkeypatch):
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_SESSION_RECHECK_SECONDS", 0)
+
+def test_statement_shape_ignores_in_list_length():
+    assert query_budget.statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+        query_budget.statement_shape("SELECT * FROM t WHERE id IN (?, ?)")
+    assert query_budget.statement_shape("SELECT * FROM t WHERE id IN ($1, $2)") == "SELECT * FROM t WHERE id IN (...)"
+
+def test_counter_raises_on_first_statement_over_budget():
+    counter = query_budget.QueryCounter("GET /x", budget=2, repeat_threshold=0, raise_on_violation=True)
+    counter.record("SELECT 1")
+    counter.record("SELECT 2")
+    with pytest.raises(query_budget.QueryBudgetExceeded, match="예산 2개"):
+        counter.record("SELECT 3")
+    # 한 번 발생한 뒤에는 다시 발생시키지 않음 (정리 중 실행되는 문 때문에 예외가 겹치지 않도록)
+    counter.record("SELECT 4")
+
+def test_counter_raises_on_repeated_shape():
+    counter = query_budget.QueryCounter("GET /x", budget=0, repeat_threshold=2, raise_on_violation=True)
+    counter.record("SELECT * FROM t WHERE id = ?")
+    counter.record("SELECT * FROM t WHERE id = ?")
+    with pytest.raises(query_budget.QueryBudgetExceeded, match="N\\+1"):
+        counter.record("SELECT * FROM t WHERE id = ?")
+
+def test_request_within_budget_passes(client):
+    headers = login(client)
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+def test_over_budget_route_raises(client, monkeypatch):
+    headers = login(client)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ROUTES", {"GET /session-status": 1})
+    with pytest.raises(query_budget.QueryBudgetExceeded, match="GET /session-status"):
+        client.get("/session-status", headers=headers)
+
+def test_repeated_statement_raises(client, monkeypatch, recheck_every_request):
+    headers = login(client)
+    client.get("/users/me", headers=headers)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 1)
+    with pytest.raises(query_budget.QueryBudgetExceeded, match="N\\+1"):
+        client.get(REPEATING_ROUTE, headers=headers)
+
+def test_exempt_route_skips_repeat_check(client, monkeypatch, recheck_every_request):
+    headers = login(client)
+    client.get("/users/me", headers=headers)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ROUTES", {f"GET {REPEATING_ROUTE}": 0})
+    assert client.get(REPEATING_ROUTE, headers=headers).status_code == 200
+
+def test_log_mode_reports_without_failing(client, monkeypatch, caplog):
+    headers = login(client)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "log")
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ROUTES", {"GET /session-status": 1})
+    before = query_budget.violations.value("GET /session-status", "budget")
+    with caplog.at_level(logging.WARNING, logger=query_budget.__name__):
+        assert client.get("/session-status", headers=headers).status_code == 200
+    assert query_budget.violations.value("GET /session-status", "budget") == before + 1
+    assert "SQL 문 예산 위반" in caplog.text
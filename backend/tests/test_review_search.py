@@ -0,0 +1,120 @@
+"""
+리뷰 검색 테스트 - 프로세스 내 역색인(SQLite 등 PostgreSQL 전문 검색이 없을 때)과 /reviews/search
+"""
+import pytest
+from app import review_search
+from app.review_search import ReviewSearchIndex, search_terms
+from .conftest import login
+
+ROWS = [
+    (1, "김치찌개 전문점", "서울 종로구", "김치찌개가 맛있어요"),
+    (2, "스시 오마카세", "서울 강남구", "강남 맛집 추천"),
+    (3, "강남 카페", "서울 강남구", "조용한 카페 커피 맛있어요"),
+    (4, "분식집", "부산 해운대구", "떡볶이 맛집"),
+]
+
+def make_index(rows=ROWS) -> ReviewSearchIndex:
+    index = ReviewSearchIndex()
+    index.begin_load()
+    index.load_rows(rows)
+    index.finish_load()
+    return index
+
+def found(index: ReviewSearchIndex, query: str, limit: int = 10, after=None) -> list:
+    return [review_id for _, review_id in index.search(search_terms(query), limit, after)]
+
+def test_search_terms_are_normalized_and_deduplicated():
+    assert search_terms("  강남 Cafe, 강남!! ") == ["강남", "cafe"]
+
+def test_prefix_match():
+    index = make_index()
+    assert sorted(found(index, "맛있")) == [1, 3]
+    assert sorted(found(index, "맛")) == [1, 2, 3, 4]
+
+def test_two_character_substring_match():
+    index = make_index()
+    assert found(index, "치찌") == [1]
+    assert found(index, "볶이") == [4]
+
+def test_single_character_matches_prefix_only():
+    assert found(make_index(), "찌") == []
+
+def test_all_terms_must_match():
+    index = make_index()
+    assert found(index, "강남 커피") == [3]
+    assert found(index, "강남 떡볶이") == []
+
+def test_field_weights_order_results():
+    # 장소명(3) + 주소(2) + 본문(1)에 '강남'이 있는 3번이 주소/본문에만 있는 2번보다 앞
+    assert found(make_index(), "강남") == [3, 2]
+
+def test_keyset_pagination():
+    index = make_index()
+    first = index.search(search_terms("맛"), 2)
+    rest = index.search(search_terms("맛"), 10, after=first[-1])
+    assert len(first) == 2 and len(rest) == 2
+    assert {review_id for _, review_id in first + rest} == {1, 2, 3, 4}
+    assert first + rest == index.search(search_terms("맛"), 10)
+
+def test_upsert_and_discard_are_applied():
+    index = make_index()
+    index.upsert(4, "분식집", "부산 해운대구", "순대 맛집")
+    index.discard(2)
+    assert found(index, "떡볶이") == []
+    assert found(index, "순대") == [4]
+    assert found(index, "오마카세") == []
+
+def test_changes_during_load_are_applied_after_load():
+    index = ReviewSearchIndex()
+    index.begin_load()
+    index.upsert(5, "새 가게", "서울", "새로 생긴 곳")
+    index.discard(1)
+    index.load_rows(ROWS)
+    index.finish_load()
+    assert found(index, "생긴") == [5]
+    assert found(index, "치찌") == []
+
+def test_compact_drops_dead_documents_and_keeps_results(monkeypatch):
+    monkeypatch.setattr(review_search, "_COMPACT_MIN_DEAD", 3)
+    index = make_index()
+    # 무효 문서가 3개 이상이면서 문서 번호의 절반 이상이 되는 네 번째 수정에서 압축
+    for n in range(4):
+        index.upsert(2, "스시 오마카세", "서울 강남구", f"강남 맛집 재방문{n}")
+    stats = index.stats()
+    assert stats["compactions"] == 1 and stats["dead_docs"] == 0 and stats["reviews"] == 4
+    assert found(index, "재방문3") == [2]
+    assert found(index, "재방문0") == []
+    assert found(index, "강남") == [3, 2]
+    assert found(index, "치찌") == [1]
+
+def test_compact_removes_words_of_deleted_reviews():
+    index = make_index()
+    index.discard(4)
+    index.compact()
+    assert found(index, "떡볶") == [] and found(index, "볶이") == []
+    assert index.stats()["words"] < make_index().stats()["words"]
+
+# ==================== /reviews/search (SQLite) ====================
+
+REVIEW_FORM = {"review_date": "2026-01-01T00:00:00", "rating": "4", "companion": "혼자"}
+
+def test_search_endpoint_uses_memory_index(client):
+    headers = login(client)
+    for _, place_name, place_address, review_text in ROWS:
+        response = client.post("/api/reviews", headers=headers, data={
+            **REVIEW_FORM, "place_name": place_name, "place_address": place_address, "review_text": review_text,
+        })
+        assert response.status_code == 201, response.text
+
+    response = client.get("/reviews/search", headers=headers, params={"q": "치찌"})
+    assert response.status_code == 200
+    [hit] = response.json()
+    assert hit["place_name"] == "김치찌개 전문점"
+    assert hit["highlights"]["place_name"] == [[1, 3]]
+
+    first = client.get("/reviews/search", headers=headers, params={"q": "맛", "limit": 2})
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get("/reviews/search", headers=headers, params={"q": "맛", "limit": 2, "cursor": cursor})
+    assert len(rest.json()) == 2
+    assert {r["id"] for r in first.json() + rest.json()} == {1, 2, 3, 4}
@@ -0,0 +1,111 @@
+"""
+로그인 세션 저장소 테스트 - 메모리 저장소와 SQL 저장소(SQLite)가 같은 동작을 하는지 확인
+(기기 수 제한, 로그아웃/전체 로그아웃, 만료 세션 키셋 배치 정리)
+"""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app import database, models
+from app.config import settings
+from app.session_store import MemorySessionStore, SQLSessionStore, token_digest
+
+@pytest.fixture(params=["memory", "sql"])
+def run(request):
+    """저장소와 DB 세션을 받는 시나리오를 실행 (빈 테이블에 사용자 2명을 만든 뒤, 메모리 저장소는 사용자 조회에만 DB 사용)"""
+    store = MemorySessionStore() if request.param == "memory" else SQLSessionStore()
+
+    def runner(scenario):
+        async def main():
+            await database.create_tables_async()
+            try:
+                async with database.session_scope() as db:
+                    db.add_all([
+                        models.User(id=user_id, email=f"u{user_id}@example.com", username=f"u{user_id}", hashed_password="x")
+                        for user_id in (1, 2)
+                    ])
+                    await db.flush()
+                    return await scenario(store, db)
+            finally:
+                async with database.async_engine.begin() as conn:
+                    await conn.run_sync(database.Base.metadata.drop_all)
+        return asyncio.run(main())
+    return runner
+
+def in_hours(hours: float) -> datetime:
+    return datetime.utcnow() + timedelta(hours=hours)
+
+def test_create_and_get(run):
+    async def scenario(store, db):
+        await store.create(db, 1, "t1", in_hours(1), user_agent="phone")
+        session = await store.get(db, "t1")
+        assert session.user_id == 1 and session.token_digest == token_digest("t1")
+        assert session.user_agent == "phone"
+        assert await store.get(db, "unknown") is None
+    run(scenario)
+
+def test_expired_session_is_not_returned(run):
+    async def scenario(store, db):
+        await store.create(db, 1, "old", in_hours(-1))
+        assert await store.get(db, "old") is None
+        assert await store.count_active(db, 1) == 0
+    run(scenario)
+
+def test_get_with_user(run):
+    async def scenario(store, db):
+        await store.create(db, 2, "t", in_hours(1))
+        session, user = await store.get_with_user(db, "t")
+        assert session.user_id == 2 and user.id == 2 and user.email == "u2@example.com"
+        assert await store.get_with_user(db, "missing") is None
+    run(scenario)
+
+def test_max_sessions_per_user_evicts_oldest(run, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_MAX_PER_USER", 2)
+
+    async def scenario(store, db):
+        assert (await store.create(db, 1, "a", in_hours(1)))[1] == []
+        assert (await store.create(db, 1, "b", in_hours(1)))[1] == []
+        await store.create(db, 2, "other", in_hours(1))
+        _, evicted = await store.create(db, 1, "c", in_hours(1))
+        assert list(evicted) == [token_digest("a")]
+        assert await store.get(db, "a") is None
+        assert await store.count_active(db, 1) == 2
+        # 다른 사용자의 세션은 영향 없음
+        assert await store.get(db, "other") is not None
+    run(scenario)
+
+def test_revoke_and_revoke_user(run):
+    async def scenario(store, db):
+        for token in ("a", "b", "c"):
+            await store.create(db, 1, token, in_hours(1))
+        await store.create(db, 2, "other", in_hours(1))
+        assert list(await store.revoke(db, "a")) == [token_digest("a")]
+        assert list(await store.revoke(db, "a")) == []
+        assert sorted(await store.revoke_user(db, 1)) == sorted([token_digest("b"), token_digest("c")])
+        assert await store.count_active(db, 1) == 0
+        assert await store.count_active(db, 2) == 1
+    run(scenario)
+
+def test_sweep_expired_in_keyset_batches(run):
+    async def scenario(store, db):
+        expired = [f"expired{n}" for n in range(5)]
+        for n, token in enumerate(expired):
+            await store.create(db, 1 + n % 2, token, in_hours(-10 + n))
+        await store.create(db, 1, "active", in_hours(1))
+
+        now = datetime.utcnow()
+        removed, after, batches = [], None, 0
+        while True:
+            digests, last = await store.sweep_expired(db, now, after, 2)
+            if not digests:
+                assert last is None
+                break
+            assert len(digests) <= 2
+            removed += digests
+            after = last
+            batches += 1
+        assert batches == 3
+        assert sorted(removed) == sorted(token_digest(token) for token in expired)
+        assert await store.get(db, "active") is not None
+        # 새로 만료되는 세션이 없으면 다시 정리해도 지울 것이 없음
+        assert await store.sweep_expired(db, now, None, 2) == ([], None)
+    run(scenario)
@@ -0,0 +1,55 @@
+"""
+리뷰 이미지 업로드 테스트 - 크기 제한, 압축 폭탄 거부, 임시 파일 정리
+"""
+import io
+import os
+import pytest
+from PIL import Image
+from app.config import settings
+from .conftest import login
+
+REVIEW_FORM = {
+    "place_name": "김치찌개집",
+    "place_address": "서울",
+    "review_date": "2026-01-01T00:00:00",
+    "rating": "4",
+    "companion": "혼자",
+    "review_text": "맛있어요",
+}
+
+@pytest.fixture(scope="module")
+def bomb_png() -> bytes:
+    """작은 파일이지만 픽셀 수가 Pillow 한도(MAX_IMAGE_PIXELS의 2배)를 넘는 PNG (약 48KB)"""
+    side = int((Image.MAX_IMAGE_PIXELS * 2) ** 0.5) + 1000
+    buffer = io.BytesIO()
+    Image.new("1", (side, side)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def png(size=(32, 32)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def incoming_files() -> list:
+    incoming_dir = os.path.join(settings.UPLOAD_DIR, ".incoming")
+    return os.listdir(incoming_dir) if os.path.isdir(incoming_dir) else []
+
+def test_decompression_bomb_is_rejected_with_413(client, bomb_png):
+    headers = login(client)
+    response = client.post(
+        "/api/reviews", headers=headers, data=REVIEW_FORM,
+        files=[("images", ("bomb.png", bomb_png, "image/png")), ("images", ("ok.png", png(), "image/png"))],
+    )
+    assert response.status_code == 413
+    assert "픽셀" in response.json()["detail"]
+    assert incoming_files() == []
+    assert client.get("/my-reviews", headers=headers).json() == []
+
+def test_review_with_image_is_saved(client):
+    headers = login(client)
+    response = client.post(
+        "/api/reviews", headers=headers, data=REVIEW_FORM,
+        files=[("images", ("photo.PNG", png(), "image/png"))],
+    )
+    assert response.status_code == 201, response.text
+    assert incoming_files() == []
@@ -1,27 +1,41 @@
--- Users 테이블 (세션 정보 포함)
+-- 리뷰 부분 문자열 검색 (trigram 인덱스)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Users 테이블 (세션은 user_sessions 테이블에 기기별로 저장)
 CREATE TABLE users (
     id SERIAL PRIMARY KEY,
     email VARCHAR(255) UNIQUE NOT NULL,
     username VARCHAR(255) UNIQUE NOT NULL,
     hashed_password VARCHAR(255) NOT NULL,
     role VARCHAR DEFAULT 'user',
-    -- 세션 관련 필드 추가
-    session_token VARCHAR(500),
-    is_http_only BOOLEAN DEFAULT TRUE,  -- HTTP Only 설정 체크
-    is_secure BOOLEAN DEFAULT TRUE,     -- Secure 설정 체크
-    session_expires_at TIMESTAMP WITH TIME ZONE,
-    last_login_at TIMESTAMP WITH TIME ZONE,
+    last_login_at TIMESTAMP WITH TIME ZONE,  -- 오래된 경우에만 갱신 (로그인마다 행을 다시 쓰지 않음)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
 -- Users 테이블 인덱스
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_session_token ON users(session_token);
-CREATE INDEX idx_users_session_expires_at ON users(session_expires_at);
-CREATE INDEX idx_users_is_http_only ON users(is_http_only);
-CREATE INDEX idx_users_is_secure ON users(is_secure);
+-- email/username은 UNIQUE 제약 인덱스로 조회
+
+-- 로그인 세션 테이블 (사용자당 기기별 여러 세션, 토큰 원문 대신 SHA-256 다이게스트 저장)
+CREATE TABLE user_sessions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    token_digest VARCHAR(64) NOT NULL,
+    is_http_only BOOLEAN NOT NULL DEFAULT TRUE,  -- HTTP Only 쿠키로 발급
+    is_secure BOOLEAN NOT NULL DEFAULT TRUE,     -- Secure 쿠키로 발급
+    user_agent VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- User Sessions 인덱스
+-- 인증 핫패스의 토큰 조회
+CREATE UNIQUE INDEX uq_user_sessions_token_digest ON user_sessions(token_digest);
+-- 사용자별 세션 목록/기기 수 제한 (최신순, 외래키 삭제도 처리)
+CREATE INDEX idx_user_sessions_user_created ON user_sessions(user_id, created_at DESC, id DESC);
+-- 만료 세션 정리 (앱의 session_sweeper가 (expires_at, id) 키셋 순서로 배치 삭제)
+CREATE INDEX idx_user_sessions_expires ON user_sessions(expires_at);
 
 -- Search History 테이블 
 CREATE TABLE search_history (
@@ -35,44 +49,103 @@ CREATE TABLE search_history (
 );
 
 -- Search History 인덱스
-CREATE INDEX idx_search_history_user_id ON search_history(user_id);
-CREATE INDEX idx_search_history_created_at ON search_history(created_at);
-CREATE INDEX idx_search_history_query ON search_history(query);
-CREATE INDEX idx_search_history_name ON search_history(name);
-CREATE INDEX idx_search_history_is_place ON search_history(is_place);
+-- 키셋 페이지네이션 (user_id별 최신순, user_id 단독 조회/외래키 삭제도 처리)
+CREATE INDEX idx_search_history_user_created ON search_history(user_id, created_at DESC, id DESC);
+-- 중복 방지 키 (장소 검색은 name, 일반 검색은 query 기준), 검색 기록 저장 시 ON CONFLICT 대상
+CREATE UNIQUE INDEX uq_search_history_user_key ON search_history(user_id, is_place, coalesce(name, query));
+
+-- Places 테이블 (장소 제공자 place_id 기준, 리뷰 추가/수정/삭제 시 집계 갱신)
+CREATE TABLE places (
+    id SERIAL PRIMARY KEY,
+    provider VARCHAR(20) NOT NULL DEFAULT 'google',
+    provider_place_id VARCHAR(255) NOT NULL,  -- 제공자의 place_id
+    name VARCHAR(255) NOT NULL,
+    address VARCHAR(255),
+    lat DOUBLE PRECISION,
+    lng DOUBLE PRECISION,
+    geo_cell BIGINT,                          -- 좌표의 52비트 격자 셀 값 (위치 기반 조회)
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,      -- 평점별 리뷰 수 (★ 1~5개)
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    last_review_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Places 인덱스
+-- 제공자 place_id 중복 방지, 장소 저장 시 ON CONFLICT 대상
+CREATE UNIQUE INDEX uq_places_provider_place_id ON places(provider, provider_place_id);
+-- 격자 셀 범위 조회 (위치 기반 조회), PostGIS 사용 시 migrations/011_places_geo_postgis.sql 참고 (선택)
+CREATE INDEX idx_places_geo_cell ON places(geo_cell);
 
 -- Reviews 테이블 
 CREATE TABLE reviews (
     id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL,
+    place_id INTEGER REFERENCES places(id),  -- 기존 리뷰는 백필 전까지 NULL
     place_name VARCHAR(255) NOT NULL,
     place_address VARCHAR(255),
     review_date TIMESTAMP NOT NULL,  
-    rating VARCHAR(10) NOT NULL,
+    rating SMALLINT NOT NULL CONSTRAINT ck_reviews_rating CHECK (rating BETWEEN 1 AND 5),  -- 별점 1~5
     companion VARCHAR(255),
     review_text TEXT NOT NULL,       
-    image_paths TEXT,                
+    search_vector TSVECTOR,          -- 전문 검색 벡터 (트리거로 갱신)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
 -- Reviews 인덱스
-CREATE INDEX idx_reviews_user_id ON reviews(user_id);
-CREATE INDEX idx_reviews_review_date ON reviews(review_date);
-CREATE INDEX idx_reviews_place_name ON reviews(place_name);
-CREATE INDEX idx_reviews_rating ON reviews(rating);
-CREATE INDEX idx_reviews_created_at ON reviews(created_at);
-
--- 만료된 세션 정리를 위한 함수
-CREATE OR REPLACE FUNCTION cleanup_expired_user_sessions()
-RETURNS void AS $$
-BEGIN
-    UPDATE users 
-    SET session_token = NULL,
-        session_expires_at = NULL
-    WHERE session_expires_at < now();
-END;
-$$ LANGUAGE plpgsql;
+-- 키셋 페이지네이션 (사용자별/장소별 최신순, user_id/place_name 단독 조회도 처리)
+CREATE INDEX idx_reviews_user_created ON reviews(user_id, created_at DESC, id DESC);
+CREATE INDEX idx_reviews_place_created ON reviews(place_name, created_at DESC, id DESC);
+-- 장소(place_id)별 최신순 (장소 리뷰 목록, 마지막 리뷰 시각 갱신, 외래키 삭제도 처리)
+CREATE INDEX idx_reviews_place_id_created ON reviews(place_id, created_at DESC, id DESC);
+-- 전문 검색 (단어 앞부분 일치) / 부분 문자열 검색 (ILIKE '%검색어%'), 식은 crud._review_search_document와 같아야 함
+CREATE INDEX idx_reviews_search_vector ON reviews USING GIN (search_vector);
+CREATE INDEX idx_reviews_search_trgm ON reviews
+    USING GIN ((place_name || ' ' || coalesce(place_address, '') || ' ' || review_text) gin_trgm_ops);
+
+-- Review Images 테이블 (리뷰당 순서대로 여러 장, 파일은 media_blobs의 콘텐츠 주소 경로)
+CREATE TABLE review_images (
+    id SERIAL PRIMARY KEY,
+    review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+    position SMALLINT NOT NULL,      -- 리뷰 안에서의 순서 (0부터)
+    digest CHAR(64) NOT NULL,        -- 저장된 파일의 SHA-256 (media_blobs.digest)
+    path VARCHAR(255) NOT NULL,
+    bytes BIGINT,
+    width INTEGER,                   -- 후처리 전에는 NULL
+    height INTEGER,
+    variants JSONB,                  -- 썸네일/WebP 변형 목록 (후처리 결과)
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- 리뷰별 이미지 순서 (리뷰 목록의 이미지 일괄 로드, 리뷰 삭제 시 외래키 처리도 이 인덱스 사용)
+CREATE UNIQUE INDEX uq_review_images_review_position ON review_images(review_id, position);
+
+-- User Stats 테이블 (사용자별 리뷰 집계, 리뷰 추가/수정/삭제 시 같은 트랜잭션에서 갱신)
+CREATE TABLE user_stats (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,      -- 평점별 리뷰 수 (★ 1~5개)
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    last_review_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Media Blobs 테이블 (콘텐츠 주소 기반 이미지 저장소, 리뷰 참조 수 관리)
+CREATE TABLE media_blobs (
+    digest CHAR(64) PRIMARY KEY,     -- 저장된 파일(메타데이터 제거 후)의 SHA-256
+    path VARCHAR(255) NOT NULL,
+    bytes BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
 
 -- updated_at 자동 업데이트 함수
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -88,3 +161,27 @@ CREATE TRIGGER update_users_updated_at
     BEFORE UPDATE ON users
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
+
+-- places 테이블에 updated_at 트리거 추가
+CREATE TRIGGER update_places_updated_at
+    BEFORE UPDATE ON places
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- 리뷰 검색 벡터 자동 갱신 함수 (장소명 A, 주소 B, 본문 C 가중치, 'simple' 설정)
+CREATE OR REPLACE FUNCTION reviews_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.place_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.place_address, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.review_text, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- reviews 테이블에 검색 벡터 트리거 추가
+CREATE TRIGGER reviews_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF place_name, place_address, review_text ON reviews
+    FOR EACH ROW
+    EXECUTE FUNCTION reviews_search_vector_update();
@@ -0,0 +1,16 @@
+-- 기존 데이터베이스용 마이그레이션: 이미지 후처리/콘텐츠 주소 저장소/키셋 페이지네이션
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS image_variants JSONB;
+
+CREATE TABLE IF NOT EXISTS media_blobs (
+    digest CHAR(64) PRIMARY KEY,
+    path VARCHAR(255) NOT NULL,
+    bytes BIGINT NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_history_user_created ON search_history(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_user_created ON reviews(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_place_created ON reviews(place_name, created_at DESC, id DESC);
@@ -0,0 +1,71 @@
+-- 인덱스 재구성: 실제 조회 패턴에 맞춘 복합/부분 인덱스, 쓰기 비용만 늘리던 단일 컬럼 인덱스 제거
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/002_index_plan.sql
+-- 새 인덱스를 먼저 만든 뒤 기존 인덱스를 제거 (중간에 조회 경로가 비지 않도록)
+
+-- ==================== users ====================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_session_expires
+    ON users(session_expires_at) WHERE session_token IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_session_token
+    ON users(session_token) WHERE session_token IS NOT NULL;
+
+-- UNIQUE 제약 인덱스와 중복
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_username;
+-- 부분 인덱스로 대체
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_session_token;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_session_expires_at;
+-- 선택도가 낮은 불리언 컬럼 (로그인마다 쓰기 비용만 발생)
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_is_http_only;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_is_secure;
+
+-- ==================== search_history ====================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_history_user_created
+    ON search_history(user_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_history_user_place_name
+    ON search_history(user_id, name) WHERE is_place;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_history_user_query
+    ON search_history(user_id, query) WHERE NOT is_place;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_query;
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_is_place;
+-- SQLAlchemy create_all로 생성된 경우의 인덱스 이름
+DROP INDEX CONCURRENTLY IF EXISTS ix_search_history_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_search_history_query;
+DROP INDEX CONCURRENTLY IF EXISTS ix_search_history_name;
+
+-- ==================== reviews ====================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_user_created
+    ON reviews(user_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_place_created
+    ON reviews(place_name, created_at DESC, id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_place_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_review_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_rating;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS ix_reviews_id;
+
+-- SQLAlchemy create_all로 생성된 경우의 users 인덱스 이름
+DROP INDEX CONCURRENTLY IF EXISTS ix_users_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_users_session_token;
+
+-- 만료 세션 정리 함수: 활성 세션만 대상으로 (부분 인덱스 사용)
+CREATE OR REPLACE FUNCTION cleanup_expired_user_sessions()
+RETURNS void AS $$
+BEGIN
+    UPDATE users 
+    SET session_token = NULL,
+        session_expires_at = NULL
+    WHERE session_token IS NOT NULL
+      AND session_expires_at < now();
+END;
+$$ LANGUAGE plpgsql;
+
+ANALYZE users;
+ANALYZE search_history;
+ANALYZE reviews;
@@ -0,0 +1,24 @@
+-- 검색 기록 저장을 INSERT ... ON CONFLICT 한 문장으로 처리하기 위한 중복 방지 UNIQUE 인덱스
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/003_search_history_upsert.sql
+
+-- 기존 중복 기록 정리 (같은 키에서 가장 최근 기록만 유지)
+DELETE FROM search_history sh
+USING (
+    SELECT id,
+           row_number() OVER (
+               PARTITION BY user_id, is_place, coalesce(name, query)
+               ORDER BY created_at DESC, id DESC
+           ) AS rn
+    FROM search_history
+) dup
+WHERE sh.id = dup.id AND dup.rn > 1;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_search_history_user_key
+    ON search_history(user_id, is_place, coalesce(name, query));
+
+-- 중복 조회용 부분 인덱스는 UNIQUE 인덱스로 대체
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_user_place_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_search_history_user_query;
+
+ANALYZE search_history;
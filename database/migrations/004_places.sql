@@ -0,0 +1,35 @@
+-- 기존 데이터베이스용 마이그레이션: 장소(places) 테이블과 리뷰의 place_id 연결
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/004_places.sql
+-- 실행 후 기존 리뷰 연결: python -m app.place_backfill (backend 디렉터리에서)
+
+CREATE TABLE IF NOT EXISTS places (
+    id SERIAL PRIMARY KEY,
+    provider VARCHAR(20) NOT NULL DEFAULT 'google',
+    provider_place_id VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    address VARCHAR(255),
+    lat DOUBLE PRECISION,
+    lng DOUBLE PRECISION,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    last_review_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_places_provider_place_id ON places(provider, provider_place_id);
+
+DROP TRIGGER IF EXISTS update_places_updated_at ON places;
+CREATE TRIGGER update_places_updated_at
+    BEFORE UPDATE ON places
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- NULL 허용 컬럼 추가는 테이블을 다시 쓰지 않음
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS place_id INTEGER REFERENCES places(id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_place_id_created ON reviews(place_id, created_at DESC, id DESC);
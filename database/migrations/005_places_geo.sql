@@ -0,0 +1,9 @@
+-- 기존 데이터베이스용 마이그레이션: 위치 기반 장소 조회용 격자 셀 컬럼
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/005_places_geo.sql
+-- 실행 후 기존 장소의 격자 셀 채우기: python -m app.place_backfill (backend 디렉터리에서)
+
+ALTER TABLE places ADD COLUMN IF NOT EXISTS geo_cell BIGINT;
+-- review_count를 조건에 넣으면 리뷰마다 일어나는 집계 UPDATE가 HOT 갱신이 되지 못하므로 전체 인덱스로 둠
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_geo_cell ON places(geo_cell);
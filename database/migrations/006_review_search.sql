@@ -0,0 +1,35 @@
+-- 기존 데이터베이스용 마이그레이션: 리뷰 전문 검색 (tsvector + trigram 인덱스)
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/006_review_search.sql
+-- 리뷰가 많으면 백필 UPDATE가 오래 걸리므로 트래픽이 적은 시간에 실행
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- 검색 벡터 (장소명 A, 주소 B, 본문 C 가중치, 형태소 분석 없이 단어 단위 'simple' 설정)
+CREATE OR REPLACE FUNCTION reviews_search_vector_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.place_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.place_address, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.review_text, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS reviews_search_vector_trigger ON reviews;
+CREATE TRIGGER reviews_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF place_name, place_address, review_text ON reviews
+    FOR EACH ROW
+    EXECUTE FUNCTION reviews_search_vector_update();
+
+-- 기존 리뷰 검색 벡터 채우기 (트리거가 값을 계산)
+UPDATE reviews SET place_name = place_name WHERE search_vector IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_search_vector ON reviews USING GIN (search_vector);
+-- 부분 문자열 검색 (ILIKE '%검색어%'), 식은 crud._review_search_document와 같아야 함
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_search_trgm ON reviews
+    USING GIN ((place_name || ' ' || coalesce(place_address, '') || ' ' || review_text) gin_trgm_ops);
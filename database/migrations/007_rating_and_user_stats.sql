@@ -0,0 +1,69 @@
+-- 기존 데이터베이스용 마이그레이션: 평점 숫자 컬럼 전환과 사용자별 리뷰 집계 테이블
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+--   psql -d revieweat -v ON_ERROR_STOP=1 -1 -f database/migrations/007_rating_and_user_stats.sql
+-- 컬럼 타입 변경은 reviews 테이블을 다시 쓰고 배타 잠금을 잡으므로 트래픽이 적은 시간에 실행
+-- 한 트랜잭션(-1)으로 실행하므로 중간에 실패하면 아무것도 바뀌지 않음
+
+-- 평점 문자열('★★★☆☆' 또는 '3')을 1~5 정수로 변환, 해석할 수 없으면 NULL
+CREATE OR REPLACE FUNCTION pg_temp.parse_rating(value TEXT)
+RETURNS SMALLINT AS $$
+    SELECT CASE
+        WHEN value LIKE '%★%' THEN (length(value) - length(replace(value, '★', '')))::SMALLINT
+        WHEN btrim(value) ~ '^[0-9]+$' THEN btrim(value)::SMALLINT
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 해석할 수 없는 평점이 있으면 중단 (직접 고친 뒤 다시 실행)
+DO $$
+DECLARE
+    invalid_count INTEGER;
+BEGIN
+    SELECT count(*) INTO invalid_count
+    FROM reviews
+    WHERE pg_temp.parse_rating(rating::TEXT) IS NULL OR pg_temp.parse_rating(rating::TEXT) NOT BETWEEN 1 AND 5;
+    IF invalid_count > 0 THEN
+        RAISE EXCEPTION '1~5로 변환할 수 없는 평점이 %건 있습니다: SELECT id, rating FROM reviews로 확인', invalid_count;
+    END IF;
+END $$;
+
+ALTER TABLE reviews
+    ALTER COLUMN rating TYPE SMALLINT USING pg_temp.parse_rating(rating::TEXT);
+ALTER TABLE reviews DROP CONSTRAINT IF EXISTS ck_reviews_rating;
+ALTER TABLE reviews
+    ADD CONSTRAINT ck_reviews_rating CHECK (rating BETWEEN 1 AND 5);
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    last_review_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 기존 리뷰로 사용자 집계 채우기 (리뷰 쓰기가 없는 상태에서 실행, 다시 실행하면 값을 덮어씀)
+INSERT INTO user_stats (user_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at)
+SELECT
+    user_id,
+    count(*),
+    sum(rating),
+    count(*) FILTER (WHERE rating = 1),
+    count(*) FILTER (WHERE rating = 2),
+    count(*) FILTER (WHERE rating = 3),
+    count(*) FILTER (WHERE rating = 4),
+    count(*) FILTER (WHERE rating = 5),
+    max(created_at)
+FROM reviews
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET
+    review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    rating_1 = EXCLUDED.rating_1,
+    rating_2 = EXCLUDED.rating_2,
+    rating_3 = EXCLUDED.rating_3,
+    rating_4 = EXCLUDED.rating_4,
+    rating_5 = EXCLUDED.rating_5,
+    last_review_at = EXCLUDED.last_review_at;
@@ -0,0 +1,48 @@
+-- 기존 데이터베이스용 마이그레이션: 쉼표로 이어 붙인 reviews.image_paths를 review_images 테이블로 분리
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+--   psql -d revieweat -v ON_ERROR_STOP=1 -1 -f database/migrations/008_review_images.sql
+-- 새 버전 배포 직전에 실행 (이전 버전 서버는 image_paths 컬럼을 사용하므로 배포와 함께 전환)
+-- 한 트랜잭션(-1)으로 실행하므로 중간에 실패하면 아무것도 바뀌지 않음
+--
+-- 레거시 행: 콘텐츠 주소 저장소 이전에 올린 이미지(uploads/<uuid>.<확장자>)는 digest 자리에 파일명(확장자 제외)이
+-- 들어가고 media_blobs 행이 없음 - 참조 수 관리/고아 정리 대상이 아니고 경로도 새 업로드(uploads/<digest 앞 두 글자>/<digest>.<확장자>)와 다름
+-- 실행 후 백필로 파일 내용의 digest와 blob 경로로 전환 (여러 번 실행해도 안전):
+--   python -m app.image_backfill (backend 디렉터리에서)
+
+CREATE TABLE IF NOT EXISTS review_images (
+    id SERIAL PRIMARY KEY,
+    review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+    position SMALLINT NOT NULL,
+    digest CHAR(64) NOT NULL,
+    path VARCHAR(255) NOT NULL,
+    bytes BIGINT,
+    width INTEGER,
+    height INTEGER,
+    variants JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_review_images_review_position ON review_images(review_id, position);
+
+-- 경로 문자열을 순서대로 나누고, 같은 순서의 image_variants 항목에서 크기/변형 정보를 가져옴
+-- digest는 파일명(확장자 제외), 크기는 media_blobs 기록 사용
+INSERT INTO review_images (review_id, position, digest, path, bytes, width, height, variants, created_at)
+SELECT
+    r.id,
+    (split.ordinality - 1)::SMALLINT,
+    left(regexp_replace(split.path, '^.*/|\.[^.]*$', '', 'g'), 64),  -- 콘텐츠 주소 이전 파일명은 64자로 자름
+    split.path,
+    coalesce(mb.bytes, (r.image_variants -> (split.ordinality::INT - 1) ->> 'bytes')::BIGINT),
+    (r.image_variants -> (split.ordinality::INT - 1) ->> 'width')::INTEGER,
+    (r.image_variants -> (split.ordinality::INT - 1) ->> 'height')::INTEGER,
+    r.image_variants -> (split.ordinality::INT - 1) -> 'variants',
+    r.created_at
+FROM reviews r
+CROSS JOIN LATERAL unnest(string_to_array(r.image_paths, ',')) WITH ORDINALITY AS split(path, ordinality)
+LEFT JOIN media_blobs mb ON mb.digest = regexp_replace(split.path, '^.*/|\.[^.]*$', '', 'g')
+WHERE r.image_paths IS NOT NULL
+  AND btrim(split.path) <> ''
+ON CONFLICT (review_id, position) DO NOTHING;
+
+ALTER TABLE reviews DROP COLUMN IF EXISTS image_paths;
+ALTER TABLE reviews DROP COLUMN IF EXISTS image_variants;
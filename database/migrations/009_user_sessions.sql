@@ -0,0 +1,50 @@
+-- 기존 데이터베이스용 마이그레이션: users 행의 세션 컬럼을 기기별 user_sessions 테이블로 분리
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+--   psql -d revieweat -v ON_ERROR_STOP=1 -1 -f database/migrations/009_user_sessions.sql
+-- 새 버전 배포 직전에 실행 (이전 버전 서버는 users.session_token 컬럼을 사용하므로 배포와 함께 전환)
+-- 한 트랜잭션(-1)으로 실행하므로 중간에 실패하면 아무것도 바뀌지 않음
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token_digest VARCHAR(64) NOT NULL,
+    is_http_only BOOLEAN NOT NULL DEFAULT TRUE,
+    is_secure BOOLEAN NOT NULL DEFAULT TRUE,
+    user_agent VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_user_sessions_token_digest ON user_sessions(token_digest);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_created ON user_sessions(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions(expires_at);
+
+-- 아직 만료되지 않은 기존 세션을 옮김 (토큰 원문 대신 SHA-256 다이게스트, 로그인한 사용자는 로그아웃되지 않음)
+INSERT INTO user_sessions (user_id, token_digest, is_http_only, is_secure, created_at, expires_at)
+SELECT id,
+       encode(sha256(convert_to(session_token, 'UTF8')), 'hex'),
+       COALESCE(is_http_only, TRUE),
+       COALESCE(is_secure, TRUE),
+       COALESCE(last_login_at, now()),
+       session_expires_at
+FROM users
+WHERE session_token IS NOT NULL
+  AND session_expires_at > now()
+ON CONFLICT (token_digest) DO NOTHING;
+
+-- 만료된 세션 정리 함수 (user_sessions 기준)
+CREATE OR REPLACE FUNCTION cleanup_expired_user_sessions()
+RETURNS void AS $$
+BEGIN
+    DELETE FROM user_sessions
+    WHERE expires_at < now();
+END;
+$$ LANGUAGE plpgsql;
+
+DROP INDEX IF EXISTS idx_users_active_session_expires;
+DROP INDEX IF EXISTS idx_users_active_session_token;
+
+ALTER TABLE users DROP COLUMN IF EXISTS session_token;
+ALTER TABLE users DROP COLUMN IF EXISTS is_http_only;
+ALTER TABLE users DROP COLUMN IF EXISTS is_secure;
+ALTER TABLE users DROP COLUMN IF EXISTS session_expires_at;
@@ -0,0 +1,7 @@
+-- 기존 데이터베이스용 마이그레이션: 만료 세션 정리 SQL 함수 제거
+-- (init.sql로 새로 만든 데이터베이스에는 이미 반영되어 있음)
+--   psql -d revieweat -v ON_ERROR_STOP=1 -1 -f database/migrations/010_session_sweeper.sql
+-- 만료 세션은 앱의 session_sweeper가 작은 배치로 정리하므로 한 번에 지우는 함수는 더 이상 사용하지 않음
+-- (cron 등에서 이 함수를 호출하고 있었다면 함께 제거)
+
+DROP FUNCTION IF EXISTS cleanup_expired_user_sessions();
@@ -0,0 +1,13 @@
+-- 선택 (PostGIS가 설치된 서버에서만): 위치 기반 장소 조회를 GiST 인덱스로 처리
+-- 필수 마이그레이션 순서에는 포함되지 않으며 건너뛰어도 됨 (004_places.sql 이후 아무 때나 실행 가능)
+-- (확장이 있으면 앱이 자동으로 사용, GEO_BACKEND=grid로 끌 수 있음)
+-- CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 psql에서 자동 커밋 모드로 실행
+--   psql -d revieweat -f database/migrations/011_places_geo_postgis.sql
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+-- 앱의 조회 식과 같아야 인덱스가 사용됨 (crud._postgis_place_candidates)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_geography
+    ON places USING gist (geography(ST_SetSRID(ST_MakePoint(lng, lat), 4326)));
+
+ANALYZE places;
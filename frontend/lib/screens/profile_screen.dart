@@ -74,17 +74,22 @@ class _ProfileScreenState extends State<ProfileScreen> {
         username = data['username'] ?? '';
       }
 
-      // 2. 내 리뷰 목록 요청
-      final reviewRes = await http.get(
-        Uri.parse('$apiUrl/my-reviews'),
-        headers: {
-          'Authorization': 'Bearer $token',
-        },
-      );
+      // 2. 내 리뷰 목록 요청 (X-Next-Cursor 헤더를 따라 페이지 단위로 조회)
       List<dynamic> reviews = [];
-      if (reviewRes.statusCode == 200) {
-        reviews = json.decode(utf8.decode(reviewRes.bodyBytes));
-      }
+      String? cursor;
+      do {
+        final reviewRes = await http.get(
+          Uri.parse('$apiUrl/my-reviews').replace(
+            queryParameters: cursor != null ? {'cursor': cursor} : null,
+          ),
+          headers: {
+            'Authorization': 'Bearer $token',
+          },
+        );
+        if (reviewRes.statusCode != 200) break;
+        reviews.addAll(json.decode(utf8.decode(reviewRes.bodyBytes)));
+        cursor = reviewRes.headers['x-next-cursor'];
+      } while (cursor != null);
 
       setState(() {
         _username = username;
@@ -488,8 +493,9 @@ class _ProfileScreenState extends State<ProfileScreen> {
           
           // 이미지 경로 파싱 및 서버 URL 처리 개선
           List<String> imagePaths = [];
-          if (review['image_paths'] != null && review['image_paths'].toString().isNotEmpty) {
-            final rawPaths = review['image_paths'].toString().split(',')
+          if (review['images'] is List && (review['images'] as List).isNotEmpty) {
+            final rawPaths = (review['images'] as List)
+                .map((image) => image['path'].toString())
                 .where((path) => path.trim().isNotEmpty)
                 .toList();
             
@@ -28,8 +28,9 @@ class _ReviewDetailScreenState extends State<ReviewDetailScreen> {
   Widget build(BuildContext context) {
     // 이미지 경로 파싱 및 서버 URL 처리
     List<String> imagePaths = [];
-    if (widget.review['image_paths'] != null && widget.review['image_paths'].toString().isNotEmpty) {
-      final rawPaths = widget.review['image_paths'].toString().split(',')
+    if (widget.review['images'] is List && (widget.review['images'] as List).isNotEmpty) {
+      final rawPaths = (widget.review['images'] as List)
+          .map((image) => image['path'].toString())
           .where((path) => path.trim().isNotEmpty)
           .toList();
       